@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+render_executor: 音频渲染（DSP）专用的有界执行器与准入控制。
+Bounded executor and admission control for DSP render work.
+
+- 固定数量的渲染线程，与 gunicorn 请求线程隔离 / Fixed render threads, separate from request threads
+- 排队深度上限，超出即拒绝（调用方返回 503 + Retry-After）/ Queue-depth limit; overflow is rejected
+- 同一 uid 的旧请求被新请求取代（last-request-wins）/ Superseded requests from the same uid are dropped
+  （共享渲染只摘下被取代的 uid / a shared render only loses the superseded uid）
+- 单个 uid 同时运行的渲染数上限（调用方返回 429）/ Per-uid running limit (caller answers 429)
+- 相同 key（如 ETag）的并发请求共享同一次渲染，互不取代 / Concurrent requests with the same key share one render
+- 等待超时后设置取消标记，渲染函数通过 is_cancelled() 协作退出 / On timeout a cancel flag is set; renders poll is_cancelled()
+"""
+from __future__ import annotations
+
+import os
+import logging
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    try:
+        return max(minimum, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+RENDER_WORKERS = _env_int('SWEEP_RENDER_WORKERS', 2)            # 渲染线程数 / Render threads
+RENDER_MAX_PENDING = _env_int('SWEEP_RENDER_MAX_PENDING', 8)    # 运行 + 排队上限 / Running + queued limit
+RENDER_MAX_PER_UID = _env_int('SWEEP_RENDER_MAX_PER_UID', 2)    # 单 uid 同时运行上限 / Per-uid running limit
+RENDER_TIMEOUT_SEC = _env_int('SWEEP_RENDER_TIMEOUT_SEC', 20)   # 请求线程等待上限 / Request wait limit
+RENDER_RETRY_AFTER_SEC = _env_int('SWEEP_RENDER_RETRY_AFTER_SEC', 2)
+
+
+class RenderRejected(Exception):
+    """
+    渲染请求未被执行。status 为建议的 HTTP 状态码。
+    The render was not executed; ``status`` is the suggested HTTP status.
+    """
+
+    def __init__(self, code: str, message: str, status: int, retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status = status
+        self.retry_after = retry_after
+
+    def response_headers(self) -> Dict[str, str]:
+        """错误响应需附带的头部 / Headers the error response must carry."""
+        return {'Retry-After': str(self.retry_after)} if self.retry_after else {}
+
+
+def _superseded() -> RenderRejected:
+    return RenderRejected('RENDER_SUPERSEDED', '请求已被更新的请求取代', 409)
+
+
+_task_state = threading.local()
+
+
+def is_cancelled() -> bool:
+    """
+    当前渲染任务的等待方是否已全部离开（超时或被取代）；渲染函数在阶段之间调用以提前退出。
+    Whether every waiter of the current render task has left (timed out or superseded);
+    renders call this between stages to stop early.
+    """
+    event = getattr(_task_state, 'cancel', None)
+    return event is not None and event.is_set()
+
+
+class _Waiter:
+    """等待某次渲染的一个请求 / One request waiting on a flight."""
+    __slots__ = ('uid', 'done', 'rejected')
+
+    def __init__(self, uid: Optional[str]):
+        self.uid = uid
+        self.done = threading.Event()
+        self.rejected: Optional[RenderRejected] = None
+
+
+class _Flight:
+    """同一 key 的一次渲染及其等待方 / One render for a key and the requests waiting on it."""
+    __slots__ = ('future', 'cancel', 'waiters', 'finished', 'abandoned')
+
+    def __init__(self):
+        self.future: Future = Future()
+        self.cancel = threading.Event()
+        self.waiters: set = set()
+        self.finished = False
+        self.abandoned = False
+
+
+class _RenderExecutor:
+    def __init__(self, workers: int, max_pending: int, max_per_uid: int):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sweep-render')
+        self._max_pending = max_pending
+        self._max_per_uid = max_per_uid
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._abandoned = 0
+        self._latest_by_uid: Dict[str, tuple] = {}  # uid -> (flight, waiter) of its newest request
+        self._running_by_uid: Dict[str, int] = {}
+        self._flights: Dict[str, _Flight] = {}
+
+    def _release(self, key: Optional[str], flight: _Flight) -> None:
+        with self._lock:
+            self._pending -= 1
+            if flight.abandoned:
+                self._abandoned -= 1
+            if key is not None and self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.finished = True
+            waiters = list(flight.waiters)
+        for waiter in waiters:
+            waiter.done.set()
+
+    def _detach(self, flight: _Flight, waiter: _Waiter) -> bool:
+        """
+        （持锁调用）将等待方从渲染上摘下；返回 True 表示它是最后一个，渲染应被取消。
+        (Lock held) Remove a waiter from its flight; True when it was the last one and
+        the render should be cancelled.
+        """
+        flight.waiters.discard(waiter)
+        if waiter.uid is not None:
+            latest = self._latest_by_uid.get(waiter.uid)
+            if latest is not None and latest[1] is waiter:
+                del self._latest_by_uid[waiter.uid]
+        if flight.waiters or flight.finished or flight.cancel.is_set():
+            return False
+        flight.cancel.set()
+        return True
+
+    def _abandon(self, flight: _Flight) -> None:
+        # 排队中的任务直接取消；已在运行的任务通过取消标记提前结束，结束前仍计入 pending（abandoned）。
+        # cancel() 会同步触发 _release，须在锁外调用
+        # A queued task is cancelled outright; a running one stops early via the cancel flag
+        # and keeps counting against pending (abandoned) until it does. cancel() runs
+        # _release synchronously, so it is called outside the lock
+        if flight.future.cancel():
+            return
+        with self._lock:
+            if not flight.future.done() and not flight.abandoned:
+                flight.abandoned = True
+                self._abandoned += 1
+
+    def _wait(self, flight: _Flight, waiter: _Waiter, timeout: Optional[float]) -> Any:
+        if not waiter.done.wait(timeout if timeout is not None else RENDER_TIMEOUT_SEC):
+            with self._lock:
+                timed_out = not waiter.done.is_set()
+                last = timed_out and self._detach(flight, waiter)
+            if timed_out:
+                if last:
+                    self._abandon(flight)
+                logger.warning("[sweep-render] render timed out (uid=%s) / 渲染等待超时", waiter.uid)
+                raise RenderRejected('RENDER_TIMEOUT', '音频渲染超时，请稍后重试', 503, RENDER_RETRY_AFTER_SEC)
+        if waiter.rejected is not None:
+            raise waiter.rejected
+        with self._lock:
+            self._detach(flight, waiter)
+        try:
+            return flight.future.result(timeout=0)
+        except CancelledError:
+            raise _superseded()
+
+    def run(self, fn: Callable[[], Any], *, uid: Optional[str] = None,
+            key: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+        """
+        在渲染线程中执行 fn() 并等待结果；被拒绝/取代/超时时抛出 RenderRejected。
+        Run ``fn()`` on a render thread and wait for it. Raises RenderRejected when
+        saturated, superseded by a newer request from the same uid, or timed out.
+
+        ``key`` 相同的并发请求（如同一 ETag 的多个 Range 请求）共享一次渲染，
+        既不占用额外名额，也不取代彼此。某 uid 被取代时只有它自己离开共享的渲染；
+        仅当没有其他等待方时渲染才被取消。
+        Concurrent requests with the same ``key`` (e.g. Range requests for one ETag) share
+        a single render: they take no extra slot and do not supersede each other. A
+        superseded uid only leaves a shared render; the render is cancelled only when no
+        other request is still waiting on it.
+        """
+        waiter = _Waiter(uid)
+        superseded = None
+        with self._lock:
+            flight = self._flights.get(key) if key is not None else None
+            created = flight is None or flight.finished or flight.cancel.is_set()
+            if created:
+                if self._pending >= self._max_pending:
+                    raise RenderRejected('RENDER_BUSY', '音频渲染繁忙，请稍后重试', 503, RENDER_RETRY_AFTER_SEC)
+                if uid is not None and self._running_by_uid.get(uid, 0) >= self._max_per_uid:
+                    raise RenderRejected('RENDER_RATE_LIMITED', '请求过于频繁，请稍后重试', 429, RENDER_RETRY_AFTER_SEC)
+                self._pending += 1
+                flight = _Flight()
+                if key is not None:
+                    self._flights[key] = flight
+            flight.waiters.add(waiter)
+            if uid is not None:
+                prev = self._latest_by_uid.get(uid)
+                self._latest_by_uid[uid] = (flight, waiter)
+                if prev is not None and prev[0] is not flight and not prev[0].finished:
+                    prev_flight, prev_waiter = prev
+                    prev_waiter.rejected = _superseded()
+                    superseded = (prev_flight, prev_waiter, self._detach(prev_flight, prev_waiter))
+        if superseded is not None:
+            prev_flight, prev_waiter, last = superseded
+            prev_waiter.done.set()
+            if last:
+                self._abandon(prev_flight)
+        if created:
+            self._submit(fn, uid, key, flight)
+        return self._wait(flight, waiter, timeout)
+
+    def _submit(self, fn: Callable[[], Any], uid: Optional[str], key: Optional[str], flight: _Flight) -> None:
+        future = flight.future
+
+        def _body():
+            # 排队期间等待方已全部离开时不再执行
+            # Skip the work entirely if every waiter left while it was queued
+            if flight.cancel.is_set():
+                raise _superseded()
+            if uid is not None:
+                with self._lock:
+                    self._running_by_uid[uid] = self._running_by_uid.get(uid, 0) + 1
+            _task_state.cancel = flight.cancel
+            try:
+                return fn()
+            finally:
+                _task_state.cancel = None
+                if uid is not None:
+                    with self._lock:
+                        left = self._running_by_uid.get(uid, 1) - 1
+                        if left > 0:
+                            self._running_by_uid[uid] = left
+                        else:
+                            self._running_by_uid.pop(uid, None)
+
+        def _task():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(_body())
+            except BaseException as e:
+                future.set_exception(e)
+
+        future.add_done_callback(lambda _f: self._release(key, flight))
+        try:
+            self._pool.submit(_task)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'pending': self._pending,
+                'max_pending': self._max_pending,
+                'abandoned': self._abandoned,
+                'running_uids': len(self._running_by_uid),
+            }
+
+
+_executor: Optional[_RenderExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> _RenderExecutor:
+    """惰性创建进程级执行器（gunicorn fork 后各 worker 独立）/ Lazily create the per-process executor."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = _RenderExecutor(RENDER_WORKERS, RENDER_MAX_PENDING, RENDER_MAX_PER_UID)
+    return _executor
+
+
+def run_render(fn: Callable[[], Any], *, uid: Optional[str] = None,
+               key: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+    return get_executor().run(fn, uid=uid, key=key, timeout=timeout)
@@ -2,6 +2,8 @@
 """
 spectrum_cache: 频谱模型缓存的统一管理（仅一份按 ID 命名的文件）
 文件命名：{model_id}_{condition_id}_spectrum.json
+附带二进制帧索引：{model_id}_{condition_id}_frames.npz（sweep_frame_index 的紧凑副本 + 按 rpm 排序的二级索引），
+音频播放路径读取它而无需解析整份 JSON。
 可供前端对外服务与后台管理端复用。
 """
 from __future__ import annotations
@@ -63,10 +65,102 @@ def save(model_json: Dict[str, Any], *, model_id: int, condition_id: int,
         except Exception:
             # Ignore errors during temp file cleanup; leftover temp files are not critical.
             pass
-    return {"path": p}
+    out_paths = {"path": p}
+    fp = save_frame_index(model_json, model_id=model_id, condition_id=condition_id)
+    if fp:
+        out_paths["frame_index_path"] = fp
+    return out_paths
+
+def frame_index_path(model_id: int, condition_id: int) -> str:
+    base = os.path.abspath(curve_cache_dir())
+    os.makedirs(base, exist_ok=True)
+    return os.path.join(base, f"{int(model_id)}_{int(condition_id)}_frames.npz")
+
+def save_frame_index(model_json: Dict[str, Any], *, model_id: int, condition_id: int) -> Optional[str]:
+    """
+    将 sweep_frame_index 打包为 npz：
+      frames      float64 (N, 5)  原始顺序的 [file_idx, frame_idx, rpm, la, reliability]，无效行为 NaN
+      rpm_sorted  float64 (M,)    有效帧的 rpm 升序
+      rpm_order   int32   (M,)    rpm_sorted 对应的 frames 行号
+      meta_json   str             sweep_audio_meta 的 JSON
+    模型不含扫频音频数据时不生成（并移除旧文件）；失败不影响 JSON 缓存本身。
+    """
+    fp = frame_index_path(model_id, condition_id)
+    frame_index = (model_json or {}).get("sweep_frame_index")
+    audio_meta = (model_json or {}).get("sweep_audio_meta")
+    if not isinstance(frame_index, list) or not frame_index or not audio_meta:
+        try:
+            if os.path.isfile(fp):
+                os.remove(fp)
+        except Exception:
+            pass
+        return None
+    try:
+        import numpy as np
+        import tempfile
+        nan = float("nan")
+        rows = []
+        for fr in frame_index:
+            try:
+                if isinstance(fr, (list, tuple)) and len(fr) >= 5:
+                    rows.append([float(fr[0]), float(fr[1]), float(fr[2]), float(fr[3]), float(fr[4])])
+                    continue
+            except (TypeError, ValueError):
+                pass
+            rows.append([nan] * 5)
+        frames = np.asarray(rows, dtype=np.float64).reshape(-1, 5)
+        rpm = frames[:, 2]
+        valid = np.flatnonzero(np.isfinite(rpm) & (rpm > 0))
+        order = valid[np.argsort(rpm[valid], kind="stable")].astype(np.int32)
+        d = os.path.dirname(fp)
+        fd, tmp = tempfile.mkstemp(prefix="fi_", suffix=".npz", dir=d)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    frames=frames,
+                    rpm_sorted=rpm[order],
+                    rpm_order=order,
+                    meta_json=np.array(json.dumps(audio_meta, ensure_ascii=False)),
+                )
+            os.replace(tmp, fp)
+        finally:
+            try:
+                os.remove(tmp)
+            except Exception:
+                pass
+        return fp
+    except Exception:
+        return None
+
+def load_frame_index(model_id: int, condition_id: int) -> Optional[Dict[str, Any]]:
+    """
+    读取二进制帧索引；不存在或早于 JSON 缓存（JSON 被其它途径重写）时返回 None，调用方回退到 JSON。
+    返回 {"frames", "rpm_sorted", "rpm_order", "sweep_audio_meta"}。
+    """
+    fp = frame_index_path(model_id, condition_id)
+    try:
+        if os.path.getmtime(fp) < os.path.getmtime(path(model_id, condition_id)):
+            return None
+        import numpy as np
+        with np.load(fp, allow_pickle=False) as z:
+            return {
+                "frames": z["frames"],
+                "rpm_sorted": z["rpm_sorted"],
+                "rpm_order": z["rpm_order"],
+                "sweep_audio_meta": json.loads(str(z["meta_json"])),
+            }
+    except Exception:
+        return None
 
 def delete(model_id: int, condition_id: int) -> bool:
     p = path(model_id, condition_id)
+    try:
+        fp = frame_index_path(model_id, condition_id)
+        if os.path.isfile(fp):
+            os.remove(fp)
+    except Exception:
+        pass
     try:
         if os.path.isfile(p):
             os.remove(p)
@@ -1,8 +1,16 @@
 import io
+import os
+import hashlib
 import logging
+import tempfile
+import threading
+from collections import OrderedDict
 import numpy as np
 import soundfile as sf
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Callable, Dict, Any, Optional, List, Tuple
+
+from app.curves.pchip_cache import curve_cache_dir
+from app.curves.lock_utils import startup_lock
 
 # 设置模块日志记录器 / Set up module logger
 logger = logging.getLogger(__name__)
@@ -23,6 +31,47 @@ MIN_CONTIGUOUS_FRAMES = 3     # 最少连续帧数 n / Minimum contiguous frames
 # 音频质量相关常量 / Audio quality related constants
 EPSILON = 1e-6  # 极小值，用于避免除零 / Epsilon value to avoid division by zero
 
+# 解码缓存相关常量 / Decoded-audio cache constants
+PCM_SIDECAR_ENABLED = os.getenv('SWEEP_AUDIO_PCM_SIDECAR', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+PCM_SIDECAR_SUBDIR = 'sweep_pcm'   # 侧车文件子目录（位于 curve_cache_dir 下）/ Sidecar subdir under curve_cache_dir
+PCM_SIDECAR_MAX_OPEN = 16          # 同时保持映射的侧车文件数 / Max sidecars kept memory-mapped
+try:
+    SEGMENT_CACHE_MAX_ITEMS = max(0, int(os.getenv('SWEEP_AUDIO_SEGMENT_CACHE_SIZE', '64')))
+except ValueError:
+    SEGMENT_CACHE_MAX_ITEMS = 64   # 已解码片段 LRU 容量 / Decoded segment LRU capacity
+
+# 输出编码格式 / Output encodings
+# name -> (container, subtype, channels, mimetype, file extension)
+# 默认 16-bit 单声道 WAV（体积约为历史 32-bit float 立体声 "wav" 的 1/4，仍可流式/Range）；
+# 前端 decodeAudioData 可解码全部格式
+# Default is 16-bit mono WAV (about 1/4 the size of the legacy 32-bit float stereo "wav",
+# still streamable with Range); the frontend's decodeAudioData handles all of them
+AUDIO_OUTPUT_FORMATS: Dict[str, Tuple[str, str, int, str, str]] = {
+    'wav': ('WAV', 'FLOAT', 2, 'audio/wav', 'wav'),
+    'wav_mono': ('WAV', 'FLOAT', 1, 'audio/wav', 'wav'),
+    'wav16': ('WAV', 'PCM_16', 1, 'audio/wav', 'wav'),
+    'flac': ('FLAC', 'PCM_16', 1, 'audio/flac', 'flac'),
+}
+DEFAULT_OUTPUT_FORMAT = os.getenv('SWEEP_AUDIO_DEFAULT_FORMAT', 'wav16').strip().lower()
+if DEFAULT_OUTPUT_FORMAT not in AUDIO_OUTPUT_FORMATS:
+    DEFAULT_OUTPUT_FORMAT = 'wav16'
+
+try:
+    RENDER_CACHE_MAX_ITEMS = max(0, int(os.getenv('SWEEP_AUDIO_RENDER_CACHE_SIZE', '16')))
+except ValueError:
+    RENDER_CACHE_MAX_ITEMS = 16    # 已渲染结果 LRU 容量（按 ETag）/ Rendered-result LRU capacity (keyed by ETag)
+
+_segment_cache: "OrderedDict[Tuple[str, int, int, int, int, int], np.ndarray]" = OrderedDict()
+_segment_cache_lock = threading.Lock()
+_sidecar_maps: "OrderedDict[Tuple[str, int, int], Tuple[np.ndarray, int]]" = OrderedDict()
+_sidecar_lock = threading.Lock()
+_render_cache: "OrderedDict[str, Tuple[np.ndarray, Dict[str, Any], Optional[bytes]]]" = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+
+class RenderCancelled(Exception):
+    """渲染在完成前被取消（所有等待方已超时）/ Render cancelled before completion (all waiters timed out)."""
+
 
 def detect_frame_format(frame_index: List[List], sweep_audio_meta: Optional[Dict[str, Any]] = None) -> str:
     """
@@ -115,20 +164,133 @@ def parse_frame_data(frame: List, format_type: str, sweep_audio_meta: Optional[D
     }
 
 
-def load_audio_segment(file_path: str, start_sample: int, end_sample: int, fs: int) -> np.ndarray:
+def _sidecar_key(file_path: str) -> Optional[Tuple[str, int, int]]:
     """
-    从音频文件中读取指定采样范围的音频数据。
-    Load audio samples from file within the specified range.
-    
-    Args:
-        file_path: 音频文件路径 / Path to audio file
-        start_sample: 起始采样点 / Start sample index
-        end_sample: 结束采样点 / End sample index
-        fs: 采样率 / Sample rate
-        
-    Returns:
-        音频数据数组 (float32) / Audio data array (float32)
+    以 (绝对路径, mtime_ns, size) 作为侧车文件的身份，源文件变化后自动失效。
+    Identity of a sidecar: (abs path, mtime_ns, size); changes to the source invalidate it.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (os.path.abspath(file_path), int(st.st_mtime_ns), int(st.st_size))
+
+
+def _sidecar_path(key: Tuple[str, int, int]) -> str:
+    digest = hashlib.sha1(f"{key[0]}|{key[1]}|{key[2]}".encode('utf-8')).hexdigest()[:20]
+    base = os.path.join(os.path.abspath(curve_cache_dir()), PCM_SIDECAR_SUBDIR)
+    os.makedirs(base, exist_ok=True)
+    return os.path.join(base, f"{digest}.f32")
+
+
+def _prune_pcm_sidecars(base: str) -> None:
+    """
+    删除源文件已被替换或删除的侧车文件（依据每个侧车旁的 .src 记录）。
+    Remove sidecars whose source was replaced or deleted (per the .src record next to each).
+    """
+    try:
+        names = os.listdir(base)
+    except OSError:
+        return
+    for name in names:
+        if not name.endswith('.src'):
+            continue
+        src_record = os.path.join(base, name)
+        try:
+            with open(src_record, 'r', encoding='utf-8') as f:
+                path, mtime_ns, size = f.read().strip().rsplit('|', 2)
+            current = _sidecar_key(path) == (path, int(mtime_ns), int(size))
+        except (OSError, ValueError):
+            continue
+        if current:
+            continue
+        stem = src_record[:-len('.src')]
+        for stale in (stem + '.f32', stem + '.f32.lock', src_record):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        logger.info("[sweep-audio] pruned stale PCM sidecar for %s / 已清理过期 PCM 侧车文件", path)
+
+
+def _build_pcm_sidecar(file_path: str, out_path: str) -> None:
+    """
+    将源文件整段解码为首声道 raw float32（小端）并原子写入侧车文件。
+    Decode the whole source (first channel) into raw little-endian float32 and write atomically.
+    """
+    data, _sr = sf.read(file_path, dtype='float32', always_2d=True)
+    mono = np.ascontiguousarray(data[:, 0], dtype='<f4')
+    d = os.path.dirname(out_path)
+    fd, tmp = tempfile.mkstemp(prefix="pcm_", suffix=".tmp", dir=d)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            mono.tofile(f)
+        os.replace(tmp, out_path)
+    finally:
+        try:
+            os.remove(tmp)
+        except Exception:
+            # Temp file already moved into place (or never created); nothing to clean up.
+            pass
+
+
+def _open_pcm_sidecar(file_path: str) -> Optional[Tuple[np.ndarray, int]]:
     """
+    返回源文件对应的 (内存映射 float32 数组, 采样率)；首次访问时生成侧车文件。
+    生成失败或另一进程正在生成时返回 None，调用方回退到直接解码。
+    Return (memory-mapped float32 array, sample rate) for the source, generating the
+    sidecar on first use. Returns None when unavailable so callers fall back to decoding.
+    """
+    key = _sidecar_key(file_path)
+    if key is None:
+        return None
+
+    with _sidecar_lock:
+        hit = _sidecar_maps.get(key)
+        if hit is not None:
+            _sidecar_maps.move_to_end(key)
+            return hit
+
+    try:
+        sr = int(sf.info(file_path).samplerate)
+        sp = _sidecar_path(key)
+        if not os.path.isfile(sp):
+            # 多 worker 下仅一个进程负责生成；未抢到锁的本次直接解码
+            # Only one worker builds a given sidecar; losers decode directly this time
+            with startup_lock(sp + ".lock") as acquired:
+                if not acquired:
+                    return None
+                if not os.path.isfile(sp):
+                    _build_pcm_sidecar(file_path, sp)
+                    with open(sp[:-len('.f32')] + '.src', 'w', encoding='utf-8') as f:
+                        f.write(f"{key[0]}|{key[1]}|{key[2]}")
+                    logger.info("[sweep-audio] PCM sidecar built: %s -> %s / 已生成 PCM 侧车文件", file_path, sp)
+                    _prune_pcm_sidecars(os.path.dirname(sp))
+        if os.path.getsize(sp) == 0:
+            return None
+        mm = np.memmap(sp, dtype='<f4', mode='r')
+    except Exception as e:
+        logger.warning("[sweep-audio] PCM sidecar unavailable for %s: %s / PCM 侧车文件不可用", file_path, e)
+        return None
+
+    entry = (mm, sr)
+    with _sidecar_lock:
+        _sidecar_maps[key] = entry
+        _sidecar_maps.move_to_end(key)
+        while len(_sidecar_maps) > PCM_SIDECAR_MAX_OPEN:
+            _sidecar_maps.popitem(last=False)
+    return entry
+
+
+def _decode_audio_segment(file_path: str, start_sample: int, end_sample: int, fs: int) -> np.ndarray:
+    if PCM_SIDECAR_ENABLED:
+        sidecar = _open_pcm_sidecar(file_path)
+        if sidecar is not None:
+            mm, sr = sidecar
+            if sr != fs:
+                raise ValueError(f"采样率不匹配：文件为 {sr} Hz，期望 {fs} Hz / Sample rate mismatch: file is {sr} Hz, expected {fs} Hz")
+            return np.array(mm[max(0, start_sample):max(0, end_sample)], dtype=np.float32)
+
     # 读取指定范围的音频数据
     # Read audio data in the specified range
     data, sr = sf.read(file_path, start=start_sample, stop=end_sample, dtype='float32')
@@ -144,6 +306,90 @@ def load_audio_segment(file_path: str, start_sample: int, end_sample: int, fs: i
     return data.astype(np.float32)
 
 
+def load_audio_segment(file_path: str, start_sample: int, end_sample: int, fs: int) -> np.ndarray:
+    """
+    从音频文件中读取指定采样范围的音频数据。
+    Load audio samples from file within the specified range.
+
+    读取顺序：已解码片段 LRU → PCM 侧车文件（内存映射）→ soundfile 解码。
+    Lookup order: decoded-segment LRU -> memory-mapped PCM sidecar -> soundfile decode.
+    
+    Args:
+        file_path: 音频文件路径 / Path to audio file
+        start_sample: 起始采样点 / Start sample index
+        end_sample: 结束采样点 / End sample index
+        fs: 采样率 / Sample rate
+        
+    Returns:
+        音频数据数组 (float32)，调用方可自由修改 / Audio data array (float32), owned by the caller
+    """
+    # 源文件身份含 mtime/size，替换录音后旧片段不再命中
+    # Source identity includes mtime/size so a replaced recording stops hitting old segments
+    source_key = _sidecar_key(file_path) if SEGMENT_CACHE_MAX_ITEMS > 0 else None
+    key = source_key + (int(start_sample), int(end_sample), int(fs)) if source_key is not None else None
+    if key is not None:
+        with _segment_cache_lock:
+            cached = _segment_cache.get(key)
+            if cached is not None:
+                _segment_cache.move_to_end(key)
+                return cached.copy()
+
+    data = _decode_audio_segment(file_path, int(start_sample), int(end_sample), int(fs))
+
+    if key is not None:
+        with _segment_cache_lock:
+            _segment_cache[key] = data.copy()
+            _segment_cache.move_to_end(key)
+            while len(_segment_cache) > SEGMENT_CACHE_MAX_ITEMS:
+                _segment_cache.popitem(last=False)
+    return data
+
+
+class PackedFrameIndex:
+    """
+    sweep_frame_index 的二进制紧凑形式（见 spectrum_cache.save_frame_index）。
+    Packed binary form of sweep_frame_index (see spectrum_cache.save_frame_index).
+
+    行为与列表形式一致：按下标返回 [file_idx, frame_idx, rpm, la, reliability] 元组，
+    因此选段/合并函数无需区分两种形式；rpm 窗口查询通过 rpm_sorted 二分完成。
+    Indexing yields the same 5-tuples as the list form, so the selection helpers work
+    unchanged; rpm-window lookups use a binary search over ``rpm_sorted``.
+    """
+
+    __slots__ = ("frames", "rpm_sorted", "rpm_order")
+
+    def __init__(self, frames: np.ndarray, rpm_sorted: np.ndarray, rpm_order: np.ndarray):
+        self.frames = frames
+        self.rpm_sorted = rpm_sorted
+        self.rpm_order = rpm_order
+
+    def __len__(self) -> int:
+        return int(self.frames.shape[0])
+
+    def __getitem__(self, i: int) -> Tuple[float, ...]:
+        return tuple(self.frames[i].tolist())
+
+    def indices_in_rpm_window(self, rpm_min: float, rpm_max: float) -> np.ndarray:
+        """返回 rpm ∈ [rpm_min, rpm_max] 的帧下标（原始顺序）/ Frame indices with rpm in the window, ascending."""
+        lo = int(np.searchsorted(self.rpm_sorted, rpm_min, side='left'))
+        hi = int(np.searchsorted(self.rpm_sorted, rpm_max, side='right'))
+        return np.sort(self.rpm_order[lo:hi])
+
+
+def validate_packed_frame_index(packed: PackedFrameIndex, sweep_audio_meta: Optional[Dict[str, Any]]) -> bool:
+    """
+    二进制帧索引的有效性检查（等价于 validate_model_has_frame_index）。
+    Validity check for the packed index (equivalent of validate_model_has_frame_index).
+    """
+    if not sweep_audio_meta or not isinstance(sweep_audio_meta, dict):
+        logger.warning("[sweep-audio] validate: sweep_audio_meta is missing (required for meta format)")
+        return False
+    if len(packed) == 0 or packed.rpm_sorted.size == 0:
+        logger.warning("[sweep-audio] validate: packed frame index has no valid rpm frames")
+        return False
+    return True
+
+
 def filter_frames_by_rpm_fixed_tolerance(
     frame_index: List[List[float]],
     target_rpm: float,
@@ -171,6 +417,21 @@ def filter_frames_by_rpm_fixed_tolerance(
         target_rpm, tolerance, tolerance_percent, MIN_RELIABILITY
     )
 
+    if isinstance(frame_index, PackedFrameIndex):
+        # 二分定位 rpm 窗口，仅对窗口内的帧检查 reliability
+        # Binary-search the rpm window, then apply the reliability constraint to that slice only
+        cand = frame_index.indices_in_rpm_window(rpm_min, rpm_max)
+        rel = frame_index.frames[cand, 4]
+        keep = cand[np.isfinite(rel) & (rel >= MIN_RELIABILITY)]
+        filtered_indices = [int(i) for i in keep]
+        logger.info(
+            "[sweep-audio] Fixed tolerance: found %d frames in range [%.1f, %.1f] / "
+            "固定容差: 在范围 [%.1f, %.1f] 内找到 %d 帧",
+            len(filtered_indices), rpm_min, rpm_max,
+            rpm_min, rpm_max, len(filtered_indices),
+        )
+        return filtered_indices
+
     filtered_indices: List[int] = []
     for idx, frame_data in enumerate(frame_index):
         if not isinstance(frame_data, (list, tuple)) or len(frame_data) < 5:
@@ -590,6 +851,65 @@ def apply_crossfade(audio1: np.ndarray, audio2: np.ndarray, fade_samples: int) -
 
     return np.concatenate([a_pre, a_ov + b_ov, b_post])
 
+def resolve_output_format(requested: Optional[str] = None, accept_header: Optional[str] = None) -> str:
+    """
+    协商输出格式：显式参数优先，其次 Accept 头，最后使用默认格式。
+    Negotiate output format: explicit parameter first, then Accept header, then the default.
+
+    Accept 协商仅识别 audio/flac（及 audio/x-flac）；其它值使用默认格式（wav16）。
+    Accept negotiation only recognises audio/flac (and audio/x-flac); anything else gets the
+    default format (wav16).
+
+    Raises:
+        ValueError: 显式参数不是已知格式 / Explicit parameter is not a known format
+    """
+    if requested:
+        name = str(requested).strip().lower()
+        if name not in AUDIO_OUTPUT_FORMATS:
+            raise ValueError(
+                f"不支持的音频格式: {requested}（可选: {', '.join(AUDIO_OUTPUT_FORMATS)}）/ "
+                f"Unsupported audio format: {requested}"
+            )
+        return name
+    if accept_header:
+        for part in accept_header.split(','):
+            mime = part.split(';', 1)[0].strip().lower()
+            if mime in ('audio/flac', 'audio/x-flac'):
+                return 'flac'
+    return DEFAULT_OUTPUT_FORMAT
+
+
+def encode_audio_bytes(audio_data: np.ndarray, fs: int, output_format: str = 'wav') -> bytes:
+    """
+    按指定输出格式编码单声道缓冲区。
+    Encode a mono buffer into the requested output format.
+
+    整数 PCM 子类型在写入前裁剪到 [-1, 1]，避免 libsndfile 溢出回绕；float 格式不做任何增益或裁剪。
+    Integer PCM subtypes are clipped to [-1, 1] first to avoid libsndfile wrap-around; float
+    formats keep the float32 pipeline untouched.
+
+    Args:
+        audio_data: 音频数据数组 (float32, -1.0 到 1.0) / Audio data array (float32, -1.0 to 1.0)
+        fs: 采样率 / Sample rate
+        output_format: AUDIO_OUTPUT_FORMATS 中的键 / Key of AUDIO_OUTPUT_FORMATS
+
+    Returns:
+        编码后的字节流 / Encoded bytes
+    """
+    container, subtype, channels, _mime, _ext = AUDIO_OUTPUT_FORMATS[output_format]
+    mono = audio_data.astype(np.float32)
+    if subtype != 'FLOAT':
+        mono = np.clip(mono, -1.0, 1.0)
+    if channels == 2:
+        payload = np.stack([mono, mono], axis=1)  # shape: (N, 2)
+    else:
+        payload = mono
+
+    buffer = io.BytesIO()
+    sf.write(buffer, payload, fs, format=container, subtype=subtype)
+    return buffer.getvalue()
+
+
 def create_wav_bytes(audio_data: np.ndarray, fs: int) -> bytes:
     """
     将音频数据转换为 WAV 格式的字节流。
@@ -607,15 +927,7 @@ def create_wav_bytes(audio_data: np.ndarray, fs: int) -> bytes:
     Returns:
         WAV 格式的字节流 / WAV format bytes
     """
-    # 将单声道缓冲区复制为立体声（L/R 相同），输出 32-bit float WAV
-    # Duplicate mono buffer to stereo (identical L/R), write as 32-bit float WAV
-    mono = audio_data.astype(np.float32)
-    stereo = np.stack([mono, mono], axis=1)  # shape: (N, 2)
-
-    wav_buffer = io.BytesIO()
-    sf.write(wav_buffer, stereo, fs, format='WAV', subtype='FLOAT')
-    wav_buffer.seek(0)
-    return wav_buffer.read()
+    return encode_audio_bytes(audio_data, fs, 'wav')
 
 
 def generate_sweep_audio(
@@ -623,7 +935,38 @@ def generate_sweep_audio(
     target_rpm: float,
     duration_sec: Optional[float] = None,
     corr_max_shift_samples: Optional[int] = None, 
+    output_format: str = 'wav',
 ) -> Tuple[bytes, Dict[str, Any]]:
+    final_audio, metadata = render_sweep_audio(
+        model_json, target_rpm,
+        duration_sec=duration_sec,
+        corr_max_shift_samples=corr_max_shift_samples,
+        output_format=output_format,
+    )
+    wav_bytes = encode_audio_bytes(final_audio, metadata["sample_rate"], output_format)
+    return wav_bytes, metadata
+
+
+def render_sweep_audio(
+    model_json: Dict[str, Any],
+    target_rpm: float,
+    duration_sec: Optional[float] = None,
+    corr_max_shift_samples: Optional[int] = None,
+    output_format: str = 'wav',
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    选段并拼接出最终的单声道 float32 缓冲区，但不做编码（供流式输出使用）。
+    Select and stitch the final mono float32 buffer without encoding it (used for streaming).
+
+    should_cancel 在各阶段之间调用，返回 True 时抛出 RenderCancelled（等待方已放弃）。
+    ``should_cancel`` is polled between stages; True raises RenderCancelled (the waiters gave up).
+
+    Returns:
+        (final_audio, metadata)
+    """
+    if output_format not in AUDIO_OUTPUT_FORMATS:
+        raise ValueError(f"不支持的音频格式: {output_format} / Unsupported audio format: {output_format}")
     if not model_json:
         raise ValueError("模型 JSON 为空 / Model JSON is empty")
     if target_rpm <= 0:
@@ -636,15 +979,19 @@ def generate_sweep_audio(
             TARGET_DURATION_SEC, TARGET_DURATION_SEC
         )
 
+    # sweep_frame_index 可为 JSON 列表，或来自 spectrum_cache.load_frame_index 的 PackedFrameIndex
+    # sweep_frame_index is either the JSON list or a PackedFrameIndex from spectrum_cache.load_frame_index
     sweep_frame_index = model_json.get('sweep_frame_index')
-    if not sweep_frame_index or not isinstance(sweep_frame_index, list):
+    is_packed = isinstance(sweep_frame_index, PackedFrameIndex)
+    if not is_packed and (not sweep_frame_index or not isinstance(sweep_frame_index, list)):
         raise ValueError("模型 JSON 中缺少或无效的 sweep_frame_index / sweep_frame_index missing or invalid")
 
     sweep_audio_meta = model_json.get('sweep_audio_meta')
     if not sweep_audio_meta:
         raise ValueError("模型 JSON 中缺少 sweep_audio_meta / sweep_audio_meta missing in model JSON")
 
-    frame_format = detect_frame_format(sweep_frame_index, sweep_audio_meta)
+    # 二进制索引在打包时已统一为 5 字段 meta 格式 / Packed index is normalised to the 5-field meta format
+    frame_format = "meta" if is_packed else detect_frame_format(sweep_frame_index, sweep_audio_meta)
 
     if 'files' not in sweep_audio_meta or not sweep_audio_meta['files']:
         raise ValueError("元数据格式需要 sweep_audio_meta.files / Meta format requires sweep_audio_meta.files")
@@ -662,6 +1009,10 @@ def generate_sweep_audio(
         samples_per_rev = int(fs * 60.0 / target_rpm)
         corr_max_shift_samples = max(1, int(samples_per_rev * 1.5))
 
+    def _check_cancelled():
+        if should_cancel is not None and should_cancel():
+            raise RenderCancelled("渲染已取消 / Render cancelled")
+
     filtered_list_indices = filter_frames_by_rpm_fixed_tolerance(
         sweep_frame_index,
         target_rpm,
@@ -672,6 +1023,7 @@ def generate_sweep_audio(
             "无法匹配到有效的音频数据（容差/可靠性过滤后为空），请尝试其他转速或噪音值。/ "
             "Cannot match valid audio data after tolerance/reliability filtering."
         )
+    _check_cancelled()
 
     merged_segment, best_debug = find_best_clip_segments(
         sweep_frame_index,
@@ -679,6 +1031,7 @@ def generate_sweep_audio(
         sweep_audio_meta,
         n=MIN_CONTIGUOUS_FRAMES
     )
+    _check_cancelled()
 
     loop_clip_audio = load_audio_segment(
         merged_segment["file_path"],
@@ -695,6 +1048,7 @@ def generate_sweep_audio(
         best_debug.get("file_idx"), best_debug.get("clip_len_frames"), loop_clip_duration, best_debug.get("diff")
     )
 
+    _check_cancelled()
     if loop_clip_duration >= TARGET_DURATION_SEC:
         final_audio = loop_clip_audio
         did_loop = False
@@ -710,12 +1064,16 @@ def generate_sweep_audio(
         did_loop = True
 
     final_duration_sec = len(final_audio) / fs
-    wav_bytes = create_wav_bytes(final_audio, fs)
+    _container, _subtype, out_channels, out_mimetype, out_ext = AUDIO_OUTPUT_FORMATS[output_format]
 
     metadata = {
         "target_rpm": float(target_rpm),
         "duration_sec": float(final_duration_sec),
         "sample_rate": int(fs),
+        "output_format": output_format,
+        "mimetype": out_mimetype,
+        "file_ext": out_ext,
+        "channels": int(out_channels),
         "frame_format": frame_format,
         "tolerance_used": float(max(SELECTION_TOL_RPM, SELECTION_TOL_RATIO * target_rpm)),
         "min_reliability": float(MIN_RELIABILITY),
@@ -730,7 +1088,126 @@ def generate_sweep_audio(
         }
     }
 
-    return wav_bytes, metadata
+    return final_audio, metadata
+
+
+def get_cached_render(key: str) -> Optional[Tuple[np.ndarray, Dict[str, Any], Optional[bytes]]]:
+    """
+    按 ETag 取已渲染结果 (final_audio, metadata, 已编码字节或 None)；数组只读共享。
+    Rendered result for an ETag: (final_audio, metadata, encoded bytes or None); the array is shared read-only.
+    """
+    if RENDER_CACHE_MAX_ITEMS <= 0 or not key:
+        return None
+    with _render_cache_lock:
+        hit = _render_cache.get(key)
+        if hit is not None:
+            _render_cache.move_to_end(key)
+        return hit
+
+
+def put_cached_render(key: str, final_audio: np.ndarray, metadata: Dict[str, Any],
+                      payload: Optional[bytes] = None) -> None:
+    """
+    缓存渲染结果，使同一 ETag 的 Range 请求只切片而不重新渲染。
+    Cache a render so Range requests for the same ETag slice it instead of re-rendering.
+    """
+    if RENDER_CACHE_MAX_ITEMS <= 0 or not key:
+        return
+    final_audio.flags.writeable = False
+    with _render_cache_lock:
+        _render_cache[key] = (final_audio, metadata, payload)
+        _render_cache.move_to_end(key)
+        while len(_render_cache) > RENDER_CACHE_MAX_ITEMS:
+            _render_cache.popitem(last=False)
+
+
+# ---------------------------------------------------------------------------
+# 流式 WAV 输出 / Streaming WAV output
+# ---------------------------------------------------------------------------
+
+STREAM_CHUNK_BYTES = 64 * 1024  # 每次 yield 的数据量 / Bytes per yielded chunk
+
+
+class WavStream:
+    """
+    将单声道 float32 缓冲区按需编码为 WAV 字节流：头部由预知长度直接生成，数据按块编码，
+    支持任意字节区间（HTTP Range），不在内存中保留完整编码结果。
+    Lazily encode a mono float32 buffer as a WAV byte stream. The header is built from the
+    known length, data is encoded chunk by chunk, and any byte range (HTTP Range) can be
+    produced without materialising the whole encoded payload.
+
+    仅支持 WAV 容器；FLAC 长度无法预知，调用方应改用 encode_audio_bytes。
+    WAV containers only; FLAC length is not known up front, so callers use encode_audio_bytes.
+    """
+
+    def __init__(self, audio_data: np.ndarray, fs: int, output_format: str = 'wav'):
+        container, subtype, channels, _mime, _ext = AUDIO_OUTPUT_FORMATS[output_format]
+        if container != 'WAV':
+            raise ValueError(f"格式不支持流式输出: {output_format} / Format cannot be streamed: {output_format}")
+        self.fs = int(fs)
+        self.channels = int(channels)
+        self.is_float = subtype == 'FLOAT'
+        self.sample_bytes = 4 if self.is_float else 2
+        self.frame_bytes = self.sample_bytes * self.channels
+        self._audio = np.asarray(audio_data, dtype=np.float32)
+        self.num_frames = int(len(self._audio))
+        self.data_bytes = self.num_frames * self.frame_bytes
+        self.header = self._build_header()
+        self.total_length = len(self.header) + self.data_bytes
+
+    def _build_header(self) -> bytes:
+        import struct
+        byte_rate = self.fs * self.frame_bytes
+        bits = self.sample_bytes * 8
+        if self.is_float:
+            # WAVE_FORMAT_IEEE_FLOAT：18 字节 fmt（cbSize=0）+ fact 块 / 18-byte fmt + fact chunk
+            fmt = struct.pack('<HHIIHHH', 3, self.channels, self.fs, byte_rate, self.frame_bytes, bits, 0)
+            extra = b'fact' + struct.pack('<II', 4, self.num_frames)
+        else:
+            fmt = struct.pack('<HHIIHH', 1, self.channels, self.fs, byte_rate, self.frame_bytes, bits)
+            extra = b''
+        body = (
+            b'WAVE'
+            + b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+            + extra
+            + b'data' + struct.pack('<I', self.data_bytes)
+        )
+        return b'RIFF' + struct.pack('<I', len(body) + self.data_bytes) + body
+
+    def _encode_frames(self, f0: int, f1: int) -> bytes:
+        block = self._audio[f0:f1]
+        if self.is_float:
+            block = block.astype('<f4', copy=False)
+        else:
+            block = np.round(np.clip(block, -1.0, 1.0) * 32767.0).astype('<i2')
+        if self.channels == 2:
+            block = np.repeat(block, 2)
+        return block.tobytes()
+
+    def iter_bytes(self, start: int = 0, end: Optional[int] = None, chunk_bytes: int = STREAM_CHUNK_BYTES):
+        """
+        生成 [start, end]（含两端）字节区间的内容。
+        Yield the bytes of the inclusive range [start, end].
+        """
+        if end is None or end >= self.total_length:
+            end = self.total_length - 1
+        pos = max(0, int(start))
+        hlen = len(self.header)
+        if pos < hlen and pos <= end:
+            yield self.header[pos:min(hlen, end + 1)]
+            pos = hlen
+        frames_per_chunk = max(1, int(chunk_bytes) // self.frame_bytes)
+        while pos <= end:
+            rel = pos - hlen
+            f0 = rel // self.frame_bytes
+            f1 = min(self.num_frames, f0 + frames_per_chunk)
+            chunk = self._encode_frames(f0, f1)
+            lo = rel - f0 * self.frame_bytes
+            hi = min(len(chunk), end + 1 - hlen - f0 * self.frame_bytes)
+            if hi <= lo:
+                break
+            yield chunk[lo:hi]
+            pos += hi - lo
 
 def validate_model_has_frame_index(model_json: Dict[str, Any]) -> bool:
     """
@@ -10,6 +10,8 @@ from sqlalchemy import BigInteger, Column, DateTime, Integer, MetaData, String,
 
 EVENT_WARM_SCORES = 'warm_scores'
 EVENT_REFRESH_SCORING_VISIBILITY = 'refresh_scoring_visibility'
+EVENT_REFRESH_META = 'refresh_meta'
+EVENT_RELOAD_SCORES = 'reload_scores'
 
 _metadata = MetaData()
 _id_type = BigInteger().with_variant(Integer, 'sqlite')
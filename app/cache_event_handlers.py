@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import logging
 
-from app import model_meta_cache, scoring_system
+from app import condition_meta_cache, model_meta_cache, perf_columns_cache, scoring_system, search_result_cache
 from app.audio_services import spectrum_reader
-from app.cache_event_bus import EVENT_REFRESH_SCORING_VISIBILITY, EVENT_WARM_SCORES
+from app.cache_event_bus import EVENT_REFRESH_META, EVENT_REFRESH_SCORING_VISIBILITY, EVENT_RELOAD_SCORES, EVENT_WARM_SCORES
 
 _logger = logging.getLogger(__name__)
 
@@ -35,15 +35,28 @@ def warm_scores(model_id: int, condition_id: int, *, rebuild_pchip: bool = False
             _logger.warning('[warm_scores] pchip rebuild (%s,%s): %s', model_id, condition_id, exc)
 
     scoring_system.refresh_model_score_cache(model_id)
+    # The perf data behind this pair changed: rebuild its search columns.
+    perf_columns_cache.invalidate(condition_id)
+    # Score-ordered searches depend on the refreshed score.
+    search_result_cache.invalidate()
 
 
-def refresh_scoring_visibility(model_id: int | None, old_is_valid=None, new_is_valid=None, old_visibility_scope=None, new_visibility_scope=None) -> None:
-    model_meta_cache.invalidate()
+def refresh_scoring_visibility(model_id: int | None, old_is_valid=None, new_is_valid=None, old_visibility_scope=None, new_visibility_scope=None, *, model_ids=None, wait: bool = False) -> bool:
+    """Apply a visibility change in this worker; returns True once its scoring
+    caches reflect it (always waited for with ``wait``)."""
     try:
-        model_meta_cache.refresh()
+        # Visibility edits bump the model's change marker (or remove it from the
+        # view), so a delta refresh picks them up without reloading the catalog.
+        model_meta_cache.refresh(incremental=True)
     except Exception as exc:
         _logger.error('[refresh_scoring_visibility] model_meta_cache reload failed: %s', exc)
-    scoring_system.refresh_visibility_scoring_caches()
+    mids = [_as_int(mid) for mid in (model_ids or [])]
+    if _as_int(model_id) > 0:
+        mids.append(_as_int(model_id))
+    # One worker rebuilds under the visibility-sync lock; the others adopt its
+    # results when the 'reload_scores' event arrives.
+    synced = scoring_system.refresh_visibility_scoring_caches([mid for mid in mids if mid > 0], wait=wait)
+    search_result_cache.invalidate()
     _logger.info(
         '[refresh_scoring_visibility] refreshed caches for model_id=%s is_valid(%s -> %s) visibility_scope(%s -> %s)',
         _as_int(model_id) or 'unknown',
@@ -52,6 +65,34 @@ def refresh_scoring_visibility(model_id: int | None, old_is_valid=None, new_is_v
         old_visibility_scope,
         new_visibility_scope,
     )
+    return synced
+
+
+def reload_scores(denom_written_at=None) -> None:
+    """Adopt the scoring caches another worker rebuilt after a visibility change."""
+    if scoring_system.reload_shared_scoring_caches(denom_written_at):
+        search_result_cache.invalidate()
+
+
+def refresh_meta(caches=None, *, full: bool = True) -> None:
+    """Reload the model / condition meta caches in the background.
+
+    ``caches`` is an optional list of ``'model'`` / ``'condition'``; both are
+    refreshed when omitted.  Readers keep the current snapshot until the
+    reload finishes.  ``full=False`` lets the model cache apply a delta
+    refresh (purchase-link-only edits need a full one).
+    """
+    wanted = {str(c).strip().lower() for c in (caches or []) if str(c).strip()} or {'model', 'condition'}
+    if 'model' in wanted:
+        model_meta_cache.invalidate()
+        model_meta_cache.refresh_async(rerun_if_running=True, full=full)
+    if 'condition' in wanted:
+        condition_meta_cache.invalidate()
+        condition_meta_cache.refresh_async(rerun_if_running=True)
+    # Entries are also keyed by the meta snapshot version; clearing here just
+    # frees them without waiting for the reload.
+    search_result_cache.invalidate()
+    _logger.info('[refresh_meta] scheduled background reload for %s', ','.join(sorted(wanted)))
 
 
 def handle_event(event: dict) -> None:
@@ -76,6 +117,21 @@ def handle_event(event: dict) -> None:
             payload.get('new_is_valid'),
             payload.get('old_visibility_scope'),
             payload.get('new_visibility_scope'),
+            model_ids=payload.get('model_ids') if isinstance(payload.get('model_ids'), list) else None,
+        )
+        return
+
+    if event_type == EVENT_RELOAD_SCORES:
+        reload_scores(payload.get('denom_written_at'))
+        return
+
+    if event_type == EVENT_REFRESH_META:
+        caches = payload.get('caches')
+        if isinstance(caches, str):
+            caches = [caches]
+        refresh_meta(
+            caches if isinstance(caches, list) else None,
+            full=not bool(payload.get('incremental')),
         )
         return
 
@@ -10,6 +10,9 @@ _ttl_sec = _DEFAULT_TTL_SEC
 _cache_lock = threading.RLock()
 _cache_data: Dict[int, dict] = {}
 _cache_loaded_at = 0.0
+_cache_version = 0
+_refresh_inflight = False
+_refresh_again = False  # a reload was requested while one was already running
 
 
 def setup(fetch_all: Callable, logger=None, ttl_sec: int = _DEFAULT_TTL_SEC) -> None:
@@ -57,12 +60,53 @@ def refresh() -> Dict[int, dict]:
         data[condition_id] = item
 
     with _cache_lock:
-        global _cache_data, _cache_loaded_at
+        global _cache_data, _cache_loaded_at, _cache_version
+        if data != _cache_data:
+            _cache_version += 1
         _cache_data = data
         _cache_loaded_at = time.time()
     return {cid: dict(meta) for cid, meta in data.items()}
 
 
+def _background_refresh() -> None:
+    global _refresh_inflight, _refresh_again, _cache_loaded_at
+    while True:
+        try:
+            refresh()
+        except Exception:
+            if _logger:
+                _logger.exception('condition_meta_cache background refresh failed')
+            # Keep serving the stale data; retry after another TTL.
+            with _cache_lock:
+                _cache_loaded_at = time.time()
+        with _cache_lock:
+            if _refresh_again:
+                _refresh_again = False
+                continue
+            _refresh_inflight = False
+            return
+
+
+def refresh_async(*, rerun_if_running: bool = False) -> bool:
+    """Start a background reload unless one is already running (see model_meta_cache.refresh_async)."""
+    global _refresh_inflight, _refresh_again
+    with _cache_lock:
+        if _refresh_inflight:
+            # An explicit trigger (e.g. a cache event) must not be absorbed by a
+            # reload that may have read the DB before the triggering change.
+            if rerun_if_running:
+                _refresh_again = True
+            return False
+        _refresh_inflight = True
+    try:
+        threading.Thread(target=_background_refresh, daemon=True, name='condition-meta-refresh').start()
+    except Exception:
+        with _cache_lock:
+            _refresh_inflight = False
+        raise
+    return True
+
+
 def _ensure_loaded(force_refresh: bool = False) -> None:
     global _cache_loaded_at
     now = time.time()
@@ -70,6 +114,11 @@ def _ensure_loaded(force_refresh: bool = False) -> None:
         with _cache_lock:
             if not _cache_expired(now):
                 return
+            has_data = bool(_cache_data)
+        if has_data:
+            # Stale-while-revalidate: serve the old data, reload in the background.
+            refresh_async()
+            return
     try:
         refresh()
     except Exception:
@@ -83,6 +132,13 @@ def _ensure_loaded(force_refresh: bool = False) -> None:
             return
         raise
 
+
+def invalidate() -> None:
+    """Expire the cache; the next read schedules a background reload."""
+    with _cache_lock:
+        global _cache_loaded_at
+        _cache_loaded_at = 0.0
+
 def get_condition_meta(condition_id: int, *, force_refresh: bool = False) -> dict | None:
     try:
         condition_id = int(condition_id)
@@ -118,3 +174,10 @@ def get_all_conditions(*, valid_only: bool = False, force_refresh: bool = False)
         items = [item for item in items if int(item.get('is_valid') or 0) == 1]
     items.sort(key=lambda item: ((item.get('condition_name_zh') or ''), item.get('condition_id') or 0))
     return items
+
+
+def get_cache_version(*, force_refresh: bool = False) -> int:
+    """Return a counter that changes whenever a refresh loads different data."""
+    _ensure_loaded(force_refresh=force_refresh)
+    with _cache_lock:
+        return _cache_version
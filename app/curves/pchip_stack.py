@@ -0,0 +1,67 @@
+"""Batched evaluation of many PCHIP models (``pchip_cache`` model dicts) with numpy.
+
+Used where one query touches every model of a condition at once: the
+baseline medians and raw scores in ``scoring_system`` and the effective
+values of ``perf_columns_cache``.
+"""
+import numpy as np
+
+
+class PchipStack:
+    """Knots of many PCHIP models packed into flat arrays for batched evaluation.
+
+    Mirrors ``eval_pchip`` inside each model's domain: every (model, x) query
+    finds its segment with one ``np.searchsorted`` over the packed knots (each
+    model's knots are shifted into their own disjoint band) and applies the
+    same cubic Hermite basis.  Models need at least two knots.
+    """
+
+    def __init__(self, models: list[dict]):
+        xs = [np.asarray(m['x'], dtype=float) for m in models]
+        self.count = len(models)
+        self.lengths = np.array([len(x) for x in xs], dtype=np.int64)
+        self.starts = np.concatenate(([0], np.cumsum(self.lengths)[:-1])).astype(np.int64) if xs else np.zeros(0, np.int64)
+        self.x = np.concatenate(xs) if xs else np.zeros(0)
+        self.y = np.concatenate([np.asarray(m['y'], dtype=float) for m in models]) if xs else np.zeros(0)
+        self.m = np.concatenate([np.asarray(m['m'], dtype=float) for m in models]) if xs else np.zeros(0)
+        self.x_min = np.array([x[0] for x in xs]) if xs else np.zeros(0)
+        self.x_max = np.array([x[-1] for x in xs]) if xs else np.zeros(0)
+        if xs:
+            self._origin = float(self.x.min())
+            self._band = float(self.x.max() - self._origin) + 1.0
+            owner = np.repeat(np.arange(self.count), self.lengths)
+            self._packed = owner * self._band + (self.x - self._origin)
+
+    def eval_pairs(self, model_idx, q):
+        """Evaluate model ``model_idx[j]`` at ``q[j]`` (q inside the model's domain)."""
+        model_idx = np.asarray(model_idx, dtype=np.int64)
+        q = np.asarray(q, dtype=float)
+        pos = np.searchsorted(self._packed, model_idx * self._band + (q - self._origin), side='right') - 1
+        lo = self.starts[model_idx]
+        i = np.clip(pos, lo, lo + self.lengths[model_idx] - 2)
+        x0 = self.x[i]
+        h = self.x[i + 1] - x0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(h != 0, (q - x0) / h, 0.0)
+        t2 = t * t
+        t3 = t2 * t
+        return ((2 * t3 - 3 * t2 + 1) * self.y[i] + (t3 - 2 * t2 + t) * (self.m[i] * h)
+                + (-2 * t3 + 3 * t2) * self.y[i + 1] + (t3 - t2) * (self.m[i + 1] * h))
+
+    def domain_mask(self, grid) -> np.ndarray:
+        """(models x grid) mask of grid points inside each model's [x0, x1]."""
+        grid = np.asarray(grid, dtype=float)
+        return (self.x_min[:, None] <= grid[None, :]) & (grid[None, :] <= self.x_max[:, None])
+
+    def eval_grid(self, grid) -> np.ndarray:
+        """(models x grid) matrix of positive finite values; NaN outside each domain."""
+        grid = np.asarray(grid, dtype=float)
+        out = np.full((self.count, grid.size), np.nan)
+        if not self.count or not grid.size:
+            return out
+        rows, cols = np.nonzero(self.domain_mask(grid))
+        vals = self.eval_pairs(rows, grid[cols])
+        with np.errstate(invalid='ignore'):
+            ok = np.isfinite(vals) & (vals > 0)
+        out[rows[ok], cols[ok]] = vals[ok]
+        return out
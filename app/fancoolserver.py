@@ -5,8 +5,11 @@ import threading
 import math
 import signal
 import json
+import gzip
 import hashlib
+import heapq
 import hmac
+import base64
 import urllib.parse
 import tempfile
 import requests  # Added for HTTP client
@@ -18,12 +21,12 @@ from sqlalchemy import create_engine, text
 from sqlalchemy import exc as sa_exc
 from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.security import check_password_hash
+from jinja2.utils import htmlsafe_json_dumps
 
 from app.curves import pchip_cache
 from app.curves.pchip_cache import eval_pchip
-from app.curves import perf_model_service
 from app.curves.lock_utils import startup_lock
-from app import condition_meta_cache, model_meta_cache
+from app import condition_meta_cache, model_meta_cache, perf_columns_cache, search_result_cache
 from app import cache_event_bus, cache_event_handlers
 from app.audio_services import spectrum_cache
 from app.audio_services import spectrum_reader
@@ -207,7 +210,11 @@ def _env_int(name: str, default: int, minimum: int = 1) -> int:
 FAN_LADDER_MAX_ITEMS = min(_env_int('FAN_LADDER_MAX_ITEMS', 90), 90)
 _ladder_cache_lock = threading.Lock()
 _ladder_cache_build_lock = threading.Lock()
-_ladder_cache_payload: dict | None = None
+# (artefact file key, checked_at, body, etag) for the pre-encoded /api/ladder body.
+_ladder_prebuilt: tuple | None = None  # (artefact key, checked_at, body, etag, versions)
+_ladder_rejected_key: tuple | None = None  # last shared artefact that did not match this worker
+_LADDER_ARTEFACT_RECHECK_SEC = 5
+_LADDER_ARTEFACT_FORMAT = 2
 _ladder_hook_lock = threading.Lock()
 _ladder_warmup_hook_registered = False
 query_count_cache = 0
@@ -263,6 +270,68 @@ def resp_err(error_code: str, error_message: str,
     return make_error_response(error_code, error_message, http_status, meta)
 
 
+# Pre-encoded bodies end with an empty meta object, so resp_prebuilt can splice
+# the announcement meta in without re-encoding the payload.
+_PREBUILT_META_TAIL = b',"meta":{}}'
+# combined ETag -> gzip body with the announcement meta spliced in
+_prebuilt_gzip_with_meta: Dict[str, bytes] = {}
+_PREBUILT_GZIP_WITH_META_MAX = 32
+
+
+def encode_prebuilt_ok(data: Any) -> Tuple[bytes, str]:
+    """Serialize a resp_ok-shaped body once; returns (bytes, etag) for resp_prebuilt."""
+    head = app.json.dumps({'success': True, 'data': data, 'message': None}).encode('utf-8')
+    body = head[:-1] + _PREBUILT_META_TAIL
+    return body, hashlib.sha1(body).hexdigest()[:24]
+
+
+def _with_announcement_meta(body: bytes, etag: str) -> Tuple[bytes, str]:
+    """Splice the current announcement meta into a pre-encoded body; the ETag
+    gains a suffix derived from that meta so announcement changes revalidate."""
+    if not body.endswith(_PREBUILT_META_TAIL):
+        return body, etag
+    meta = app.json.dumps({'announcement_meta': get_announcement_meta()}).encode('utf-8')
+    tag = hashlib.sha1(meta).hexdigest()[:8]
+    return body[:-len(_PREBUILT_META_TAIL)] + b',"meta":' + meta + b'}', f'{etag}-{tag}'
+
+
+def resp_prebuilt(body: bytes, etag: str, *, max_age: int = 0, compress: bool = False):
+    """Serve a pre-encoded JSON success body with ETag / If-None-Match (304) support.
+
+    The announcement meta is spliced into the pre-encoded bytes here, so the
+    after_request hook skips these responses instead of re-encoding them.
+    With ``compress`` clients accepting gzip get the spliced body gzipped once
+    per ETag (payload and announcement state) under a "-gz" ETag; either ETag
+    revalidates.
+    """
+    g._prebuilt_json = True
+    body, etag = _with_announcement_meta(body, etag)
+    cache_control = f'public, max-age={int(max_age)}' if max_age > 0 else 'no-cache'
+    use_gzip = compress and request.accept_encodings['gzip'] > 0
+    gz_etag = f'{etag}-gz'
+    if request.if_none_match and (
+        request.if_none_match.contains(etag) or request.if_none_match.contains(gz_etag)
+    ):
+        resp = Response(status=304)
+    else:
+        if use_gzip:
+            gz = _prebuilt_gzip_with_meta.get(etag)
+            if gz is None:
+                gz = gzip.compress(body, compresslevel=6, mtime=0)
+                if len(_prebuilt_gzip_with_meta) >= _PREBUILT_GZIP_WITH_META_MAX:
+                    _prebuilt_gzip_with_meta.clear()
+                _prebuilt_gzip_with_meta[etag] = gz
+            resp = Response(gz, status=200, mimetype='application/json')
+            resp.headers['Content-Encoding'] = 'gzip'
+        else:
+            resp = Response(body, status=200, mimetype='application/json')
+    resp.set_etag(gz_etag if use_gzip else etag)
+    resp.headers['Cache-Control'] = cache_control
+    if compress:
+        resp.vary.add('Accept-Encoding')
+    return resp
+
+
 def _require_internal_warmup_token():
     expected_token = (os.getenv('INTERNAL_WARMUP_TOKEN') or '').strip()
     if not expected_token:
@@ -302,6 +371,9 @@ def _inject_announcement_meta(resp):
     This lets the frontend detect announcement state changes via normal business requests.
     """
     try:
+         # Pre-encoded bodies already carry it (see resp_prebuilt).
+         if getattr(g, '_prebuilt_json', False):
+            return resp
          if (
             resp.status_code == 200
             and resp.content_type
@@ -544,8 +616,25 @@ def _serialize_model_meta_payload(meta: dict, *, include_extended: bool = False)
 # fetch_all / exec_write to be defined before they can operate.  Blueprint
 # registration must happen before the first request is served.
 # =========================================
-model_meta_cache.setup(fetch_all, logger=app.logger)
-condition_meta_cache.setup(fetch_all, logger=app.logger)
+# Meta caches refresh stale-while-revalidate and are also reloaded on
+# cache_event_bus 'refresh_meta' events (POST /api/internal/refresh_meta).
+# Admin edits that do not call that endpoint still rely on the TTL.
+META_CACHE_TTL_SEC = _env_int('META_CACHE_TTL_SEC', 300)
+model_meta_cache.setup(fetch_all, logger=app.logger, ttl_sec=META_CACHE_TTL_SEC)
+condition_meta_cache.setup(fetch_all, logger=app.logger, ttl_sec=META_CACHE_TTL_SEC)
+# Search columns are rebuilt on 'warm_scores' events; the TTL catches perf
+# models rebuilt by perf_model_service's own revalidation.
+perf_columns_cache.setup(
+    fetch_all,
+    logger=app.logger,
+    ttl_sec=_env_int('PERF_COLUMNS_TTL_SEC', 600),
+    cold_wait_sec=_env_int('PERF_COLUMNS_COLD_WAIT_SEC', 5),
+)
+search_result_cache.setup(
+    app.logger,
+    max_entries=_env_int('SEARCH_RESULT_CACHE_SIZE', 512),
+    ttl_sec=_env_int('SEARCH_RESULT_CACHE_TTL_SEC', 120),
+)
 scoring_system.setup(fetch_all, exec_write, app.logger, app.debug)
 cache_event_handlers.setup(app.logger)
 cache_event_bus.setup(engine, app.logger)
@@ -559,6 +648,8 @@ issue_feedback.setup(fetch_all, exec_write, app.logger)
 app.register_blueprint(issue_feedback_bp)
 scoring_system.start_background_threads()
 cache_event_bus.start_background_consumer(cache_event_handlers.handle_event)
+# Search columns of the scored conditions are built off the request path.
+perf_columns_cache.warm_async(_RADAR_CIDS)
 
 
 @app.before_request
@@ -764,109 +855,6 @@ def call_admin_autofix_api(audio_batch_id: str,
 
 
 
-def _effective_value_for_series(series_rows: list, model_id: int, condition_id: int,
-                                axis: str, limit_value: float | None):
-    """
-    输入：某个 (model_id, condition_id) 的所有行记录（含 rpm, noise_db, airflow）
-    输出：effective_x, effective_airflow, source ('raw'|'fit'), axis ('rpm'|'noise_db'),
-          effective_rpm, effective_noise_db（同时返回转速和分贝，用于搜索结果联合展示）
-    新版：拟合一律使用四合一模型（噪音轴用 noise_to_airflow；转速轴用 rpm_to_airflow）
-    """
-    ax = 'noise_db' if axis == 'noise' else axis
-    rpm, noise, airflow = [], [], []
-    for r in series_rows:
-        rpm.append(r.get('rpm'))
-        noise.append(r.get('noise_db'))
-        airflow.append(r.get('airflow'))
-    # 统一模型（含缓存/TTL/失效/重建）——原始点校验职责由服务层统一管理
-    unified = perf_model_service.get_perf_model(model_id, condition_id) or {}
-    p = (unified.get('pchip') or {})
-    mdl_fit = p.get('noise_to_airflow') if ax == 'noise_db' else p.get('rpm_to_airflow')
-    # 伴随轴模型：rpm轴→rpm_to_noise_db；noise轴→noise_to_rpm
-    mdl_companion = p.get('rpm_to_noise_db') if ax == 'rpm' else p.get('noise_to_rpm')
-
-    def _companion_from_fit(x_val):
-        """用 PCHIP 模型计算伴随轴值（rpm↔noise_db），失败返回 None。"""
-        if mdl_companion and isinstance(mdl_companion, dict):
-            try:
-                v = eval_pchip(mdl_companion, x_val)
-                return float(v) if v is not None and math.isfinite(float(v)) else None
-            except Exception:
-                pass
-        return None
-
-    def _make_result(eff_x, eff_y, source, raw_companion=None):
-        """构建返回 dict，同时填充 effective_rpm / effective_noise_db。"""
-        comp = raw_companion
-        if comp is None and source == 'fit':
-            comp = _companion_from_fit(eff_x)
-        if ax == 'rpm':
-            eff_rpm = eff_x
-            eff_noise_db = comp
-        else:
-            eff_rpm = comp
-            eff_noise_db = eff_x
-        return {
-            'effective_x': eff_x, 'effective_airflow': eff_y,
-            'effective_source': source, 'effective_axis': ax,
-            'effective_rpm_at_point': None,
-            'effective_rpm': eff_rpm,
-            'effective_noise_db': eff_noise_db,
-        }
-
-    # 抽取有效原始点（用于"原始优先"和边界/落在原始点判断）
-    # 同时保留伴随轴数据（noise when ax=rpm, rpm when ax=noise_db）
-    xs, ys, comps = [], [], []
-    src_x_arr = noise if ax == 'noise_db' else rpm
-    comp_arr = rpm if ax == 'noise_db' else noise
-    for x, y, c in zip(src_x_arr or [], airflow or [], comp_arr or []):
-        try:
-            xf = float(x) if x is not None else None
-            yf = float(y) if y is not None else None
-        except Exception:
-            continue
-        if xf is None or yf is None: continue
-        if not (math.isfinite(xf) and math.isfinite(yf)): continue
-        try:
-            cf = float(c) if c is not None else None
-            if cf is not None and not math.isfinite(cf):
-                cf = None
-        except Exception:
-            cf = None
-        xs.append(xf); ys.append(yf); comps.append(cf)
-    if not xs:
-        return None
-    x_min, x_max = min(xs), max(xs)
-
-    # 未限制：取原始最大风量的点
-    if limit_value is None:
-        idx = max(range(len(ys)), key=lambda i: ys[i])
-        return _make_result(xs[idx], ys[idx], 'raw', comps[idx])
-
-    lv = float(limit_value)
-    if lv < x_min - 1e-9:
-        return None
-    if lv >= x_max - 1e-9:
-        idxs = [i for i, x in enumerate(xs) if abs(x - x_max) < 1e-9]
-        best = max(idxs, key=lambda i: ys[i])
-        return _make_result(xs[best], ys[best], 'raw', comps[best])
-
-    # 若存在原始点恰好等于 limit（噪音允许 0.05 容差）
-    tol = 0.05 if ax == 'noise_db' else 0.0
-    for i, x in enumerate(xs):
-        if (tol == 0.0 and x == lv) or (tol > 0.0 and abs(x - lv) <= tol):
-            return _make_result(x, ys[i], 'raw', comps[i])
-
-    # 位于域内且无原始点 → 使用四合一 PCHIP 拟合
-    if not (mdl_fit and isinstance(mdl_fit, dict)):
-        # 回退：取最接近 limit 的原始点
-        j = min(range(len(xs)), key=lambda i: abs(xs[i] - lv))
-        return _make_result(xs[j], ys[j], 'raw', comps[j])
-    lx = max(float(mdl_fit.get('x0') or lv), min(lv, float(mdl_fit.get('x1') or lv)))
-    eff_y = eval_pchip(mdl_fit, lx)
-    return _make_result(lx, float(eff_y), 'fit')
-
-
 def _filter_model_ids_from_meta(
     *,
     size_values=None,
@@ -881,92 +869,43 @@ def _filter_model_ids_from_meta(
     other_features=None,
     color_mask=None,
 ) -> set:
-    """Filter candidate model_ids using ModelMetaCache only — no SQL query."""
-    all_meta = model_meta_cache.get_all_model_meta()
-    _rgb_mask = 0
+    """Filter candidate model_ids using ModelMetaCache only — no SQL query.
+
+    Each active filter is answered from the cache's inverted indexes
+    (posting lists / sorted numeric arrays) and the results are intersected,
+    smallest first.
+    """
+    return model_meta_cache.get_filter_index().select(
+        size_values=size_values,
+        thickness_min=thickness_min,
+        thickness_max=thickness_max,
+        price_min=price_min,
+        price_max=price_max,
+        max_speed_min=max_speed_min,
+        max_speed_max=max_speed_max,
+        rgb_mask=rgb_mask,
+        rgb_include_none=rgb_include_none,
+        other_features=other_features,
+        color_mask=color_mask,
+        chain_type_id=CHAIN_TYPE_DAISY_CHAIN,
+        reverse_opt_value=REVERSE_OPT_AVAILABLE,
+    )
+
+
+def _model_score_value(model_id: int, condition_id: int | None = None) -> int | None:
+    """composite_score (or the condition's score_total) from the model-score cache, as int."""
+    entry = _get_canonical_model_score(model_id)
+    if not entry:
+        return None
+    if condition_id is None:
+        raw = entry.get('composite_score')
+    else:
+        cd = (entry.get('conditions') or {}).get(condition_id)
+        raw = cd.get('score_total') if cd else None
     try:
-        _rgb_mask = int(rgb_mask or 0)
+        return int(raw) if raw is not None else None
     except (TypeError, ValueError):
-        _rgb_mask = 0
-    _rgb_include_none = bool(rgb_include_none)
-    _has_rgb_filter = _rgb_include_none or _rgb_mask > 0
-    _other_set = {str(x).strip() for x in (other_features or []) if str(x).strip()}
-    _sz_set = {str(v) for v in (size_values or [])}
-    result = set()
-    for model_id, meta in all_meta.items():
-        if _sz_set:
-            try:
-                if str(meta.get('size') or '') not in _sz_set:
-                    continue
-            except (TypeError, ValueError):
-                continue
-        if thickness_min is not None and thickness_max is not None:
-            try:
-                t = int(meta.get('thickness') or 0)
-                if not (thickness_min <= t <= thickness_max):
-                    continue
-            except (TypeError, ValueError):
-                continue
-        if price_min is not None and price_max is not None:
-            try:
-                p = float(meta.get('reference_price') or 0)
-                if not (price_min <= p <= price_max):
-                    continue
-            except (TypeError, ValueError):
-                continue
-        if max_speed_min is not None and max_speed_max is not None:
-            try:
-                ms = int(meta.get('max_speed') or 0)
-                if not (max_speed_min <= ms <= max_speed_max):
-                    continue
-            except (TypeError, ValueError):
-                continue
-        if _has_rgb_filter:
-            try:
-                flags = int(meta.get('rgb_flags') or 0)
-            except (TypeError, ValueError):
-                flags = 0
-            rgb_matched = False
-            if _rgb_include_none and flags == 0:
-                rgb_matched = True
-            if _rgb_mask > 0 and (flags & _rgb_mask) != 0:
-                rgb_matched = True
-            if not rgb_matched:
-                continue
-        if 'speed_switch' in _other_set:
-            try:
-                ss_id = int(meta.get('speed_switch_type_id') or 0)
-                if ss_id <= 0:
-                    continue
-            except (TypeError, ValueError):
-                continue
-        if 'chain' in _other_set:
-            try:
-                if int(meta.get('chain_type_id') or 0) != CHAIN_TYPE_DAISY_CHAIN:
-                    continue
-            except (TypeError, ValueError):
-                continue
-        if 'DBB' in _other_set or 'no-DBB' in _other_set:
-            bearing = str(meta.get('bearing') or '').strip().upper()
-            if 'DBB' in _other_set and bearing != 'DBB':
-                continue
-            if 'no-DBB' in _other_set and bearing == 'DBB':
-                continue
-        if color_mask:
-            try:
-                cf = int(meta.get('color_flags') or 0)
-                if (cf & color_mask) == 0:
-                    continue
-            except (TypeError, ValueError):
-                continue
-        if 'reverse_opt' in _other_set:
-            try:
-                if int(meta.get('reverse_opt') or 0) != REVERSE_OPT_AVAILABLE:
-                    continue
-            except (TypeError, ValueError):
-                continue
-        result.add(model_id)
-    return result
+        return None
 
 
 def search_fans_by_condition_with_fit(condition_id=None, sort_by='none', sort_value=None,
@@ -977,10 +916,14 @@ def search_fans_by_condition_with_fit(condition_id=None, sort_by='none', sort_va
                          other_features=None,
                          color_mask=None,
                          max_speed_min=None, max_speed_max=None,
-                         limit=200) -> list[dict]:
+                         limit=200, offset=0, candidate_model_ids=None) -> list[dict]:
     """
     Search fans by condition using ModelMetaCache for attribute filtering
-    and fan_performance_data narrow fact table for curve data.
+    and the per-condition perf column store (perf_columns_cache) for the
+    effective values.  Returns rows ``offset .. offset+limit`` of the ranking
+    (effective airflow, or condition score for 'condition_score'), selected
+    with a top-k instead of a full sort.  ``candidate_model_ids`` skips the
+    meta filtering when the caller already has the candidate set.
     No dependency on general_view.
     """
     if condition_id is None:
@@ -991,66 +934,56 @@ def search_fans_by_condition_with_fit(condition_id=None, sort_by='none', sort_va
         return []
 
     # Step 1: Filter candidate model IDs from ModelMetaCache
-    candidate_model_ids = _filter_model_ids_from_meta(
-        size_values=size_values,
-        thickness_min=thickness_min,
-        thickness_max=thickness_max,
-        price_min=price_min,
-        price_max=price_max,
-        max_speed_min=max_speed_min,
-        max_speed_max=max_speed_max,
-        rgb_mask=rgb_mask,
-        rgb_include_none=rgb_include_none,
-        other_features=other_features,
-        color_mask=color_mask,
-    )
+    if candidate_model_ids is None:
+        candidate_model_ids = _filter_model_ids_from_meta(
+            size_values=size_values,
+            thickness_min=thickness_min,
+            thickness_max=thickness_max,
+            price_min=price_min,
+            price_max=price_max,
+            max_speed_min=max_speed_min,
+            max_speed_max=max_speed_max,
+            rgb_mask=rgb_mask,
+            rgb_include_none=rgb_include_none,
+            other_features=other_features,
+            color_mask=color_mask,
+        )
     if not candidate_model_ids:
         return []
 
-    # Step 2: Query narrow fact table filtered by condition_id and candidate model IDs
-    placeholders, params = _build_in_params(list(candidate_model_ids), 'mid')
-    params['cid'] = condition_id
-    sql = f"""
-      SELECT model_id, condition_id, rpm, airflow_cfm AS airflow, noise_db
-      FROM fan_performance_data
-      WHERE is_valid = 1 AND condition_id = :cid AND model_id IN ({placeholders})
-      ORDER BY model_id, rpm
-    """
-    rows = fetch_all(sql, params)
-
-    # Step 3: Group rows by (model_id, condition_id)
-    groups: Dict[Tuple[int, int], dict] = {}
-    for r in rows:
-        mid = int(r['model_id'])
-        cid = int(r['condition_id'])
-        key = (mid, cid)
-        g = groups.setdefault(key, {'rows': [], 'max_noise_db': None, '_max_test_rpm': None})
-        g['rows'].append({'rpm': r['rpm'], 'noise_db': r['noise_db'], 'airflow': r['airflow']})
-        try:
-            if r['rpm'] is not None:
-                rpm_int = int(r['rpm'])
-                if g['_max_test_rpm'] is None or g['_max_test_rpm'] < rpm_int:
-                    g['_max_test_rpm'] = rpm_int
-                    g['max_noise_db'] = r.get('noise_db')
-        except Exception:
-            pass
-
-    # Step 4: Enrich from caches
-    all_model_ids = list({mid for mid, _ in groups})
-    model_meta_map = model_meta_cache.get_many_model_meta(all_model_ids)
-    condition_meta = condition_meta or {}
-
+    # Step 2: Effective values from the condition's column store (no SQL / perf-file I/O)
+    columns = perf_columns_cache.get_condition_columns(condition_id)
     axis = 'rpm' if sort_by in ('rpm', 'none', 'condition_score') else 'noise_db'
     lv = None if sort_by in ('none', 'condition_score') else float(sort_value)
+    res = columns.effective(axis, lv)
+    mask = columns.mask_for(candidate_model_ids)
+    k = offset + limit
+    if sort_by == 'condition_score':
+        # Rank the whole candidate set by score before cutting to the page.
+        scored_rows = columns.rows_in(res, mask)
+        score_meta = model_meta_cache.get_many_model_meta([int(columns.model_ids[i]) for i in scored_rows])
+
+        def _score_key(i):
+            mid_i = int(columns.model_ids[i])
+            return scoring_system.score_price_model_sort_key(
+                _model_score_value(mid_i, condition_id),
+                (score_meta.get(mid_i) or {}).get('reference_price'), mid_i)
+        rows = heapq.nsmallest(k, scored_rows, key=_score_key)
+    else:
+        rows = columns.top_k(res, mask, k)
+    rows = rows[offset:]
+
+    # Step 3: Enrich from caches
+    mids = [int(columns.model_ids[i]) for i in rows]
+    model_meta_map = model_meta_cache.get_many_model_meta(mids)
+    condition_meta = condition_meta or {}
 
     items = []
-    for (mid, cid), g in groups.items():
-        eff = _effective_value_for_series(g['rows'], mid, cid, axis, lv)
-        if not eff:
-            continue
+    for i, mid in zip(rows, mids):
+        eff = columns.effective_fields(res, i)
         meta = model_meta_map.get(mid) or {}
         items.append({
-            'model_id': mid, 'condition_id': cid,
+            'model_id': mid, 'condition_id': condition_id,
             'brand_name_zh': meta.get('brand_name_zh') or '',
             'model_name': meta.get('model_name') or '',
             'condition_name_zh': condition_meta.get('condition_name_zh') or '',
@@ -1061,11 +994,11 @@ def search_fans_by_condition_with_fit(condition_id=None, sort_by='none', sort_va
             'effective_x': eff['effective_x'],
             'effective_axis': eff['effective_axis'],
             'effective_source': eff['effective_source'],
-            'effective_rpm': eff.get('effective_rpm'),
-            'effective_noise_db': eff.get('effective_noise_db'),
+            'effective_rpm': eff['effective_rpm'],
+            'effective_noise_db': eff['effective_noise_db'],
             'max_airflow': eff['effective_airflow'],
             'max_speed': meta.get('max_speed'),
-            'max_noise_db': g.get('max_noise_db'),
+            'max_noise_db': eff['max_noise_db'],
             'reference_price': meta.get('reference_price'),
             'rgb_flags': meta.get('rgb_flags'),
             'rgb_names_zh': meta.get('rgb_names_zh') or '',
@@ -1082,9 +1015,7 @@ def search_fans_by_condition_with_fit(condition_id=None, sort_by='none', sort_va
             'reverse_opt': meta.get('reverse_opt'),
             'caution': int(meta.get('caution') or 0),
         })
-
-    items.sort(key=lambda r: (r['effective_airflow'] if r['effective_airflow'] is not None else -1e9, r['model_id']), reverse=True)
-    return items[:limit]
+    return items
 
 
 def search_fans_composite(size_values=None, thickness_min=None, thickness_max=None,
@@ -1094,32 +1025,42 @@ def search_fans_composite(size_values=None, thickness_min=None, thickness_max=No
                            other_features=None,
                            color_mask=None,
                            max_speed_min=None, max_speed_max=None,
-                           limit=200) -> list[dict]:
+                           limit=200, offset=0, candidate_model_ids=None) -> list[dict]:
     """
     Search fans in 综合评分 (composite score) mode.
     No condition filter — returns one row per distinct model using ModelMetaCache only.
+    Rows ``offset .. offset+limit`` of the composite-score ranking are selected
+    with a top-k, so the cut no longer happens before ranking.
     No dependency on available_models_info_view.
     """
-    candidate_model_ids = _filter_model_ids_from_meta(
-        size_values=size_values,
-        thickness_min=thickness_min,
-        thickness_max=thickness_max,
-        price_min=price_min,
-        price_max=price_max,
-        max_speed_min=max_speed_min,
-        max_speed_max=max_speed_max,
-        rgb_mask=rgb_mask,
-        rgb_include_none=rgb_include_none,
-        other_features=other_features,
-        color_mask=color_mask,
-    )
+    if candidate_model_ids is None:
+        candidate_model_ids = _filter_model_ids_from_meta(
+            size_values=size_values,
+            thickness_min=thickness_min,
+            thickness_max=thickness_max,
+            price_min=price_min,
+            price_max=price_max,
+            max_speed_min=max_speed_min,
+            max_speed_max=max_speed_max,
+            rgb_mask=rgb_mask,
+            rgb_include_none=rgb_include_none,
+            other_features=other_features,
+            color_mask=color_mask,
+        )
     if not candidate_model_ids:
         return []
 
     model_meta_map = model_meta_cache.get_many_model_meta(list(candidate_model_ids))
+    ranked = heapq.nsmallest(
+        offset + limit,
+        model_meta_map,
+        key=lambda mid: scoring_system.composite_score_sort_key(
+            _model_score_value(mid), mid, model_meta_map[mid].get('reference_price')),
+    )
 
     items = []
-    for mid, meta in model_meta_map.items():
+    for mid in ranked[offset:]:
+        meta = model_meta_map[mid]
         items.append({
             'model_id': mid,
             'brand_name_zh': meta.get('brand_name_zh') or '',
@@ -1151,7 +1092,7 @@ def search_fans_composite(size_values=None, thickness_min=None, thickness_max=No
             'max_airflow': None,
             'max_noise_db': None,
         })
-    return items[:limit]
+    return items
 
 
 
@@ -1389,10 +1330,59 @@ def api_meta_by_ids():
 # =========================================
 # Search
 # =========================================
+# Results are served in pages; 'next_cursor' lets the client fetch the next
+# page.  A cursor is self-contained and signed with the app secret: it carries
+# the query, the offset and the meta/perf versions the first page was ranked
+# against, so any worker can serve it.  Once either version has moved on (or
+# the TTL passed) the cursor is expired and the client searches again.
+SEARCH_PAGE_SIZE = 200
+# Grid of the limit values in the result-cache key: whole RPM, 0.1 dB.
+SEARCH_SORT_VALUE_DECIMALS = {'rpm': 0, 'noise': 1}
+SEARCH_CURSOR_TTL_SEC = _env_int('SEARCH_CURSOR_TTL_SEC', 120)
+
+
+def _search_cursor_sig(body: bytes) -> str:
+    key = str(app.secret_key).encode('utf-8')
+    return hmac.new(key, b'search_cursor:' + body, hashlib.sha256).hexdigest()[:32]
+
+
+def _make_search_cursor(query: dict, offset: int, versions: tuple) -> str:
+    payload = json.dumps(
+        {'q': query, 'o': offset, 'v': list(versions), 'exp': int(time.time()) + SEARCH_CURSOR_TTL_SEC},
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+    ).encode('utf-8')
+    body = base64.urlsafe_b64encode(payload).rstrip(b'=')
+    return f'{body.decode("ascii")}.{_search_cursor_sig(body)}'
+
+
+def _load_search_cursor(cursor: str) -> tuple | None:
+    """(query, offset, versions) of a validly signed, unexpired cursor, else None."""
+    body, _, sig = str(cursor).rpartition('.')
+    if not body or not hmac.compare_digest(sig, _search_cursor_sig(body.encode('ascii', 'replace'))):
+        return None
+    try:
+        state = json.loads(base64.urlsafe_b64decode(body + '=' * (-len(body) % 4)))
+        query, offset, versions = state['q'], int(state['o']), tuple(state['v'])
+        expires_at = float(state['exp'])
+    except (ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(query, dict) or offset <= 0 or expires_at <= time.time():
+        return None
+    return query, offset, versions
+
+
 @app.route('/api/search_fans', methods=['POST'])
 def api_search_fans():
     try:
         data = request.get_json(force=True, silent=True) or {}
+        cursor = str(data.get('cursor') or '').strip()
+        page_state = None
+        offset = 0
+        if cursor:
+            page_state = _load_search_cursor(cursor)
+            if page_state is None:
+                return resp_err('SEARCH_CURSOR_EXPIRED', '搜索结果已过期，请重新搜索', 410)
+            data, offset = page_state[0], page_state[1]
         # Filter mode
         composite_mode = bool(data.get('composite_mode'))
         raw_condition_id = data.get('condition_id')
@@ -1511,41 +1501,66 @@ def api_search_fans():
         if msmin < 1 or msmax < 1 or msmin > 9999 or msmax > 9999 or msmin > msmax:
             return resp_err('SEARCH_INVALID_MAXSPEED_RANGE', '最大转速区间不合法 (1~9999 且最小不大于最大)')
 
+        sort_value = None
+        if not composite_mode and sort_by not in ('none', 'condition_score'):
+            if not sort_value_raw: return resp_err('SEARCH_MISSING_SORT_VALUE', '请输入限制值')
+            try: sort_value = float(sort_value_raw)
+            except ValueError: return resp_err('SEARCH_INVALID_SORT_VALUE', '限制值必须是数字')
+            if not math.isfinite(sort_value): return resp_err('SEARCH_INVALID_SORT_VALUE', '限制值必须是数字')
+
+        # The search always filters on the exact limit.  Only the cache key is
+        # snapped to the grid, and only to fold float noise ("1400" and
+        # "1400.0000001"); an off-grid limit such as 1400.4 keeps its exact key,
+        # so a cached page is never served for a materially different limit.
+        sort_key_value = sort_value
+        if sort_value is not None:
+            on_grid = round(sort_value, SEARCH_SORT_VALUE_DECIMALS.get(sort_by, 1)) + 0.0
+            if abs(on_grid - sort_value) < 1e-6:
+                sort_key_value = on_grid
+
+        filters = dict(
+            size_values=size_values or None,
+            thickness_min=tmin, thickness_max=tmax,
+            price_min=pmin, price_max=pmax,
+            rgb_mask=rgb_mask or None,
+            rgb_include_none=rgb_include_none,
+            other_features=sorted(other_features_set) or None,
+            color_mask=color_mask,
+            max_speed_min=msmin, max_speed_max=msmax,
+        )
+        perf_version = 0 if composite_mode else perf_columns_cache.get_condition_columns(condition_id).version
+        versions = (model_meta_cache.get_snapshot_version(), perf_version)
+        if page_state is not None and page_state[2] != versions:
+            # The data changed since the first page; later pages would not line up.
+            return resp_err('SEARCH_CURSOR_EXPIRED', '搜索结果已过期，请重新搜索', 410)
+        cache_key = (
+            'composite' if composite_mode else condition_id,
+            None if composite_mode else sort_by, sort_key_value,
+            tuple(sorted(set(size_values))), tmin, tmax, pmin, pmax,
+            rgb_mask, rgb_include_none, tuple(sorted(other_features_set)), color_mask,
+            msmin, msmax, offset,
+        ) + versions
+
+        def _run_search():
+            page = dict(filters, offset=offset, limit=SEARCH_PAGE_SIZE + 1)
+            if composite_mode:
+                rows = search_fans_composite(**page)
+            else:
+                rows = search_fans_by_condition_with_fit(
+                    condition_id=condition_id,
+                    sort_by=sort_by, sort_value=sort_value,
+                    **page,
+                )
+            return tuple(rows)
+
+        cached_rows = search_result_cache.get_or_compute(cache_key, _run_search)
+        # Cached rows are shared between requests; enrichment below writes into copies.
+        results = [dict(r) for r in cached_rows]
+
         if composite_mode:
-            results = search_fans_composite(
-                size_values=size_values or None,
-                thickness_min=tmin, thickness_max=tmax,
-                price_min=pmin, price_max=pmax,
-                rgb_mask=rgb_mask or None,
-                rgb_include_none=rgb_include_none,
-                other_features=list(other_features_set) or None,
-                color_mask=color_mask,
-                max_speed_min=msmin, max_speed_max=msmax,
-                limit=200
-            )
             label = '测试工况：综合评分，排序依据：综合评分'
             searched_cid = None
         else:
-            sort_value = None
-            if sort_by not in ('none', 'condition_score'):
-                if not sort_value_raw: return resp_err('SEARCH_MISSING_SORT_VALUE', '请输入限制值')
-                try: sort_value = float(sort_value_raw)
-                except ValueError: return resp_err('SEARCH_INVALID_SORT_VALUE', '限制值必须是数字')
-
-            results = search_fans_by_condition_with_fit(
-                condition_id=condition_id,
-                sort_by=sort_by, sort_value=sort_value,
-                size_values=size_values or None,
-                thickness_min=tmin, thickness_max=tmax,
-                price_min=pmin, price_max=pmax,
-                rgb_mask=rgb_mask or None,
-                rgb_include_none=rgb_include_none,
-                other_features=list(other_features_set) or None,
-                color_mask=color_mask,
-                max_speed_min=msmin, max_speed_max=msmax,
-                limit=200
-            )
-
             # Resolve condition name from ConditionMetaCache
             cond_name = None
             if condition_id:
@@ -1566,6 +1581,15 @@ def api_search_fans():
 
             searched_cid = int(condition_id) if condition_id else None
 
+        next_cursor = None
+        if len(results) > SEARCH_PAGE_SIZE:
+            results = results[:SEARCH_PAGE_SIZE]
+            next_cursor = _make_search_cursor(
+                {k: v for k, v in data.items() if k != 'cursor'},
+                offset + SEARCH_PAGE_SIZE,
+                versions,
+            )
+
         # Enrich results with model-score cache data (composite_score, condition_scores, condition_score)
         # and condition heat / like / query counts from the canonical shared facts cache.
         RADAR_CIDS_LIST = _RADAR_CIDS  # shared constant; synced with right-panel-v2.js
@@ -1681,296 +1705,495 @@ def api_search_fans():
                 )
             )
 
-        return resp_ok({'search_results': results, 'condition_label': label})
+        return resp_ok({'search_results': results, 'condition_label': label, 'next_cursor': next_cursor})
+    except perf_columns_cache.ColumnsNotReady:
+        resp = resp_err('SEARCH_WARMING_UP', '搜索数据准备中，请稍后重试', 503)
+        resp.headers['Retry-After'] = '5'
+        return resp
     except Exception as e:
         app.logger.exception(e)
         return resp_err('INTERNAL_ERROR', f'搜索异常: {e}', 500)
 
+SEARCH_METADATA_MAX_AGE_SEC = _env_int('SEARCH_METADATA_MAX_AGE_SEC', 600)
+_search_metadata_lock = threading.Lock()
+_search_metadata_entry: tuple | None = None  # (key, built_at, body, etag), swapped by reference
+
+
+def _build_search_metadata_payload() -> dict:
+    """Build the /api/search_metadata data dict from the meta caches."""
+    all_meta = model_meta_cache.get_all_model_meta()
+
+    # Brands
+    brand_map: dict = {}
+    for meta in all_meta.values():
+        bid = meta.get('brand_id')
+        if bid is None:
+            continue
+        try:
+            bid = int(bid)
+        except (TypeError, ValueError):
+            continue
+        if bid not in brand_map:
+            brand_map[bid] = {
+                'brand_id': bid,
+                'brand_name_zh': meta.get('brand_name_zh') or '',
+                'brand_name_en': meta.get('brand_name_en') or '',
+                'model_count': 0,
+            }
+        brand_map[bid]['model_count'] += 1
+    brands = sorted(brand_map.values(), key=lambda x: (x.get('brand_name_zh') or '', x.get('brand_id') or 0))
+
+    # Sizes (distinct, sorted numerically)
+    size_set = set()
+    for meta in all_meta.values():
+        sz = meta.get('size')
+        if sz is not None:
+            try:
+                size_set.add(str(sz))
+            except Exception:
+                pass
+    def _sort_size_key(s):
+        try: return (0, int(s))
+        except (ValueError, TypeError): return (1, s)
+    sizes = [{'value': s, 'label': s} for s in sorted(size_set, key=_sort_size_key)]
+
+    # RGB mask options from fan_rgb_mask_type.
+    # NOTE: available_models_info_view.rgb_names_zh/en should be assembled from this table:
+    # rgb_flags=0 => "无/none"; rgb_flags>0 => GROUP_CONCAT matched rgb_mask>0 labels by bitwise AND.
+    rgb_flags = []
+    # Keep this fallback in sync with fan_rgb_mask_type canonical bit values.
+    default_rgb_flags = [
+        {'value': 0, 'label_zh': '无', 'label_en': 'none'},
+        {'value': 1, 'label_zh': '扇叶', 'label_en': 'Blades'},
+        {'value': 2, 'label_zh': '轴座', 'label_en': 'Hub'},
+        {'value': 4, 'label_zh': '边框', 'label_en': 'Frame'},
+    ]
+    try:
+        try:
+            rgb_rows = fetch_all("""
+                SELECT rgb_mask AS value, rgb_name_zh AS label_zh, rgb_name_en AS label_en
+                FROM fan_rgb_mask_type
+                WHERE (is_valid = 1 OR is_valid IS NULL)
+                ORDER BY sort_order, rgb_mask
+            """)
+        except Exception:
+            rgb_rows = fetch_all("""
+                SELECT rgb_mask AS value, rgb_name_zh AS label_zh, rgb_name_en AS label_en
+                FROM fan_rgb_mask_type
+                ORDER BY rgb_mask
+            """)
+        seen_mask = set()
+        for row in rgb_rows:
+            try:
+                mask = int(row.get('value'))
+            except (TypeError, ValueError, AttributeError):
+                continue
+            if mask < 0 or mask in seen_mask:
+                continue
+            seen_mask.add(mask)
+            rgb_flags.append({
+                'value': mask,
+                'label_zh': row.get('label_zh') or '',
+                'label_en': row.get('label_en') or '',
+            })
+    except Exception:
+        app.logger.warning('failed to load fan_rgb_mask_type, fallback to default rgb_flags options', exc_info=True)
+    if not rgb_flags:
+        rgb_flags = default_rgb_flags
+    rgb_flags.sort(key=lambda x: x.get('value') or 0)
+    # Temporary backward-compatible alias for old clients.
+    rgb_types = [{
+        'rgb_type_id': it['value'],
+        'rgb_type_name_zh': it['label_zh'],
+        'rgb_type_name_en': it['label_en'],
+        'model_count': 0,
+    } for it in rgb_flags]
+
+    # Speed switch types
+    ss_map: dict = {}
+    for meta in all_meta.values():
+        ss_id = meta.get('speed_switch_type_id')
+        if ss_id is None:
+            continue
+        try:
+            ss_id = int(ss_id)
+        except (TypeError, ValueError):
+            continue
+        if ss_id not in ss_map:
+            ss_map[ss_id] = {
+                'speed_switch_type_id': ss_id,
+                'speed_switch_type_name_zh': meta.get('speed_switch_type_name_zh') or '',
+                'speed_switch_type_name_en': meta.get('speed_switch_type_name_en') or '',
+                'model_count': 0,
+            }
+        ss_map[ss_id]['model_count'] += 1
+    speed_switch_types = sorted(ss_map.values(), key=lambda x: x.get('speed_switch_type_id') or 0)
+
+    # Chain types
+    ct_map: dict = {}
+    for meta in all_meta.values():
+        ct_id = meta.get('chain_type_id')
+        if ct_id is None:
+            continue
+        try:
+            ct_id = int(ct_id)
+        except (TypeError, ValueError):
+            continue
+        if ct_id not in ct_map:
+            ct_map[ct_id] = {
+                'chain_type_id': ct_id,
+                'chain_type_name_zh': meta.get('chain_type_name_zh') or '',
+                'chain_type_name_en': meta.get('chain_type_name_en') or '',
+                'model_count': 0,
+            }
+        ct_map[ct_id]['model_count'] += 1
+    chain_types = sorted(ct_map.values(), key=lambda x: x.get('chain_type_id') or 0)
+
+    # Conditions: only those with actual data in mids_cids_in_data_view
+    valid_cond_ids = _fetch_all_condition_ids_from_data()
+    cond_meta_map = condition_meta_cache.get_many_condition_meta(valid_cond_ids)
+    conditions = []
+    for _cid, cond in sorted(
+        cond_meta_map.items(),
+        key=lambda kv: ((kv[1].get('condition_name_zh') or ''), kv[0])
+    ):
+        if int(cond.get('is_valid') or 0) == 1:
+            conditions.append({
+                'condition_id': int(cond['condition_id']),
+                'condition_name_zh': cond.get('condition_name_zh') or '',
+                'condition_name_en': cond.get('condition_name_en') or '',
+                'resistance_type_zh': cond.get('resistance_type_zh') or '',
+                'resistance_type_en': cond.get('resistance_type_en') or '',
+                'resistance_location_zh': cond.get('resistance_location_zh') or '',
+                'resistance_location_en': cond.get('resistance_location_en') or '',
+            })
+
+    # Color flags: backend constants
+    color_flags = [
+        {'value': 1, 'label_zh': '黑', 'label_en': 'Black'},
+        {'value': 2, 'label_zh': '白', 'label_en': 'White'},
+        {'value': 4, 'label_zh': '猫头鹰', 'label_en': 'Noctua'},
+        #{'value': 8, 'label_zh': '银', 'label_en': 'Silver'},
+        {'value': 128, 'label_zh': '其它', 'label_en': 'Other'},
+    ]
+
+    other_features = [
+        {'key': 'reverse_opt', 'label_zh': '可选反叶', 'label_en': 'Reverse blade option'},
+        {'key': 'speed_switch', 'label_zh': '转速切换', 'label_en': 'Speed switch'},
+        {'key': 'chain', 'label_zh': '积木拼接', 'label_en': 'Daisy chain'},
+        {
+            'key': 'DBB',
+            'exclude_key': 'no-DBB',
+            'label_zh': '滚珠轴承',
+            'exclude_label_zh': '非滚珠轴承',
+            'label_en': 'Dual ball bearing',
+            'exclude_label_en': 'Not dual ball bearing',
+        },
+    ]
+
+    # Ranges from cache data
+    thickness_vals = [int(m.get('thickness') or 0) for m in all_meta.values() if m.get('thickness') is not None]
+    price_vals = [float(m.get('reference_price') or 0) for m in all_meta.values() if m.get('reference_price') is not None]
+    speed_vals = [int(m.get('max_speed') or 0) for m in all_meta.values() if m.get('max_speed') is not None]
+    ranges = {
+        'thickness': {
+            'min': min(thickness_vals, default=1),
+            'max': max(thickness_vals, default=99),
+            'default_min': 1,
+            'default_max': 50,
+        },
+        'price': {
+            'min': 0,
+            'max': 999,
+            'default_min': 0,
+            'default_max': 999,
+        },
+        'max_speed': {
+            'min': min(speed_vals, default=1),
+            'max': max(speed_vals, default=9999),
+            'default_min': 1,
+            'default_max': 9999,
+        },
+    }
+
+    return {
+        'brands': brands,
+        'conditions': conditions,
+        'sizes': sizes,
+        'rgb_flags': rgb_flags,
+        'rgb_types': rgb_types,
+        'speed_switch_types': speed_switch_types,
+        'chain_types': chain_types,
+        'color_flags': color_flags,
+        'other_features': other_features,
+        'ranges': ranges,
+    }
+
+
+def _get_search_metadata_prebuilt() -> Tuple[bytes, str]:
+    """Return (body, etag) for the current meta snapshot versions.
+
+    Rebuilt when either meta cache publishes new data, or after
+    SEARCH_METADATA_MAX_AGE_SEC to pick up rgb-mask / data-view changes that
+    are not part of the meta snapshots.
+    """
+    global _search_metadata_entry
+    key = (model_meta_cache.get_snapshot_version(), condition_meta_cache.get_cache_version())
+    entry = _search_metadata_entry
+    if entry and entry[0] == key and time.time() - entry[1] < SEARCH_METADATA_MAX_AGE_SEC:
+        return entry[2], entry[3]
+    with _search_metadata_lock:
+        entry = _search_metadata_entry
+        if entry and entry[0] == key and time.time() - entry[1] < SEARCH_METADATA_MAX_AGE_SEC:
+            return entry[2], entry[3]
+        body, etag = encode_prebuilt_ok(_build_search_metadata_payload())
+        _search_metadata_entry = (key, time.time(), body, etag)
+        return body, etag
+
+
 @app.get('/api/search_metadata')
 def api_search_metadata():
     """
     Unified metadata endpoint for initializing search panels.
     All candidate options come from ModelMetaCache / ConditionMetaCache.
+    The serialized payload is cached per meta snapshot version (ETag / 304).
     """
     try:
-        all_meta = model_meta_cache.get_all_model_meta()
+        body, etag = _get_search_metadata_prebuilt()
+        return resp_prebuilt(body, etag)
+    except Exception as e:
+        app.logger.exception(e); return resp_err('INTERNAL_ERROR', str(e), 500)
+
+# Every brand's payload is built in one pass whenever the meta snapshot or the
+# whole score table changes; a single model's score change only re-encodes its
+# brand (hooks below). Requests only look the payload up.
+_models_by_brand_lock = threading.Lock()
+_models_by_brand_rebuild_inflight = threading.Lock()
+_models_by_brand_table: tuple | None = None  # (key, {brand_id: (body, etag)}), swapped by reference
+_models_by_brand_dirty: set = set()  # brand ids waiting for a single-brand rebuild
+_models_by_brand_dirty_lock = threading.Lock()
+_models_by_brand_patch_running = False
 
-        # Brands
-        brand_map: dict = {}
+
+def _models_by_brand_key() -> tuple:
+    return (model_meta_cache.get_snapshot_version(), scoring_system.get_model_score_generation(table_only=True))
+
+
+def _build_models_by_brand_payload(brand_id: int, all_meta: dict) -> dict:
+    """Build the /api/models_by_brand data dict for one brand."""
+    items = []
+    # Ids come pre-ordered by (model_name, model_id) from the meta snapshot.
+    for mid in model_meta_cache.get_model_ids_for_brand(brand_id):
+        meta = all_meta.get(mid)
+        if meta is None:
+            continue
+        item = {
+            'model_id': mid,
+            'model_name': meta.get('model_name') or '',
+            'brand_id': meta.get('brand_id'),
+            'size': meta.get('size'),
+            'thickness': meta.get('thickness'),
+            'max_speed': meta.get('max_speed'),
+            'rgb_flags': meta.get('rgb_flags'),
+            'rgb_names_zh': meta.get('rgb_names_zh') or '',
+            'rgb_names_en': meta.get('rgb_names_en') or '',
+        }
+        cache_entry = _get_canonical_model_score(mid)
+        if cache_entry:
+            item['radar'] = {
+                'conditions': cache_entry['conditions'],
+                'composite_score': cache_entry.get('composite_score'),
+                'updated_at': cache_entry['updated_at'],
+            }
+        else:
+            item['radar'] = None
+        items.append(item)
+    return {'items': items}
+
+
+def rebuild_models_by_brand_payloads() -> None:
+    """Encode every brand's payload for the current meta snapshot and score generation."""
+    global _models_by_brand_table
+    with _models_by_brand_lock:
+        key = _models_by_brand_key()
+        table = _models_by_brand_table
+        if table is not None and table[0] == key:
+            return
+        all_meta = model_meta_cache.get_all_model_meta()
+        brand_ids = set()
         for meta in all_meta.values():
-            bid = meta.get('brand_id')
-            if bid is None:
-                continue
             try:
-                bid = int(bid)
+                brand_ids.add(int(meta.get('brand_id')))
             except (TypeError, ValueError):
                 continue
-            if bid not in brand_map:
-                brand_map[bid] = {
-                    'brand_id': bid,
-                    'brand_name_zh': meta.get('brand_name_zh') or '',
-                    'brand_name_en': meta.get('brand_name_en') or '',
-                    'model_count': 0,
-                }
-            brand_map[bid]['model_count'] += 1
-        brands = sorted(brand_map.values(), key=lambda x: (x.get('brand_name_zh') or '', x.get('brand_id') or 0))
+        entries = {bid: encode_prebuilt_ok(_build_models_by_brand_payload(bid, all_meta)) for bid in brand_ids}
+        # Scores first computed during the build report their models to the
+        # scores hook, which re-encodes just those brands afterwards.
+        _models_by_brand_table = (key, entries)
+
+
+def _rebuild_brand_payloads(brand_ids: set) -> None:
+    """Re-encode the given brands in the current table (other brands are kept)."""
+    global _models_by_brand_table
+    with _models_by_brand_lock:
+        table = _models_by_brand_table
+        if table is None:
+            return  # the first full build picks the change up
+        all_meta = model_meta_cache.get_all_model_meta()
+        entries = dict(table[1])
+        for bid in brand_ids:
+            entries[bid] = encode_prebuilt_ok(_build_models_by_brand_payload(bid, all_meta))
+        _models_by_brand_table = (table[0], entries)
 
-        # Sizes (distinct, sorted numerically)
-        size_set = set()
-        for meta in all_meta.values():
-            sz = meta.get('size')
-            if sz is not None:
-                try:
-                    size_set.add(str(sz))
-                except Exception:
-                    pass
-        def _sort_size_key(s):
-            try: return (0, int(s))
-            except (ValueError, TypeError): return (1, s)
-        sizes = [{'value': s, 'label': s} for s in sorted(size_set, key=_sort_size_key)]
-
-        # RGB mask options from fan_rgb_mask_type.
-        # NOTE: available_models_info_view.rgb_names_zh/en should be assembled from this table:
-        # rgb_flags=0 => "无/none"; rgb_flags>0 => GROUP_CONCAT matched rgb_mask>0 labels by bitwise AND.
-        rgb_flags = []
-        # Keep this fallback in sync with fan_rgb_mask_type canonical bit values.
-        default_rgb_flags = [
-            {'value': 0, 'label_zh': '无', 'label_en': 'none'},
-            {'value': 1, 'label_zh': '扇叶', 'label_en': 'Blades'},
-            {'value': 2, 'label_zh': '轴座', 'label_en': 'Hub'},
-            {'value': 4, 'label_zh': '边框', 'label_en': 'Frame'},
-        ]
+
+def _drain_dirty_brands() -> None:
+    global _models_by_brand_patch_running
+    while True:
+        with _models_by_brand_dirty_lock:
+            if not _models_by_brand_dirty:
+                _models_by_brand_patch_running = False
+                return
+            brand_ids = set(_models_by_brand_dirty)
+            _models_by_brand_dirty.clear()
         try:
-            try:
-                rgb_rows = fetch_all("""
-                    SELECT rgb_mask AS value, rgb_name_zh AS label_zh, rgb_name_en AS label_en
-                    FROM fan_rgb_mask_type
-                    WHERE (is_valid = 1 OR is_valid IS NULL)
-                    ORDER BY sort_order, rgb_mask
-                """)
-            except Exception:
-                rgb_rows = fetch_all("""
-                    SELECT rgb_mask AS value, rgb_name_zh AS label_zh, rgb_name_en AS label_en
-                    FROM fan_rgb_mask_type
-                    ORDER BY rgb_mask
-                """)
-            seen_mask = set()
-            for row in rgb_rows:
-                try:
-                    mask = int(row.get('value'))
-                except (TypeError, ValueError, AttributeError):
-                    continue
-                if mask < 0 or mask in seen_mask:
-                    continue
-                seen_mask.add(mask)
-                rgb_flags.append({
-                    'value': mask,
-                    'label_zh': row.get('label_zh') or '',
-                    'label_en': row.get('label_en') or '',
-                })
-        except Exception:
-            app.logger.warning('failed to load fan_rgb_mask_type, fallback to default rgb_flags options', exc_info=True)
-        if not rgb_flags:
-            rgb_flags = default_rgb_flags
-        rgb_flags.sort(key=lambda x: x.get('value') or 0)
-        # Temporary backward-compatible alias for old clients.
-        rgb_types = [{
-            'rgb_type_id': it['value'],
-            'rgb_type_name_zh': it['label_zh'],
-            'rgb_type_name_en': it['label_en'],
-            'model_count': 0,
-        } for it in rgb_flags]
-
-        # Speed switch types
-        ss_map: dict = {}
-        for meta in all_meta.values():
-            ss_id = meta.get('speed_switch_type_id')
-            if ss_id is None:
-                continue
-            try:
-                ss_id = int(ss_id)
-            except (TypeError, ValueError):
-                continue
-            if ss_id not in ss_map:
-                ss_map[ss_id] = {
-                    'speed_switch_type_id': ss_id,
-                    'speed_switch_type_name_zh': meta.get('speed_switch_type_name_zh') or '',
-                    'speed_switch_type_name_en': meta.get('speed_switch_type_name_en') or '',
-                    'model_count': 0,
-                }
-            ss_map[ss_id]['model_count'] += 1
-        speed_switch_types = sorted(ss_map.values(), key=lambda x: x.get('speed_switch_type_id') or 0)
+            _rebuild_brand_payloads(brand_ids)
+        except Exception as e:
+            app.logger.warning('[models_by_brand] brand rebuild failed: %s', e)
 
-        # Chain types
-        ct_map: dict = {}
-        for meta in all_meta.values():
-            ct_id = meta.get('chain_type_id')
-            if ct_id is None:
-                continue
-            try:
-                ct_id = int(ct_id)
-            except (TypeError, ValueError):
-                continue
-            if ct_id not in ct_map:
-                ct_map[ct_id] = {
-                    'chain_type_id': ct_id,
-                    'chain_type_name_zh': meta.get('chain_type_name_zh') or '',
-                    'chain_type_name_en': meta.get('chain_type_name_en') or '',
-                    'model_count': 0,
-                }
-            ct_map[ct_id]['model_count'] += 1
-        chain_types = sorted(ct_map.values(), key=lambda x: x.get('chain_type_id') or 0)
-
-        # Conditions: only those with actual data in mids_cids_in_data_view
-        valid_cond_ids = _fetch_all_condition_ids_from_data()
-        cond_meta_map = condition_meta_cache.get_many_condition_meta(valid_cond_ids)
-        conditions = []
-        for _cid, cond in sorted(
-            cond_meta_map.items(),
-            key=lambda kv: ((kv[1].get('condition_name_zh') or ''), kv[0])
-        ):
-            if int(cond.get('is_valid') or 0) == 1:
-                conditions.append({
-                    'condition_id': int(cond['condition_id']),
-                    'condition_name_zh': cond.get('condition_name_zh') or '',
-                    'condition_name_en': cond.get('condition_name_en') or '',
-                    'resistance_type_zh': cond.get('resistance_type_zh') or '',
-                    'resistance_type_en': cond.get('resistance_type_en') or '',
-                    'resistance_location_zh': cond.get('resistance_location_zh') or '',
-                    'resistance_location_en': cond.get('resistance_location_en') or '',
-                })
 
-        # Color flags: backend constants
-        color_flags = [
-            {'value': 1, 'label_zh': '黑', 'label_en': 'Black'},
-            {'value': 2, 'label_zh': '白', 'label_en': 'White'},
-            {'value': 4, 'label_zh': '猫头鹰', 'label_en': 'Noctua'},
-            #{'value': 8, 'label_zh': '银', 'label_en': 'Silver'},
-            {'value': 128, 'label_zh': '其它', 'label_en': 'Other'},
-        ]
-
-        other_features = [
-            {'key': 'reverse_opt', 'label_zh': '可选反叶', 'label_en': 'Reverse blade option'},
-            {'key': 'speed_switch', 'label_zh': '转速切换', 'label_en': 'Speed switch'},
-            {'key': 'chain', 'label_zh': '积木拼接', 'label_en': 'Daisy chain'},
-            {
-                'key': 'DBB',
-                'exclude_key': 'no-DBB',
-                'label_zh': '滚珠轴承',
-                'exclude_label_zh': '非滚珠轴承',
-                'label_en': 'Dual ball bearing',
-                'exclude_label_en': 'Not dual ball bearing',
-            },
-        ]
-
-        # Ranges from cache data
-        thickness_vals = [int(m.get('thickness') or 0) for m in all_meta.values() if m.get('thickness') is not None]
-        price_vals = [float(m.get('reference_price') or 0) for m in all_meta.values() if m.get('reference_price') is not None]
-        speed_vals = [int(m.get('max_speed') or 0) for m in all_meta.values() if m.get('max_speed') is not None]
-        ranges = {
-            'thickness': {
-                'min': min(thickness_vals, default=1),
-                'max': max(thickness_vals, default=99),
-                'default_min': 1,
-                'default_max': 50,
-            },
-            'price': {
-                'min': 0,
-                'max': 999,
-                'default_min': 0,
-                'default_max': 999,
-            },
-            'max_speed': {
-                'min': min(speed_vals, default=1),
-                'max': max(speed_vals, default=9999),
-                'default_min': 1,
-                'default_max': 9999,
-            },
-        }
+def _on_model_scores_changed(_trigger_source: str, model_ids: tuple | None) -> None:
+    """Whole-table changes rebuild every brand; single-model changes only their brands."""
+    global _models_by_brand_patch_running
+    if model_ids is None:
+        _refresh_models_by_brand_async()
+        return
+    brand_ids = set()
+    for meta in model_meta_cache.get_many_model_meta(model_ids).values():
+        try:
+            brand_ids.add(int(meta.get('brand_id')))
+        except (TypeError, ValueError):
+            continue
+    if not brand_ids:
+        return
+    with _models_by_brand_dirty_lock:
+        _models_by_brand_dirty.update(brand_ids)
+        if _models_by_brand_patch_running:
+            return
+        _models_by_brand_patch_running = True
+    try:
+        threading.Thread(target=_drain_dirty_brands, daemon=True, name='models-by-brand-patch').start()
+    except Exception:
+        with _models_by_brand_dirty_lock:
+            _models_by_brand_patch_running = False
+        raise
+
+
+def _refresh_models_by_brand_async(*_args) -> None:
+    """Rebuild all brand payloads in the background (one rebuild at a time)."""
+    if not _models_by_brand_rebuild_inflight.acquire(blocking=False):
+        return
+
+    def _run():
+        try:
+            rebuild_models_by_brand_payloads()
+        except Exception as e:
+            app.logger.warning('[models_by_brand] prebuild failed: %s', e)
+        finally:
+            _models_by_brand_rebuild_inflight.release()
+
+    try:
+        threading.Thread(target=_run, daemon=True, name='models-by-brand-prebuild').start()
+    except Exception:
+        _models_by_brand_rebuild_inflight.release()
+        raise
+
+
+model_meta_cache.register_refresh_hook(_refresh_models_by_brand_async)
+scoring_system.register_model_scores_hook(_on_model_scores_changed)
+
+
+def _get_models_by_brand_prebuilt(brand_id: int) -> Tuple[bytes, str]:
+    """Return (body, etag) for one brand from the prebuilt table.
+
+    Only the very first request builds synchronously; afterwards a request
+    that sees newer meta / scores than the table serves the current payload
+    and schedules the rebuild the hooks may not have triggered yet.
+    """
+    table = _models_by_brand_table
+    if table is None:
+        rebuild_models_by_brand_payloads()
+        table = _models_by_brand_table
+    elif table[0] != _models_by_brand_key():
+        _refresh_models_by_brand_async()
+    entry = table[1].get(brand_id)
+    if entry is None:
+        # Unknown brands are not cached, so arbitrary ids cannot grow the map.
+        return encode_prebuilt_ok({'items': []})
+    return entry
 
-        return resp_ok({
-            'brands': brands,
-            'conditions': conditions,
-            'sizes': sizes,
-            'rgb_flags': rgb_flags,
-            'rgb_types': rgb_types,
-            'speed_switch_types': speed_switch_types,
-            'chain_types': chain_types,
-            'color_flags': color_flags,
-            'other_features': other_features,
-            'ranges': ranges,
-        })
-    except Exception as e:
-        app.logger.exception(e); return resp_err('INTERNAL_ERROR', str(e), 500)
 
 @app.get('/api/models_by_brand')
 def api_models_by_brand():
+    """Models of one brand with radar scores, served from a per-brand prebuilt payload (ETag / 304)."""
     try:
         bid = int(request.args.get('brand_id') or '0')
         if not bid: return resp_err('BAD_REQUEST', 'brand_id 缺失或非法')
-        # Use ModelMetaCache instead of querying available_models_info_view
-        all_meta = model_meta_cache.get_all_model_meta()
-        items = []
-        for mid, meta in sorted(all_meta.items(), key=lambda kv: (kv[1].get('model_name') or '', kv[0])):
-            try:
-                if int(meta.get('brand_id') or 0) != bid:
-                    continue
-            except (TypeError, ValueError):
-                continue
-            item = {
-                'model_id': mid,
-                'model_name': meta.get('model_name') or '',
-                'brand_id': meta.get('brand_id'),
-                'size': meta.get('size'),
-                'thickness': meta.get('thickness'),
-                'max_speed': meta.get('max_speed'),
-                'rgb_flags': meta.get('rgb_flags'),
-                'rgb_names_zh': meta.get('rgb_names_zh') or '',
-                'rgb_names_en': meta.get('rgb_names_en') or '',
-            }
-            cache_entry = _get_canonical_model_score(mid)
-            if cache_entry:
-                item['radar'] = {
-                    'conditions': cache_entry['conditions'],
-                    'composite_score': cache_entry.get('composite_score'),
-                    'updated_at': cache_entry['updated_at'],
-                }
-            else:
-                item['radar'] = None
-            items.append(item)
-        return resp_ok({'items': items})
+        body, etag = _get_models_by_brand_prebuilt(bid)
+        return resp_prebuilt(body, etag)
     except Exception as e:
         app.logger.exception(e); return resp_err('INTERNAL_ERROR', str(e), 500)
 
+MODEL_SUGGEST_LIMIT = 20
+
+
 @app.get('/api/model_suggest')
 def api_model_suggest():
-    """Structured model keyword search backed by ModelMetaCache."""
+    """Structured model keyword search backed by ModelMetaCache.
+
+    Candidates come from the cache's n-gram index (same substring semantics
+    as a full scan) and are ranked by canonical heat, then brand/model name.
+    """
     try:
         q = (request.args.get('q') or '').strip()
         if len(q) < 2:
             return resp_ok({'items': []})
-        q_lower = q.lower()
+        model_ids = model_meta_cache.get_suggest_index().search(q)
+        if not model_ids:
+            return resp_ok({'items': []})
         all_meta = model_meta_cache.get_all_model_meta()
+        try:
+            facts_lookup = scoring_system.get_canonical_facts().get('model_lookup') or {}
+        except Exception as e:
+            app.logger.warning('[model_suggest] canonical facts unavailable: %s', e)
+            facts_lookup = {}
+
+        def _rank_key(mid):
+            meta = all_meta.get(mid) or {}
+            facts = facts_lookup.get(mid) or {}
+            try:
+                heat = float(facts.get('heat_score') or 0)
+            except (TypeError, ValueError):
+                heat = 0.0
+            return (-heat, meta.get('brand_name_zh') or '', meta.get('model_name') or '', mid)
+
         matched = []
-        for mid, meta in all_meta.items():
-            model_name = (meta.get('model_name') or '').lower()
-            brand_zh = (meta.get('brand_name_zh') or '').lower()
-            brand_en = (meta.get('brand_name_en') or '').lower()
-            if q_lower in model_name or q_lower in brand_zh or q_lower in brand_en:
-                matched.append({
-                    'model_id': mid,
-                    'brand_id': meta.get('brand_id'),
-                    'brand_name_zh': meta.get('brand_name_zh') or '',
-                    'brand_name_en': meta.get('brand_name_en') or '',
-                    'model_name': meta.get('model_name') or '',
-                    'size': meta.get('size'),
-                    'thickness': meta.get('thickness'),
-                    'rgb_flags': meta.get('rgb_flags'),
-                    'rgb_names_zh': meta.get('rgb_names_zh') or '',
-                    'rgb_names_en': meta.get('rgb_names_en') or '',
-                })
-        matched.sort(key=lambda x: (x.get('brand_name_zh') or '', x.get('model_name') or ''))
-        return resp_ok({'items': matched[:20]})
+        for mid in heapq.nsmallest(MODEL_SUGGEST_LIMIT, model_ids, key=_rank_key):
+            meta = all_meta.get(mid)
+            if not meta:
+                continue
+            matched.append({
+                'model_id': mid,
+                'brand_id': meta.get('brand_id'),
+                'brand_name_zh': meta.get('brand_name_zh') or '',
+                'brand_name_en': meta.get('brand_name_en') or '',
+                'model_name': meta.get('model_name') or '',
+                'size': meta.get('size'),
+                'thickness': meta.get('thickness'),
+                'rgb_flags': meta.get('rgb_flags'),
+                'rgb_names_zh': meta.get('rgb_names_zh') or '',
+                'rgb_names_en': meta.get('rgb_names_en') or '',
+            })
+        return resp_ok({'items': matched})
     except Exception as e:
         app.logger.exception(e); return resp_err('INTERNAL_ERROR', str(e), 500)
 
@@ -2112,8 +2335,8 @@ def api_radar_metrics():
     Batch endpoint: GET /api/radar_metrics?model_ids=1,2,3
 
     Returns model-score metrics for multiple model_ids in one call.
-    Uses the in-memory model-score cache
-    with soft/hard TTL logic.
+    Reads the materialized model-score table; entries past the soft (or hard)
+    TTL are returned stale and refreshed in the background.
 
     Response shape:
       {
@@ -2154,64 +2377,32 @@ def api_radar_metrics():
 
         now = time.time()
         for model_id in model_ids:
+            # Pure read from the materialized score table; stale entries are served
+            # and queued on the background score-refresh worker by the lookup itself.
             entry = _get_canonical_model_score(model_id)
 
             if entry is not None:
                 age = now - entry['cached_at']
-                if age < MODEL_SCORE_CACHE_SOFT_TTL_SEC:
-                    # Fresh: return as-is
-                    pass
-                elif age < MODEL_SCORE_CACHE_HARD_TTL_SEC:
-                    # Soft-expired: return stale + trigger async refresh
-                    soft_refreshed.append(model_id)
-                    _trigger_model_score_soft_refresh(model_id)
-                else:
-                    # Hard-expired: synchronous recompute
+                if age >= MODEL_SCORE_CACHE_HARD_TTL_SEC:
                     hard_refreshed.append(model_id)
-                    _sync_compute_and_cache(model_id)
-                    entry = _get_canonical_model_score(model_id)
-                if entry:
-                    models_out[str(model_id)] = {
-                        'conditions': entry['conditions'],
-                        'composite_score': entry.get('composite_score'),
-                        'updated_at': entry['updated_at'],
-                    }
-                else:
-                    if model_id in visible_displayable_model_ids:
-                        scoring_system.queue_visibility_sync_hint(
-                            model_id,
-                            trigger_source='radar_metrics:cache_miss',
-                        )
-                    else:
-                        app.logger.info(
-                            "Skipping radar_metrics visibility-sync hint for model_id=%s: "
-                            "model is not currently visible/displayable.",
-                            model_id,
-                        )
+                elif age >= MODEL_SCORE_CACHE_SOFT_TTL_SEC:
+                    soft_refreshed.append(model_id)
+                models_out[str(model_id)] = {
+                    'conditions': entry['conditions'],
+                    'composite_score': entry.get('composite_score'),
+                    'updated_at': entry['updated_at'],
+                }
+            elif model_id in visible_displayable_model_ids:
+                scoring_system.queue_visibility_sync_hint(
+                    model_id,
+                    trigger_source='radar_metrics:cache_miss',
+                )
             else:
-                # Missing: synchronous compute
-                hard_refreshed.append(model_id)
-                _sync_compute_and_cache(model_id)
-                entry = _get_canonical_model_score(model_id)
-                if entry:
-                    models_out[str(model_id)] = {
-                        'conditions': entry['conditions'],
-                        'composite_score': entry.get('composite_score'),
-                        'updated_at': entry['updated_at'],
-                    }
-                else:
-                    if model_id in visible_displayable_model_ids:
-                        scoring_system.queue_visibility_sync_hint(
-                            model_id,
-                            trigger_source='radar_metrics:missing_after_sync',
-                        )
-                    else:
-                        app.logger.info(
-                            "Skipping radar_metrics visibility-sync hint for model_id=%s: "
-                            "model remained unavailable after sync recompute and "
-                            "has not been verified as visible/displayable.",
-                            model_id,
-                        )
+                app.logger.info(
+                    "Skipping radar_metrics visibility-sync hint for model_id=%s: "
+                    "model is not currently visible/displayable.",
+                    model_id,
+                )
 
         return resp_ok({
             'models': models_out,
@@ -2256,15 +2447,56 @@ def api_internal_warm_scores():
         return resp_err('INTERNAL_ERROR', str(e), 500)
 
 
+@app.post('/api/internal/refresh_meta')
+def api_internal_refresh_meta():
+    """Reload the model / condition meta caches in every worker after an admin edit.
+
+    Publishes a cache_event_bus 'refresh_meta' event.  Body: ``caches`` (optional
+    list of 'model' / 'condition', both by default) and ``incremental`` (allow a
+    delta model refresh; purchase-link-only edits need a full one).  When the
+    event cannot be published only this worker reloads.
+    """
+    try:
+        auth_err = _require_internal_warmup_token()
+        if auth_err is not None:
+            return auth_err
+        data = request.get_json(force=True, silent=True) or {}
+        caches = data.get('caches')
+        if isinstance(caches, str):
+            caches = [caches]
+        if not isinstance(caches, list):
+            caches = None
+        incremental = str(data.get('incremental', '')).strip().lower() in ('1', 'true', 'yes', 'on')
+        try:
+            cache_event_bus.publish(
+                cache_event_bus.EVENT_REFRESH_META,
+                {'caches': caches or ['model', 'condition'], 'incremental': incremental},
+            )
+            cache_event_bus.wake_consumer()
+            return resp_ok({'queued': True, 'published': True})
+        except Exception as e:
+            app.logger.warning('[refresh_meta] event publish failed, reloading locally: %s', e)
+            cache_event_handlers.refresh_meta(caches, full=not incremental)
+            return resp_ok({'queued': True, 'published': False})
+    except Exception as e:
+        app.logger.exception(e)
+        return resp_err('INTERNAL_ERROR', str(e), 500)
+
+
 @app.post('/api/internal/refresh_scoring_visibility')
 def api_internal_refresh_scoring_visibility():
     """Refresh scoring caches affected by model visibility transitions.
 
-    Steps:
-      1. Immediately invalidate ModelMetaCache so that subsequent reads
-         (search, suggest, validate_models, etc.) see the new visibility.
-      2. Reload ModelMetaCache with a forced refresh.
-      3. Rebuild scoring / ranking caches via refresh_visibility_scoring_caches().
+    The change is published as a cache_event_bus 'refresh_scoring_visibility'
+    event (model ids in the payload) so every worker picks it up; each one
+      1. delta-refreshes ModelMetaCache so reads see the new visibility, and
+      2. syncs its visible-model set via refresh_visibility_scoring_caches(),
+         where exactly one worker rebuilds and the others reload the shared
+         results.
+    ``wait_for_completion`` runs the refresh in this request first and only
+    then publishes the event, so this worker's own consumer cannot coalesce or
+    lock it out; 'refreshed' reports whether it completed.  When the event
+    cannot be published the refresh runs locally only.
     """
     try:
         auth_err = _require_internal_warmup_token()
@@ -2278,14 +2510,34 @@ def api_internal_refresh_scoring_visibility():
         new_visibility_scope = data.get('new_visibility_scope')
         wait_for_completion = str(data.get('wait_for_completion', '')).strip().lower() in ('1', 'true', 'yes', 'on')
 
-        def _refresh():
+        def _publish() -> bool:
             try:
-                cache_event_handlers.refresh_scoring_visibility(
+                cache_event_bus.publish(
+                    cache_event_bus.EVENT_REFRESH_SCORING_VISIBILITY,
+                    {
+                        'model_id': model_id,
+                        'model_ids': [model_id] if model_id > 0 else [],
+                        'old_is_valid': old_is_valid,
+                        'new_is_valid': new_is_valid,
+                        'old_visibility_scope': old_visibility_scope,
+                        'new_visibility_scope': new_visibility_scope,
+                    },
+                )
+                cache_event_bus.wake_consumer()
+                return True
+            except Exception as e:
+                app.logger.warning('[refresh_scoring_visibility] event publish failed, refreshing locally: %s', e)
+                return False
+
+        def _refresh(wait: bool = False) -> bool:
+            try:
+                return cache_event_handlers.refresh_scoring_visibility(
                     model_id,
                     old_is_valid,
                     new_is_valid,
                     old_visibility_scope,
                     new_visibility_scope,
+                    wait=wait,
                 )
             except Exception as e:
                 app.logger.warning(
@@ -2295,12 +2547,17 @@ def api_internal_refresh_scoring_visibility():
                     new_is_valid,
                     e,
                 )
+                return False
 
         if wait_for_completion:
-            _refresh()
-            return resp_ok({'queued': False, 'refreshed': True})
-
-        threading.Thread(target=_refresh, daemon=True, name='visibility-refresh').start()
+            refreshed = _refresh(wait=True)
+            # The other workers adopt this worker's rebuild when the event reaches them.
+            _publish()
+            return resp_ok({'queued': False, 'refreshed': refreshed})
+
+        published = _publish()
+        if not published:
+            threading.Thread(target=_refresh, daemon=True, name='visibility-refresh').start()
         return resp_ok({'queued': True, 'refreshed': False})
     except Exception as e:
         app.logger.exception(e)
@@ -2619,34 +2876,82 @@ def legal():
         update_date='2025-10-08'
     )
 
+# =========================================
+# Rankings v2 pre-encoded payload
+# =========================================
+# (key, checked_at, body, etag, html_fragment), swapped by reference.
+# key = (rankings cache version, meta snapshot version); the displayability
+# filter applied by get_rankings_v2 depends on model meta.
+_rankings_v2_prebuilt: tuple | None = None
+_rankings_v2_prebuilt_lock = threading.Lock()
+
+
+def _encode_rankings_v2(data: dict) -> tuple:
+    body, etag = encode_prebuilt_ok(data)
+    policies = app.jinja_env.policies
+    # Same output as the template's |tojson filter.
+    fragment = htmlsafe_json_dumps(
+        data, dumps=policies['json.dumps_function'], **policies['json.dumps_kwargs']
+    )
+    return body, etag, fragment
+
+
+def _get_rankings_v2_prebuilt() -> tuple:
+    """Return (body, etag, html_fragment) for the current rankings.
+
+    Re-encoded only when the rankings cache entry or the meta snapshot changes;
+    get_rankings_v2 is consulted again once per rankings TTL so its own expiry
+    and reload still apply.
+    """
+    global _rankings_v2_prebuilt
+    key = (scoring_system.get_rankings_v2_version(), model_meta_cache.get_snapshot_version())
+    entry = _rankings_v2_prebuilt
+    if entry and entry[0] == key and time.time() - entry[1] < scoring_system.get_rankings_v2_ttl_sec():
+        return entry[2:]
+    with _rankings_v2_prebuilt_lock:
+        entry = _rankings_v2_prebuilt
+        if entry and entry[0] == key and time.time() - entry[1] < scoring_system.get_rankings_v2_ttl_sec():
+            return entry[2:]
+        data = get_rankings_v2()
+        # Read the key again: a reload inside get_rankings_v2 bumps the version.
+        key = (scoring_system.get_rankings_v2_version(), model_meta_cache.get_snapshot_version())
+        if entry and entry[0] == key:
+            _rankings_v2_prebuilt = (key, time.time()) + entry[2:]
+        else:
+            _rankings_v2_prebuilt = (key, time.time()) + _encode_rankings_v2(data)
+        return _rankings_v2_prebuilt[2:]
+
+
 # =========================================
 # Index
 # =========================================
 @app.route('/')
 def index():
-    # v2 rankings data (model-centric, with heat_score + composite_score)
+    # v2 rankings data (model-centric, with heat_score + composite_score),
+    # embedded as the cached pre-encoded JSON fragment.
     try:
-        rankings_v2 = get_rankings_v2()
+        rankings_v2_json = _get_rankings_v2_prebuilt()[2]
     except Exception:
-        rankings_v2 = {'heat_board': [], 'performance_board': []}
+        rankings_v2_json = htmlsafe_json_dumps({'heat_board': [], 'performance_board': []})
 
     html_content = render_template(
         'fancoolindex.html',
-        rankings_v2=rankings_v2,
+        rankings_v2_json=rankings_v2_json,
         current_year=datetime.now().year,
         radar_cids=list(_RADAR_CIDS),
         condition_display_order=list(CONDITION_DISPLAY_ORDER),
     )
     response = make_response(html_content)
-    response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, proxy-revalidate'
-    response.headers['Expires'] = '0'
-    response.headers['Pragma'] = 'no-cache'
-    return response
+    # The page has no per-user content: revalidate on every load, answer 304
+    # while the rendered page (and so the rankings) is unchanged.
+    response.headers['Cache-Control'] = 'no-cache'
+    response.set_etag(hashlib.sha1(response.get_data()).hexdigest()[:24])
+    return response.make_conditional(request)
 
 # 4) 排行榜 API（canonical model-score profile）
 @app.get('/api/rankings_v2')
 def api_rankings_v2():
-    """Return rankings from the canonical score cache snapshot.
+    """Return rankings from the canonical score cache snapshot (pre-encoded, ETag / 304, gzip).
 
     Response (HTTP 200):
       { "success": true, "data": {
@@ -2658,8 +2963,8 @@ def api_rankings_v2():
       { "success": false, "error_code": "INTERNAL_ERROR", "error_message": "..." }
     """
     try:
-        data = get_rankings_v2()
-        return resp_ok(data)
+        body, etag, _fragment = _get_rankings_v2_prebuilt()
+        return resp_prebuilt(body, etag, compress=True)
     except Exception as e:
         app.logger.exception(e)
         return resp_err('INTERNAL_ERROR', str(e), 500)
@@ -2709,29 +3014,123 @@ def _build_ladder_payload(model_lookup: dict, max_items: int) -> dict:
     }
 
 
-def _rebuild_ladder_cache(rankings: dict | None = None) -> dict:
+def _ladder_artefact_path() -> str:
+    return os.path.join(
+        scoring_system._shared_cache_dir(), f'ladder_v1{scoring_system._score_cache_suffix()}.json'
+    )
+
+
+def _ladder_artefact_key() -> tuple | None:
+    try:
+        st = os.stat(_ladder_artefact_path())
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _ladder_versions() -> dict:
+    """What a ladder body is built from, identical in every worker with the same data."""
+    return {
+        'format': _LADDER_ARTEFACT_FORMAT,
+        'denom_written_at': scoring_system.get_denom_written_at(),
+        'meta': model_meta_cache.get_snapshot_digest(),
+        'date': _ladder_date(),
+        'max_items': FAN_LADDER_MAX_ITEMS,
+    }
+
+
+def _read_ladder_artefact() -> tuple | None:
+    """(versions, body) of the shared artefact; versions is None for artefacts
+    without a version header (written before it existed) or a corrupt one."""
+    try:
+        with open(_ladder_artefact_path(), 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        app.logger.warning('[ladder] artefact read failed: %s', e)
+        return None
+    header, sep, body = raw.partition(b'\n')
+    try:
+        versions = json.loads(header) if sep else None
+    except ValueError:
+        versions = None
+    if not isinstance(versions, dict) or versions.get('format') != _LADDER_ARTEFACT_FORMAT:
+        return None, raw
+    return versions, body
+
+
+def _rebuild_ladder_cache(rankings: dict | None = None, *, publish: bool = True) -> Tuple[bytes, str]:
+    """Build the ladder payload and adopt it in this process; with ``publish`` also
+    write it, headed by its versions, to the shared cache dir (one artefact for
+    every worker)."""
+    global _ladder_prebuilt
+    versions = _ladder_versions()
     model_lookup = (rankings or {}).get('model_lookup') or {}
     if not model_lookup:
         rankings = get_rankings_v2()
         model_lookup = rankings.get('model_lookup') or {}
     payload = _build_ladder_payload(model_lookup, FAN_LADDER_MAX_ITEMS)
+    body, etag = encode_prebuilt_ok(payload)
+    key = _ladder_artefact_key()
+    if publish:
+        path = _ladder_artefact_path()
+        try:
+            d = os.path.dirname(path)
+            os.makedirs(d, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix='_tmp_ladder_', suffix='.json', dir=d)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(json.dumps(versions, sort_keys=True).encode('utf-8') + b'\n' + body)
+                os.replace(tmp, path)
+            finally:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+            key = _ladder_artefact_key()
+        except Exception as e:
+            app.logger.warning('[ladder] artefact write failed: %s', e)
     with _ladder_cache_lock:
-        global _ladder_cache_payload
-        _ladder_cache_payload = payload
-    return payload
+        _ladder_prebuilt = (key, time.time(), body, etag, versions)
+    return body, etag
 
 
-def _get_ladder_cache_payload() -> dict:
+def _get_ladder_prebuilt() -> Tuple[bytes, str]:
+    """Return (body, etag) of the ladder.
+
+    The shared artefact is adopted only when its versions match this worker's
+    scores, meta and ladder date. On a mismatch the ladder is rebuilt locally;
+    that build replaces the artefact only when the artefact is provably older
+    (an older denom cache, no version header, or the very build this worker
+    served before), so workers with different meta never overwrite each other.
+    """
+    global _ladder_prebuilt, _ladder_rejected_key
     with _ladder_cache_lock:
-        cached = _ladder_cache_payload
-    if cached is not None:
-        return cached
+        entry = _ladder_prebuilt
+    if entry is not None and time.time() - entry[1] < _LADDER_ARTEFACT_RECHECK_SEC:
+        return entry[2], entry[3]
     with _ladder_cache_build_lock:
         with _ladder_cache_lock:
-            cached = _ladder_cache_payload
-        if cached is not None:
-            return cached
-        return _rebuild_ladder_cache()
+            entry = _ladder_prebuilt
+        current = _ladder_versions()
+        key = _ladder_artefact_key()
+        if entry is not None and entry[4] == current and (key is None or key in (entry[0], _ladder_rejected_key)):
+            with _ladder_cache_lock:
+                _ladder_prebuilt = (entry[0], time.time()) + entry[2:]
+            return entry[2], entry[3]
+        disk = _read_ladder_artefact() if key is not None else None
+        if disk is None:
+            return _rebuild_ladder_cache()
+        versions, body = disk
+        if versions == current:
+            etag = hashlib.sha1(body).hexdigest()[:24]
+            with _ladder_cache_lock:
+                _ladder_prebuilt = (key, time.time(), body, etag, versions)
+            return body, etag
+        _ladder_rejected_key = key
+        older = versions is None or versions.get('denom_written_at', 0) < current['denom_written_at']
+        served_before = entry is not None and versions == entry[4]
+        app.logger.info('[ladder] shared artefact does not match this worker (publish=%s)', older or served_before)
+        return _rebuild_ladder_cache(publish=older or served_before)
 
 
 def _on_rankings_warmup(rankings_result: dict, trigger_source: str) -> None:
@@ -2822,7 +3221,8 @@ def api_ladder():
 
     Uses a backend ladder snapshot cache derived from the canonical score cache.
     The ladder snapshot is refreshed after rankings warm-up (including the daily
-    06:00 CST full refresh) and reused as the frontend data source.
+    06:00 CST full refresh), published as a pre-encoded artefact in the shared
+    cache dir and served by every worker as-is (ETag / 304).
 
     Response (HTTP 200):
       {
@@ -2847,7 +3247,8 @@ def api_ladder():
     """
     try:
         _ensure_ladder_warmup_hook_registered()
-        return resp_ok(_get_ladder_cache_payload())
+        body, etag = _get_ladder_prebuilt()
+        return resp_prebuilt(body, etag)
     except Exception as e:
         app.logger.exception(e)
         return resp_err('INTERNAL_ERROR', str(e), 500)
@@ -3170,12 +3571,39 @@ def api_announcement():
 # =========================================
 # Sweep Audio Playback API
 # =========================================
-@app.post('/api/sweep-audio')
+SWEEP_AUDIO_CACHE_MAX_AGE_SEC = _env_int('SWEEP_AUDIO_CACHE_MAX_AGE_SEC', 3600)
+
+
+def _sweep_audio_etag(model_id: int, condition_id: int, target_rpm: float, output_format: str,
+                      sweep_audio_meta: dict | None) -> str | None:
+    """ETag derived from the request, the spectrum cache file and the audio sources it points to.
+
+    Rebuilding the spectrum cache or replacing a recording changes it.
+    """
+    parts = [f"{model_id}:{condition_id}:{target_rpm:.3f}:{output_format}"]
+    try:
+        st = os.stat(spectrum_cache.path(model_id, condition_id))
+        parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+        for f in (sweep_audio_meta or {}).get('files') or []:
+            file_path = f.get('file_path') if isinstance(f, dict) else None
+            if file_path:
+                st = os.stat(file_path)
+                parts.append(f"{file_path}:{st.st_mtime_ns}:{st.st_size}")
+    except OSError:
+        return None
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:24]
+
+
+@app.route('/api/sweep-audio', methods=['GET', 'POST'])
 def api_sweep_audio():
     try:
-        from app.audio_services import sweep_audio_player
+        from app.audio_services import sweep_audio_player, render_executor
         
-        data = request.get_json(force=True, silent=True) or {}
+        # POST 读取 JSON body；GET 读取查询参数（可被浏览器/CDN 缓存并支持 Range 拖动）
+        if request.method == 'POST':
+            data = request.get_json(force=True, silent=True) or {}
+        else:
+            data = request.args
         
         # 解析参数 / Parse parameters
         try:
@@ -3185,50 +3613,127 @@ def api_sweep_audio():
         except (ValueError, TypeError) as e:
             return resp_err('INVALID_INPUT', f'参数格式错误: {e}', 400)
         
+        # 输出格式：body.format / ?format= 优先，其次 Accept 头（未指定时为 16-bit 单声道 WAV）
+        try:
+            output_format = sweep_audio_player.resolve_output_format(
+                data.get('format') or request.args.get('format'),
+                request.headers.get('Accept'),
+            )
+        except ValueError as e:
+            return resp_err('INVALID_INPUT', str(e), 400)
+        
         # 验证参数 / Validate parameters
         if model_id <= 0 or condition_id <= 0:
             return resp_err('INVALID_INPUT', '缺少 model_id 或 condition_id', 400)
         if target_rpm <= 0:
             return resp_err('INVALID_INPUT', f'target_rpm 必须为正数: {target_rpm}', 400)
         
-        # 1) 从缓存加载模型
-        cached_model = spectrum_cache.load(model_id, condition_id)
-        if not cached_model or not isinstance(cached_model, dict):
-            return resp_err('MODEL_NOT_FOUND', f'未找到 model_id={model_id}, condition_id={condition_id} 的缓存模型', 404)
-        
-        model_json = cached_model.get('model')
-        if not model_json or not isinstance(model_json, dict):
-            return resp_err('MODEL_INVALID', '缓存模型数据无效', 500)
+        # 1) 优先读取二进制帧索引（无需解析整份频谱 JSON）；缺失/过期时回退 JSON 并补建
+        packed = spectrum_cache.load_frame_index(model_id, condition_id)
+        if packed is not None:
+            frame_index = sweep_audio_player.PackedFrameIndex(
+                packed['frames'], packed['rpm_sorted'], packed['rpm_order']
+            )
+            model_json = {
+                'sweep_frame_index': frame_index,
+                'sweep_audio_meta': packed['sweep_audio_meta'],
+            }
+            if not sweep_audio_player.validate_packed_frame_index(frame_index, packed['sweep_audio_meta']):
+                return resp_err('SWEEP_INDEX_MISSING', '模型中缺少 sweep_frame_index 或数据无效', 404)
+        else:
+            cached_model = spectrum_cache.load(model_id, condition_id)
+            if not cached_model or not isinstance(cached_model, dict):
+                return resp_err('MODEL_NOT_FOUND', f'未找到 model_id={model_id}, condition_id={condition_id} 的缓存模型', 404)
+            
+            model_json = cached_model.get('model')
+            if not model_json or not isinstance(model_json, dict):
+                return resp_err('MODEL_INVALID', '缓存模型数据无效', 500)
+            
+            # 2) 验证是否包含 sweep_frame_index
+            if not sweep_audio_player.validate_model_has_frame_index(model_json):
+                return resp_err('SWEEP_INDEX_MISSING', '模型中缺少 sweep_frame_index 或数据无效', 404)
+            
+            spectrum_cache.save_frame_index(model_json, model_id=model_id, condition_id=condition_id)
         
-        # 2) 验证是否包含 sweep_frame_index
-        if not sweep_audio_player.validate_model_has_frame_index(model_json):
-            return resp_err('SWEEP_INDEX_MISSING', '模型中缺少 sweep_frame_index 或数据无效', 404)
+        # 0) 条件请求：频谱缓存与源音频均未变化时直接 304，无需重新渲染
+        #    仅 GET 可被浏览器/CDN 缓存；POST 不下发 Cache-Control
+        etag = _sweep_audio_etag(model_id, condition_id, target_rpm, output_format,
+                                 model_json.get('sweep_audio_meta'))
+        cache_headers = {'Vary': 'Accept'}
+        if request.method == 'GET':
+            cache_headers['Cache-Control'] = f'public, max-age={SWEEP_AUDIO_CACHE_MAX_AGE_SEC}'
+        if etag:
+            cache_headers['ETag'] = f'"{etag}"'
+            if request.if_none_match and request.if_none_match.contains(etag):
+                return Response(status=304, headers=cache_headers)
         
-        app.logger.info('[sweep-audio] Using sweep_frame_index for model_id=%s, condition_id=%s, target_rpm=%s', 
-                       model_id, condition_id, target_rpm)
+        # 3) 渲染音频（duration_sec 已废弃，固定使用内部 TARGET_DURATION_SEC）
+        #    同一 ETag 的渲染结果按进程缓存，Range 请求直接切片；
+        #    未命中时在有界渲染执行器中运行，同一 uid 的旧请求会被新请求取代；
+        #    同一 ETag 的并发请求（如多个 Range）共享一次渲染
+        cached = sweep_audio_player.get_cached_render(etag) if etag else None
+        if cached is not None:
+            final_audio, metadata, payload = cached
+        else:
+            app.logger.info('[sweep-audio] Using sweep_frame_index for model_id=%s, condition_id=%s, target_rpm=%s',
+                            model_id, condition_id, target_rpm)
+            try:
+                final_audio, metadata = render_executor.run_render(
+                    lambda: sweep_audio_player.render_sweep_audio(
+                        model_json, target_rpm, duration_sec=None, output_format=output_format,
+                        should_cancel=render_executor.is_cancelled,
+                    ),
+                    uid=user_activity.get_or_create_user_identifier(),
+                    key=etag,
+                )
+            except render_executor.RenderRejected as e:
+                resp = resp_err(e.code, e.message, e.status)
+                resp.headers.update(e.response_headers())
+                return resp
+            except ValueError as e:
+                return resp_err('AUDIO_GENERATION_FAILED', f'音频生成失败: {e}', 400)
+            except Exception as e:
+                app.logger.exception('sweep_audio_player.render_sweep_audio error: %s', e)
+                return resp_err('AUDIO_GENERATION_ERROR', f'音频生成异常: {e}', 500)
+            # 非 WAV 容器（FLAC）长度无法预知：一次性编码
+            payload = None
+            if metadata.get('file_ext') != 'wav':
+                payload = sweep_audio_player.encode_audio_bytes(final_audio, metadata['sample_rate'], output_format)
+            if etag:
+                sweep_audio_player.put_cached_render(etag, final_audio, metadata, payload)
         
-        # 3) 生成音频（duration_sec 已废弃，固定使用内部 TARGET_DURATION_SEC）
-        try:
-            wav_bytes, metadata = sweep_audio_player.generate_sweep_audio(
-                model_json, target_rpm, duration_sec=None
-            )
-        except ValueError as e:
-            return resp_err('AUDIO_GENERATION_FAILED', f'音频生成失败: {e}', 400)
-        except Exception as e:
-            app.logger.exception('sweep_audio_player.generate_sweep_audio error: %s', e)
-            return resp_err('AUDIO_GENERATION_ERROR', f'音频生成异常: {e}', 500)
+        headers = dict(cache_headers)
+        headers['Content-Type'] = metadata.get('mimetype') or 'audio/wav'
+        headers['Content-Disposition'] = f'attachment; filename="sweep_audio_rpm{int(target_rpm)}.{metadata.get("file_ext") or "wav"}"'
+        headers['Accept-Ranges'] = 'bytes'
+        # 元数据
+        headers['X-Target-RPM'] = str(metadata.get('target_rpm'))
+        headers['X-Duration-Sec'] = str(metadata.get('duration_sec'))
+        headers['X-Sample-Rate'] = str(metadata.get('sample_rate'))
+        headers['X-Audio-Format'] = str(metadata.get('output_format'))
         
-        # 4) 返回音频
-        response = make_response(wav_bytes)
-        response.headers['Content-Type'] = 'audio/wav'
-        response.headers['Content-Disposition'] = f'attachment; filename="sweep_audio_rpm{int(target_rpm)}.wav"'
+        # 4a) 非 WAV 容器（FLAC）：返回已编码字节
+        if payload is not None:
+            response = make_response(payload)
+            response.headers.update(headers)
+            return response
         
-        # 元数据
-        response.headers['X-Target-RPM'] = str(metadata.get('target_rpm'))
-        response.headers['X-Duration-Sec'] = str(metadata.get('duration_sec'))
-        response.headers['X-Sample-Rate'] = str(metadata.get('sample_rate'))
+        # 4b) WAV：按预知长度写头部，分块流式编码，支持 Range
+        stream = sweep_audio_player.WavStream(final_audio, metadata['sample_rate'], output_format)
+        total = stream.total_length
+        status = 200
+        start, end = 0, total - 1
+        if request.range is not None:
+            rng = request.range.range_for_length(total)
+            if rng is None:
+                headers['Content-Range'] = f'bytes */{total}'
+                return Response(status=416, headers=headers)
+            start, end = rng[0], rng[1] - 1
+            status = 206
+            headers['Content-Range'] = f'bytes {start}-{end}/{total}'
+        headers['Content-Length'] = str(end - start + 1)
         
-        return response
+        return Response(stream.iter_bytes(start, end), status=status, headers=headers, direct_passthrough=True)
         
     except Exception as e:
         app.logger.exception('api_sweep_audio error: %s', e)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+heat_rollup: Rolling per-day buckets for the 30-day radar-add counts used by heat_score.
+
+Instead of re-counting 30 days of user_radar_logs on every canonical-facts
+build, each closed day (per the DB server's calendar) is counted once and kept
+as a bucket of model_id -> count; the running 30-day totals are the sum of the
+buckets.  A build re-counts only today's rows, and when the date rolls over the
+expired day's bucket is subtracted from the totals.
+
+Window: today plus the previous RADAR_ADD_WINDOW_DAYS - 1 calendar days, so it
+is day-aligned rather than the exact rolling ``NOW() - INTERVAL 30 DAY``.
+Buckets count every model; the "model has performance data" filter
+(mids_cids_in_data_view) is applied to the totals on each read, so a model
+that gains or loses data is reflected immediately across the whole window.
+
+The DB stays the source of truth, so every worker sees the same counts
+regardless of which worker handled the writes.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from datetime import date, timedelta
+from typing import Dict, Set
+
+_logger = logging.getLogger(__name__)
+
+RADAR_ADD_WINDOW_DAYS: int = max(1, int(os.getenv("RADAR_ADD_WINDOW_DAYS", "30")))
+
+_SQL_FILTER = "event_type = 'add'"
+
+
+class _DayBuckets:
+    """Per-day count buckets with running totals across the kept days."""
+
+    def __init__(self):
+        self.days: Dict[date, Dict[int, int]] = {}
+        self.totals: Dict[int, int] = {}
+
+    def _add(self, counts: Dict[int, int], sign: int) -> None:
+        for key, n in counts.items():
+            v = self.totals.get(key, 0) + sign * n
+            if v:
+                self.totals[key] = v
+            else:
+                self.totals.pop(key, None)
+
+    def set_day(self, day: date, counts: Dict[int, int]) -> None:
+        old = self.days.get(day)
+        if old:
+            self._add(old, -1)
+        self.days[day] = counts
+        self._add(counts, 1)
+
+    def drop_before(self, first_day: date) -> None:
+        for day in [d for d in self.days if d < first_day]:
+            self._add(self.days.pop(day), -1)
+
+
+_buckets = _DayBuckets()
+_open_day: date | None = None  # the day last counted as "today"; recounted once closed
+_lock = threading.Lock()
+
+
+def _rows_to_day_counts(rows) -> Dict[date, Dict[int, int]]:
+    out: Dict[date, Dict[int, int]] = {}
+    for r in rows or []:
+        try:
+            d = r["d"]
+            if not isinstance(d, date):
+                d = date.fromisoformat(str(d)[:10])
+            mid = int(r["model_id"])
+            n = int(r["c"] or 0)
+        except Exception:
+            continue
+        if n > 0:
+            out.setdefault(d, {})[mid] = n
+    return out
+
+
+def _db_today(fetch_all_fn) -> date:
+    rows = fetch_all_fn("SELECT CURDATE() AS today")
+    d = rows[0]["today"]
+    return d if isinstance(d, date) else date.fromisoformat(str(d)[:10])
+
+
+def _models_with_data(fetch_all_fn) -> Set[int]:
+    rows = fetch_all_fn("SELECT DISTINCT model_id FROM mids_cids_in_data_view")
+    out: Set[int] = set()
+    for r in rows or []:
+        try:
+            out.add(int(r["model_id"]))
+        except Exception:
+            continue
+    return out
+
+
+def get_radar_add_counts(fetch_all_fn) -> Dict[int, int]:
+    """
+    Return model_id -> radar-add count over the window, for models that
+    currently have performance data.
+
+    Missing closed days are counted once (one grouped query over the missing
+    range), today's bucket is re-counted on every call.
+    """
+    global _open_day
+    with _lock:
+        today = _db_today(fetch_all_fn)
+        first_day = today - timedelta(days=RADAR_ADD_WINDOW_DAYS - 1)
+        _buckets.drop_before(first_day)
+
+        missing = [
+            day
+            for day in (first_day + timedelta(days=i) for i in range(RADAR_ADD_WINDOW_DAYS - 1))
+            if day not in _buckets.days or day == _open_day
+        ]
+        if missing:
+            rows = fetch_all_fn(
+                f"""
+                SELECT DATE(event_time) AS d, model_id, COUNT(1) AS c
+                FROM user_radar_logs
+                WHERE event_time >= :start AND event_time < :end
+                  AND {_SQL_FILTER}
+                GROUP BY DATE(event_time), model_id
+                """,
+                {"start": min(missing).isoformat(), "end": today.isoformat()},
+            )
+            by_day = _rows_to_day_counts(rows)
+            for day in missing:
+                _buckets.set_day(day, by_day.get(day, {}))
+            _logger.debug("[heat_rollup] loaded %d closed day bucket(s)", len(missing))
+
+        rows = fetch_all_fn(
+            f"""
+            SELECT DATE(event_time) AS d, model_id, COUNT(1) AS c
+            FROM user_radar_logs
+            WHERE event_time >= :start
+              AND {_SQL_FILTER}
+            GROUP BY DATE(event_time), model_id
+            """,
+            {"start": today.isoformat()},
+        )
+        _buckets.set_day(today, _rows_to_day_counts(rows).get(today, {}))
+        _open_day = today
+        totals = dict(_buckets.totals)
+    with_data = _models_with_data(fetch_all_fn)
+    return {mid: n for mid, n in totals.items() if mid in with_data}
+
@@ -1,17 +1,57 @@
+import hashlib
 import os
 import threading
 import time
-from typing import Callable, Dict, List, Set, Tuple
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, FrozenSet, Iterable, List, Set, Tuple
 
 _DEFAULT_TTL_SEC = 300
 
 _fetch_all: Callable | None = None
 _logger = None
 _ttl_sec = _DEFAULT_TTL_SEC
+# Guards the small bookkeeping fields; readers never take it (see _Snapshot).
 _cache_lock = threading.RLock()
-_cache_data: Dict[int, dict] = {}
-_model_ids_by_brand_model: Dict[Tuple[str, str], List[int]] = {}
+# Serialises whole refreshes (DB I/O happens under this lock, not _cache_lock).
+_refresh_lock = threading.Lock()
 _cache_loaded_at = 0.0
+_refresh_inflight = False
+_refresh_again = False  # a reload was requested while one was already running
+_full_requested = False  # next background reload must be a full one
+_refresh_hooks: List[Callable[[int], None]] = []
+
+
+class FrozenDict(dict):
+    """A ``dict`` that rejects mutation.
+
+    Snapshot entries are handed to every reader without copying, so they must
+    not be mutable.  Subclassing ``dict`` (rather than MappingProxyType) keeps
+    ``isinstance(meta, dict)`` checks, ``jsonify`` and ``json.dump`` working
+    unchanged; ``dict(meta)`` still yields an ordinary mutable copy.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('model meta snapshot is read-only; copy it with dict(...) first')
+
+    __setitem__ = __delitem__ = _readonly
+    update = pop = popitem = setdefault = clear = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def __copy__(self):
+        return self
+
+
+def _freeze_value(value):
+    if isinstance(value, dict):
+        return FrozenDict((k, _freeze_value(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_value(v) for v in value)
+    return value
 
 
 def _parse_visible_scopes() -> Set[int]:
@@ -57,12 +97,305 @@ def _brand_model_key(brand_name: str | None, model_name: str | None) -> Tuple[st
     return (_norm_lookup_value(brand_name), _norm_lookup_value(model_name))
 
 
-def refresh() -> Dict[int, dict]:
-    if _fetch_all is None:
-        raise RuntimeError('model_meta_cache is not configured')
+def _to_int_or_zero(value) -> int:
+    return int(value or 0)
+
+
+def _to_float_or_zero(value) -> float:
+    return float(value or 0)
+
 
-    rows = _fetch_all("""
-        SELECT
+class ModelFilterIndex:
+    """Inverted attribute indexes over one cache generation, built at refresh time.
+
+    * ``eq``    – field -> value -> frozenset(model_id)  (posting lists)
+    * ``bits``  – field -> bit -> frozenset(model_id)    (for flag bitmasks)
+    * ``range`` – field -> (sorted values, aligned model_ids)
+
+    Value normalisation mirrors the historical linear scan in
+    ``fancoolserver._filter_model_ids_from_meta`` so results are identical:
+    rows whose value cannot be converted are left out of that field's index.
+    """
+
+    _EQ_FIELDS = {
+        'size': lambda v: str(v or ''),
+        'speed_switch_type_id': _to_int_or_zero,
+        'chain_type_id': _to_int_or_zero,
+        'bearing': lambda v: str(v or '').strip().upper(),
+        'reverse_opt': _to_int_or_zero,
+        'rgb_flags': _to_int_or_zero,
+    }
+    _BIT_FIELDS = ('rgb_flags', 'color_flags')
+    _RANGE_FIELDS = {
+        'thickness': _to_int_or_zero,
+        'reference_price': _to_float_or_zero,
+        'max_speed': _to_int_or_zero,
+    }
+
+    def __init__(self, data: Dict[int, dict]):
+        self.all_ids: FrozenSet[int] = frozenset(data.keys())
+        eq: Dict[str, Dict[object, Set[int]]] = {f: {} for f in self._EQ_FIELDS}
+        bits: Dict[str, Dict[int, Set[int]]] = {f: {} for f in self._BIT_FIELDS}
+        ranges: Dict[str, List[Tuple[float, int]]] = {f: [] for f in self._RANGE_FIELDS}
+
+        for model_id, meta in data.items():
+            for field, norm in self._EQ_FIELDS.items():
+                try:
+                    key = norm(meta.get(field))
+                except (TypeError, ValueError):
+                    # rgb_flags historically falls back to 0 on bad data
+                    if field != 'rgb_flags':
+                        continue
+                    key = 0
+                eq[field].setdefault(key, set()).add(model_id)
+            for field in self._BIT_FIELDS:
+                try:
+                    flags = int(meta.get(field) or 0)
+                except (TypeError, ValueError):
+                    continue
+                bit = 0
+                while flags > 0:
+                    if flags & 1:
+                        bits[field].setdefault(bit, set()).add(model_id)
+                    flags >>= 1
+                    bit += 1
+            for field, conv in self._RANGE_FIELDS.items():
+                try:
+                    ranges[field].append((conv(meta.get(field)), model_id))
+                except (TypeError, ValueError):
+                    continue
+
+        self.eq = {f: {k: frozenset(v) for k, v in m.items()} for f, m in eq.items()}
+        self.bits = {f: {k: frozenset(v) for k, v in m.items()} for f, m in bits.items()}
+        self.range: Dict[str, Tuple[Tuple[float, ...], Tuple[int, ...]]] = {}
+        for field, pairs in ranges.items():
+            pairs.sort()
+            self.range[field] = (tuple(v for v, _ in pairs), tuple(m for _, m in pairs))
+
+    def ids_for_values(self, field: str, values: Iterable) -> Set[int]:
+        postings = self.eq.get(field) or {}
+        out: Set[int] = set()
+        for value in values:
+            out.update(postings.get(value, ()))
+        return out
+
+    def ids_matching(self, field: str, predicate: Callable[[object], bool]) -> Set[int]:
+        out: Set[int] = set()
+        for value, ids in (self.eq.get(field) or {}).items():
+            if predicate(value):
+                out.update(ids)
+        return out
+
+    def ids_in_range(self, field: str, lo, hi) -> Set[int]:
+        values, ids = self.range.get(field) or ((), ())
+        return set(ids[bisect_left(values, lo):bisect_right(values, hi)])
+
+    def ids_with_any_bit(self, field: str, mask: int) -> Set[int]:
+        postings = self.bits.get(field) or {}
+        out: Set[int] = set()
+        bit = 0
+        mask = int(mask or 0)
+        while mask > 0:
+            if mask & 1:
+                out.update(postings.get(bit, ()))
+            mask >>= 1
+            bit += 1
+        return out
+
+
+    def select(
+        self,
+        *,
+        size_values=None,
+        thickness_min=None,
+        thickness_max=None,
+        price_min=None,
+        price_max=None,
+        max_speed_min=None,
+        max_speed_max=None,
+        rgb_mask: int | None = None,
+        rgb_include_none: bool = False,
+        other_features=None,
+        color_mask=None,
+        chain_type_id: int = 0,
+        reverse_opt_value: int = 0,
+    ) -> Set[int]:
+        """Intersect the postings of every active filter, smallest first.
+
+        ``chain_type_id`` / ``reverse_opt_value`` are the ids matched by the
+        ``chain`` and ``reverse_opt`` features.
+        """
+        try:
+            _rgb_mask = int(rgb_mask or 0)
+        except (TypeError, ValueError):
+            _rgb_mask = 0
+        _rgb_include_none = bool(rgb_include_none)
+        _other_set = {str(x).strip() for x in (other_features or []) if str(x).strip()}
+        _sz_set = {str(v) for v in (size_values or [])}
+
+        parts: List[Set[int]] = []
+        if _sz_set:
+            parts.append(self.ids_for_values('size', _sz_set))
+        if thickness_min is not None and thickness_max is not None:
+            parts.append(self.ids_in_range('thickness', thickness_min, thickness_max))
+        if price_min is not None and price_max is not None:
+            parts.append(self.ids_in_range('reference_price', price_min, price_max))
+        if max_speed_min is not None and max_speed_max is not None:
+            parts.append(self.ids_in_range('max_speed', max_speed_min, max_speed_max))
+        if _rgb_include_none or _rgb_mask > 0:
+            rgb_ids: Set[int] = set()
+            if _rgb_include_none:
+                rgb_ids |= self.ids_for_values('rgb_flags', (0,))
+            if _rgb_mask > 0:
+                rgb_ids |= self.ids_with_any_bit('rgb_flags', _rgb_mask)
+            parts.append(rgb_ids)
+        if 'speed_switch' in _other_set:
+            parts.append(self.ids_matching('speed_switch_type_id', lambda v: v > 0))
+        if 'chain' in _other_set:
+            parts.append(self.ids_for_values('chain_type_id', (chain_type_id,)))
+        if 'DBB' in _other_set:
+            parts.append(self.ids_for_values('bearing', ('DBB',)))
+        if 'no-DBB' in _other_set:
+            parts.append(self.ids_matching('bearing', lambda v: v != 'DBB'))
+        if color_mask:
+            parts.append(self.ids_with_any_bit('color_flags', color_mask))
+        if 'reverse_opt' in _other_set:
+            parts.append(self.ids_for_values('reverse_opt', (reverse_opt_value,)))
+
+        if not parts:
+            return set(self.all_ids)
+        parts.sort(key=len)
+        result = parts[0]
+        for other in parts[1:]:
+            if not result:
+                break
+            result = result & other
+        return set(result)
+
+
+class ModelSuggestIndex:
+    """Bigram/trigram index over lower-cased model and brand names.
+
+    Answers the same case-insensitive substring query as the historical scan
+    in ``/api/model_suggest`` (match in model_name, brand_name_zh or
+    brand_name_en): a 2-char query is a direct bigram lookup, longer queries
+    intersect the posting lists of their trigrams and verify the survivors.
+    Postings are stored as tuples to keep the per-worker footprint small.
+    """
+
+    def __init__(self, data: Dict[int, dict]):
+        fields: Dict[int, Tuple[str, ...]] = {}
+        grams: Dict[str, Set[int]] = {}
+        for model_id, meta in data.items():
+            texts = tuple(
+                str(meta.get(key) or '').lower()
+                for key in ('model_name', 'brand_name_zh', 'brand_name_en')
+            )
+            fields[model_id] = texts
+            for text in texts:
+                for n in (2, 3):
+                    for i in range(len(text) - n + 1):
+                        grams.setdefault(text[i:i + n], set()).add(model_id)
+        self._fields = fields
+        self._grams = {g: tuple(ids) for g, ids in grams.items()}
+
+    def search(self, query: str) -> List[int]:
+        q = (query or '').lower()
+        if len(q) < 2:
+            return []
+        if len(q) == 2:
+            return list(self._grams.get(q, ()))
+        postings = []
+        for i in range(len(q) - 2):
+            ids = self._grams.get(q[i:i + 3])
+            if not ids:
+                return []
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return []
+        return [mid for mid in candidates if any(q in text for text in self._fields[mid])]
+
+
+class _Snapshot:
+    """One immutable cache generation, published by swapping a single reference."""
+
+    __slots__ = ('data', 'ids_by_brand_model', 'ids_by_brand', 'filter_index', 'suggest_index', 'model_ids',
+                 'watermarks', 'version', 'digest')
+
+    def __init__(self, data: Dict[int, FrozenDict],
+                 watermarks: Dict[int, object] | None = None):
+        self.data = FrozenDict(data)
+        self.ids_by_brand_model = FrozenDict(_index_brand_models(self.data))
+        self.ids_by_brand = FrozenDict(_index_brands(self.data))
+        self.filter_index = ModelFilterIndex(self.data)
+        self.suggest_index = ModelSuggestIndex(self.data)
+        self.model_ids = tuple(self.data.keys())
+        # model_id -> watermark value seen when the row was loaded (None when
+        # delta refresh is unavailable).
+        self.watermarks = watermarks
+        # Monotonic generation number, assigned when the snapshot is published.
+        self.version = 0
+        # Content hash, computed on first use (see get_snapshot_digest).
+        self.digest: str | None = None
+
+
+def _index_brand_models(data: Dict[int, dict]) -> Dict[Tuple[str, str], Tuple[int, ...]]:
+    ids_by_brand_model: Dict[Tuple[str, str], Set[int]] = {}
+    for model_id, item in data.items():
+        model_name = item.get('model_name')
+        key_zh = _brand_model_key(item.get('brand_name_zh'), model_name)
+        ids_by_brand_model.setdefault(key_zh, set()).add(model_id)
+        key_en = _brand_model_key(item.get('brand_name_en'), model_name)
+        ids_by_brand_model.setdefault(key_en, set()).add(model_id)
+    # One model_id can be indexed by both zh/en brand keys; keep the lookup list unique.
+    return {key: tuple(sorted(model_ids)) for key, model_ids in ids_by_brand_model.items()}
+
+
+def _index_brands(data: Dict[int, dict]) -> Dict[int, Tuple[int, ...]]:
+    """brand_id -> model ids ordered by (model_name, model_id)."""
+    ids_by_brand: Dict[int, List[int]] = {}
+    for model_id, item in data.items():
+        try:
+            brand_id = int(item.get('brand_id') or 0)
+        except (TypeError, ValueError):
+            continue
+        if brand_id:
+            ids_by_brand.setdefault(brand_id, []).append(model_id)
+    return {
+        brand_id: tuple(sorted(model_ids, key=lambda mid: (data[mid].get('model_name') or '', mid)))
+        for brand_id, model_ids in ids_by_brand.items()
+    }
+
+
+_snapshot = _Snapshot({})
+
+# ---------------------------------------------------------------------------
+# Delta refresh
+#
+# The admin side stamps each model row with a change marker (``update_date``
+# by default; override with MODEL_META_WATERMARK_COLUMN).  An incremental
+# refresh reads only (model_id, scope, marker) for the visible catalog,
+# re-selects full rows just for models whose marker changed or that became
+# visible, and drops models that disappeared.  Purchase links are reloaded
+# for the changed models only, so every MODEL_META_FULL_REFRESH_EVERY-th
+# refresh (and any explicit full refresh) reloads everything to pick up
+# link-only edits.  If the marker column does not exist the cache falls
+# back to full reloads permanently; a failed marker query only forces a full
+# reload on the next refresh.
+# ---------------------------------------------------------------------------
+_WATERMARK_COLUMN = (os.getenv('MODEL_META_WATERMARK_COLUMN') or 'update_date').strip()
+try:
+    _FULL_REFRESH_EVERY = max(1, int(os.getenv('MODEL_META_FULL_REFRESH_EVERY', '12')))
+except ValueError:
+    _FULL_REFRESH_EVERY = 12
+_delta_supported = _WATERMARK_COLUMN.replace('_', '').isalnum()
+_incremental_since_full = 0
+
+_SELECT_COLUMNS = """
             model_id,
             brand_id,
             brand_name_zh,
@@ -91,14 +424,11 @@ def refresh() -> Dict[int, dict]:
             COALESCE(tier_list, 1) AS tier_list,
             COALESCE(caution, 0) AS caution,
             COALESCE(effective_visibility_scope, 1) AS effective_visibility_scope
-        FROM available_models_info_view
-        ORDER BY model_id
-    """)
+"""
 
-    visible_scopes = _parse_visible_scopes()
 
+def _rows_to_items(rows, visible_scopes: Set[int]) -> Dict[int, dict]:
     data: Dict[int, dict] = {}
-    ids_by_brand_model: Dict[Tuple[str, str], List[int]] = {}
     for row in rows:
         try:
             model_id = int(row['model_id'])
@@ -114,12 +444,10 @@ def refresh() -> Dict[int, dict]:
         item = dict(row)
         item['model_id'] = model_id
         data[model_id] = item
-        model_name = item.get('model_name')
-        key_zh = _brand_model_key(item.get('brand_name_zh'), model_name)
-        ids_by_brand_model.setdefault(key_zh, []).append(model_id)
-        key_en = _brand_model_key(item.get('brand_name_en'), model_name)
-        ids_by_brand_model.setdefault(key_en, []).append(model_id)
+    return data
+
 
+def _attach_purchase_links(data: Dict[int, dict]) -> None:
     purchase_links_by_model: Dict[int, List[dict]] = {}
     if data:
         try:
@@ -132,25 +460,234 @@ def refresh() -> Dict[int, dict]:
     for model_id, item in data.items():
         item['purchase_links'] = list(purchase_links_by_model.get(model_id) or [])
 
+
+def _is_missing_column_error(exc: Exception) -> bool:
+    orig = getattr(exc, 'orig', None)
+    args = getattr(orig, 'args', None) or ()
+    if args and args[0] == 1054:  # MySQL ER_BAD_FIELD_ERROR
+        return True
+    msg = str(exc).lower()
+    return 'unknown column' in msg or 'no such column' in msg
+
+
+def _fetch_watermarks(visible_scopes: Set[int]) -> Dict[int, object] | None:
+    """Return {model_id: marker} for the visible catalog, or None if unavailable.
+
+    Delta refresh is disabled for good only when the marker column is missing;
+    other errors (e.g. a transient DB failure) just skip this round.
+    """
+    global _delta_supported
+    if not _delta_supported:
+        return None
+    try:
+        rows = _fetch_all(f"""
+            SELECT
+                model_id,
+                COALESCE(effective_visibility_scope, 1) AS effective_visibility_scope,
+                {_WATERMARK_COLUMN} AS _watermark
+            FROM available_models_info_view
+        """)
+    except Exception as exc:
+        if _is_missing_column_error(exc):
+            _delta_supported = False
+            if _logger:
+                _logger.warning(
+                    '[model_meta_cache] delta refresh disabled (watermark column %r unavailable): %s',
+                    _WATERMARK_COLUMN, exc,
+                )
+        elif _logger:
+            _logger.warning('[model_meta_cache] watermark query failed, will retry: %s', exc)
+        return None
+    out: Dict[int, object] = {}
+    for row in rows:
+        try:
+            model_id = int(row['model_id'])
+            scope = int(row.get('effective_visibility_scope') or 1)
+        except (KeyError, TypeError, ValueError):
+            continue
+        if scope in visible_scopes:
+            out[model_id] = row.get('_watermark')
+    return out
+
+
+def _refresh_full(visible_scopes: Set[int]) -> _Snapshot:
+    # Markers first: a row changed after this point carries a newer marker than
+    # the one stored, so the next delta refresh re-fetches it.
+    watermarks = _fetch_watermarks(visible_scopes)
+    rows = _fetch_all(f"""
+        SELECT{_SELECT_COLUMNS}
+        FROM available_models_info_view
+        ORDER BY model_id
+    """)
+    data = _rows_to_items(rows, visible_scopes)
+    _attach_purchase_links(data)
+    return _Snapshot({mid: _freeze_value(item) for mid, item in data.items()}, watermarks)
+
+
+def _refresh_delta(current: _Snapshot, visible_scopes: Set[int]) -> _Snapshot | None:
+    """Patch ``current`` with changed/removed rows; None means a full reload is needed."""
+    if current.watermarks is None:
+        return None
+    watermarks = _fetch_watermarks(visible_scopes)
+    if watermarks is None:
+        return None
+    old_marks = current.watermarks
+    changed = [
+        mid for mid, mark in watermarks.items()
+        if mid not in current.data or mid not in old_marks or old_marks[mid] != mark
+    ]
+    removed = [mid for mid in current.data if mid not in watermarks]
+    if not changed and not removed:
+        return current
+
+    fresh: Dict[int, dict] = {}
+    if changed:
+        params = {f'mid{i}': mid for i, mid in enumerate(changed)}
+        placeholders = ', '.join(f':{key}' for key in params)
+        rows = _fetch_all(f"""
+            SELECT{_SELECT_COLUMNS}
+            FROM available_models_info_view
+            WHERE model_id IN ({placeholders})
+            ORDER BY model_id
+        """, params)
+        fresh = _rows_to_items(rows, visible_scopes)
+        _attach_purchase_links(fresh)
+
+    merged = dict(current.data)
+    for mid in removed:
+        merged.pop(mid, None)
+    for mid in changed:
+        if mid in fresh:
+            merged[mid] = _freeze_value(fresh[mid])
+        else:
+            # Row vanished between the two queries; drop it and let the next pass retry.
+            merged.pop(mid, None)
+            watermarks.pop(mid, None)
+    if _logger:
+        _logger.info('[model_meta_cache] delta refresh: %d changed, %d removed', len(changed), len(removed))
+    return _Snapshot({mid: merged[mid] for mid in sorted(merged)}, watermarks)
+
+
+def refresh(*, incremental: bool = False) -> Dict[int, dict]:
+    """Reload the catalog and publish a new snapshot.
+
+    With ``incremental=True`` only rows whose change marker moved are
+    re-fetched (see "Delta refresh" above); the call silently degrades to a
+    full reload when no baseline snapshot or marker column is available.
+    """
+    global _snapshot, _cache_loaded_at, _incremental_since_full
+    if _fetch_all is None:
+        raise RuntimeError('model_meta_cache is not configured')
+
+    visible_scopes = _parse_visible_scopes()
+    with _refresh_lock:
+        snapshot = None
+        if incremental and _snapshot.data and _incremental_since_full < _FULL_REFRESH_EVERY:
+            snapshot = _refresh_delta(_snapshot, visible_scopes)
+        if snapshot is None:
+            snapshot = _refresh_full(visible_scopes)
+            _incremental_since_full = 0
+        else:
+            _incremental_since_full += 1
+        with _cache_lock:
+            if snapshot is not _snapshot:
+                # Full reloads that return identical rows keep the version so
+                # payloads derived from it stay valid.
+                unchanged = snapshot.data == _snapshot.data
+                snapshot.version = _snapshot.version + (0 if unchanged else 1)
+                changed = not unchanged
+                _snapshot = snapshot
+            else:
+                changed = False
+            _cache_loaded_at = time.time()
+    if changed:
+        _run_refresh_hooks(snapshot.version)
+    return snapshot.data
+
+
+def register_refresh_hook(hook: Callable[[int], None]) -> None:
+    """Register a callback run (with the new version) after a changed snapshot is published."""
+    if not callable(hook):
+        return
+    with _cache_lock:
+        if hook not in _refresh_hooks:
+            _refresh_hooks.append(hook)
+
+
+def _run_refresh_hooks(version: int) -> None:
+    with _cache_lock:
+        hooks = list(_refresh_hooks)
+    for hook in hooks:
+        try:
+            hook(version)
+        except Exception:
+            if _logger:
+                _logger.exception('model_meta_cache refresh hook failed')
+
+
+def _background_refresh() -> None:
+    global _refresh_inflight, _refresh_again, _full_requested, _cache_loaded_at
+    while True:
+        with _cache_lock:
+            full = _full_requested
+            _full_requested = False
+        try:
+            refresh(incremental=not full)
+        except Exception:
+            if _logger:
+                _logger.exception('model_meta_cache background refresh failed')
+            # Keep serving the stale snapshot; retry after another TTL.
+            with _cache_lock:
+                _cache_loaded_at = time.time()
+        with _cache_lock:
+            if _refresh_again:
+                _refresh_again = False
+                continue
+            _refresh_inflight = False
+            return
+
+
+def refresh_async(*, rerun_if_running: bool = False, full: bool = False) -> bool:
+    """Start a background reload unless one is already running.
+
+    Readers keep getting the current snapshot until the new one is swapped
+    in.  Background reloads are incremental unless ``full`` is requested.
+    Returns True if a reload was started by this call.
+    """
+    global _refresh_inflight, _refresh_again, _full_requested
     with _cache_lock:
-        global _cache_data, _model_ids_by_brand_model, _cache_loaded_at
-        _cache_data = data
-        # One model_id can be indexed by both zh/en brand keys; keep the lookup list unique.
-        _model_ids_by_brand_model = {
-            key: sorted(set(model_ids))
-            for key, model_ids in ids_by_brand_model.items()
-        }
-        _cache_loaded_at = time.time()
-    return {mid: dict(meta) for mid, meta in data.items()}
+        if full:
+            _full_requested = True
+        if _refresh_inflight:
+            # An explicit trigger (e.g. a cache event) must not be absorbed by a
+            # reload that may have read the DB before the triggering change.
+            if rerun_if_running:
+                _refresh_again = True
+            return False
+        _refresh_inflight = True
+    try:
+        threading.Thread(target=_background_refresh, daemon=True, name='model-meta-refresh').start()
+    except Exception:
+        with _cache_lock:
+            _refresh_inflight = False
+        raise
+    return True
 
 
 def _ensure_loaded(force_refresh: bool = False) -> None:
+    """Make sure a snapshot exists.
+
+    Stale-while-revalidate: once a snapshot is loaded, an expired TTL only
+    schedules a single background reload and the caller proceeds with the
+    stale data.  The first load and explicit ``force_refresh`` stay synchronous.
+    """
     global _cache_loaded_at
     now = time.time()
-    if not force_refresh:
-        with _cache_lock:
-            if not _cache_expired(now):
-                return
+    if not force_refresh and not _cache_expired(now):
+        return
+    if not force_refresh and _snapshot.data:
+        refresh_async()
+        return
     try:
         refresh()
     except Exception:
@@ -159,14 +696,14 @@ def _ensure_loaded(force_refresh: bool = False) -> None:
         # Keep stale cache (if any) and back off so we don't hammer DB on every request.
         with _cache_lock:
             _cache_loaded_at = time.time()
-            has_data = bool(_cache_data)
-        if has_data:
+        if _snapshot.data:
             return
         raise
 
 
 def invalidate() -> None:
-    """Immediately expire the in-memory cache so the next read triggers a fresh DB load.
+    """Immediately expire the in-memory cache so the next read triggers a fresh DB load
+    (in the background when a snapshot already exists).
 
     This is used by the visibility-refresh path so that admin changes to
     is_valid or visibility_scope are reflected without waiting for the TTL.
@@ -175,15 +712,17 @@ def invalidate() -> None:
         global _cache_loaded_at
         _cache_loaded_at = 0.0
 
+# Getters read the current snapshot reference without locking and return the
+# frozen entries themselves (no per-call copies).  Callers that need to modify
+# an entry must copy it with dict(meta).
+
 def get_model_meta(model_id: int, *, force_refresh: bool = False) -> dict | None:
     try:
         model_id = int(model_id)
     except (TypeError, ValueError):
         return None
     _ensure_loaded(force_refresh=force_refresh)
-    with _cache_lock:
-        meta = _cache_data.get(model_id)
-        return dict(meta) if isinstance(meta, dict) else None
+    return _snapshot.data.get(model_id)
 
 
 def get_many_model_meta(model_ids, *, force_refresh: bool = False) -> Dict[int, dict]:
@@ -194,28 +733,75 @@ def get_many_model_meta(model_ids, *, force_refresh: bool = False) -> Dict[int,
         except (TypeError, ValueError):
             continue
     _ensure_loaded(force_refresh=force_refresh)
-    with _cache_lock:
-        return {
-            model_id: dict(_cache_data[model_id])
-            for model_id in wanted
-            if isinstance(_cache_data.get(model_id), dict)
-        }
+    data = _snapshot.data
+    return {
+        model_id: data[model_id]
+        for model_id in wanted
+        if model_id in data
+    }
 
 
 def get_all_model_meta(*, force_refresh: bool = False) -> Dict[int, dict]:
+    """Return the whole catalog as a read-only mapping (the snapshot itself)."""
     _ensure_loaded(force_refresh=force_refresh)
-    with _cache_lock:
-        return {model_id: dict(meta) for model_id, meta in _cache_data.items()}
+    return _snapshot.data
 
 
 def get_all_model_ids(*, force_refresh: bool = False) -> List[int]:
     _ensure_loaded(force_refresh=force_refresh)
-    with _cache_lock:
-        return list(_cache_data.keys())
+    return list(_snapshot.model_ids)
 
 
 def get_model_ids_for_brand_model(brand_name_zh: str, model_name: str, *, force_refresh: bool = False) -> List[int]:
     _ensure_loaded(force_refresh=force_refresh)
     key = _brand_model_key(brand_name_zh, model_name)
-    with _cache_lock:
-        return list(_model_ids_by_brand_model.get(key) or [])
+    return list(_snapshot.ids_by_brand_model.get(key) or ())
+
+
+def get_model_ids_for_brand(brand_id: int, *, force_refresh: bool = False) -> Tuple[int, ...]:
+    """Model ids of one brand, ordered by (model_name, model_id)."""
+    _ensure_loaded(force_refresh=force_refresh)
+    return _snapshot.ids_by_brand.get(int(brand_id)) or ()
+
+
+def get_filter_index(*, force_refresh: bool = False) -> ModelFilterIndex:
+    """Return the inverted attribute index for the current cache generation.
+
+    The index is immutable once built; callers may hold on to it for the
+    duration of a request without locking.
+    """
+    _ensure_loaded(force_refresh=force_refresh)
+    return _snapshot.filter_index
+
+
+def get_suggest_index(*, force_refresh: bool = False) -> ModelSuggestIndex:
+    """Return the name n-gram index for the current cache generation."""
+    _ensure_loaded(force_refresh=force_refresh)
+    return _snapshot.suggest_index
+
+
+def get_snapshot_digest(*, force_refresh: bool = False) -> str:
+    """Return a hash of the current snapshot's content.
+
+    Unlike the version, which counts refreshes in this process, the digest is
+    the same in every worker that loaded the same rows, so artefacts shared
+    between workers can record which meta they were built from.
+    """
+    _ensure_loaded(force_refresh=force_refresh)
+    snapshot = _snapshot
+    if snapshot.digest is None:
+        h = hashlib.sha1()
+        for model_id in sorted(snapshot.data):
+            h.update(repr((model_id, sorted(snapshot.data[model_id].items()))).encode('utf-8'))
+        snapshot.digest = h.hexdigest()
+    return snapshot.digest
+
+
+def get_snapshot_version(*, force_refresh: bool = False) -> int:
+    """Return the generation number of the current snapshot.
+
+    It changes only when a refresh publishes different data, so derived
+    payloads can be keyed on it.
+    """
+    _ensure_loaded(force_refresh=force_refresh)
+    return _snapshot.version
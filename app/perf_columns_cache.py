@@ -0,0 +1,526 @@
+"""Per-condition columnar store of effective values for /api/search_fans.
+
+For every working condition the store keeps one row per model that has valid
+performance data: the raw anchor points plus the unified PCHIP fits loaded
+through ``perf_model_service``.  The parts of the "raw first, fit otherwise"
+rule that do not depend on the user's limit value (domain bounds, peak point,
+best point at the domain top, max-rpm noise) are precomputed into numpy
+columns when the condition is built, and the fits are packed into one
+``PchipStack`` per axis.  Effective values for a given (axis, limit) are
+evaluated once over the whole condition as array operations and memoised, so
+a search is a candidate mask, vector compares and a top-k selection with no
+per-request SQL or perf-file I/O.
+
+Conditions are built in the background: ``warm_async`` at startup, and a
+search for a condition that is not built yet starts the build and waits for
+it only up to ``cold_wait_sec`` before ``ColumnsNotReady`` is raised.  They
+are rebuilt after a TTL or when ``invalidate`` is called (cache events after a
+model's perf data changed); readers keep the previous columns until the
+rebuild has been swapped in.
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.curves import perf_model_service
+from app.curves.pchip_cache import env_key_for_perf
+from app.curves.pchip_stack import PchipStack
+
+_DEFAULT_TTL_SEC = 600
+_DEFAULT_COLD_WAIT_SEC = 5.0
+_EVAL_CACHE_SIZE = 32  # memoised (axis, limit) evaluations per condition
+
+AXES = ('rpm', 'noise_db')
+SOURCE_RAW = 0
+SOURCE_FIT = 1
+_SOURCE_NAMES = ('raw', 'fit')
+
+_fetch_all: Callable | None = None
+_logger = None
+_ttl_sec = _DEFAULT_TTL_SEC
+_cold_wait_sec = _DEFAULT_COLD_WAIT_SEC
+_cache_lock = threading.Lock()
+_build_finished = threading.Condition(_cache_lock)  # notified after every background build attempt
+_columns: Dict[int, 'ConditionColumns'] = {}
+_stale: set = set()            # condition ids invalidated since their last build
+_refresh_inflight: set = set()
+_refresh_again: set = set()    # rebuild requested while one was already running
+_build_seq = 0
+
+
+class ColumnsNotReady(RuntimeError):
+    """The condition's columns are still being built in the background."""
+
+
+def setup(fetch_all: Callable, logger=None, ttl_sec: int = _DEFAULT_TTL_SEC,
+          cold_wait_sec: float = _DEFAULT_COLD_WAIT_SEC) -> None:
+    global _fetch_all, _logger, _ttl_sec, _cold_wait_sec
+    _fetch_all = fetch_all
+    _logger = logger
+    _ttl_sec = max(1, int(ttl_sec or _DEFAULT_TTL_SEC))
+    _cold_wait_sec = max(0.0, float(cold_wait_sec))
+
+
+def _as_float(value) -> float:
+    """Finite float or NaN."""
+    try:
+        f = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return f if math.isfinite(f) else math.nan
+
+
+def _none_if_nan(value) -> float | None:
+    f = float(value)
+    return None if math.isnan(f) else f
+
+
+class EffectiveValues:
+    """Effective point of every model in a condition for one (axis, limit).
+
+    ``valid`` marks rows that produced a result; the other arrays are aligned
+    with ``ConditionColumns.model_ids`` and hold NaN where there is none.
+    """
+
+    __slots__ = ('axis', 'x', 'airflow', 'companion', 'source', 'valid')
+
+    def __init__(self, axis: str, x, airflow, companion, source):
+        self.axis = axis
+        self.x = x
+        self.airflow = airflow
+        self.companion = companion
+        self.source = source
+        self.valid = np.isfinite(airflow)
+
+
+class _AxisColumns:
+    """Limit-independent columns of one axis (x = rpm or noise_db)."""
+
+    __slots__ = ('x_min', 'x_max', 'peak', 'top', 'points', 'fit', 'companion',
+                 'pt_owner', 'pt_x', 'pt_y', 'pt_c', 'fit_pack', 'comp_pack')
+
+    def __init__(self, n: int):
+        self.x_min = np.full(n, np.nan)
+        self.x_max = np.full(n, np.nan)
+        # (x, airflow, companion) of the highest raw airflow / of the best raw
+        # point at the top of the raw domain.
+        self.peak = np.full((n, 3), np.nan)
+        self.top = np.full((n, 3), np.nan)
+        self.points: List[Tuple[tuple, tuple, tuple]] = [((), (), ())] * n
+        self.fit: List[Optional[dict]] = [None] * n
+        self.companion: List[Optional[dict]] = [None] * n
+
+    def pack(self) -> None:
+        """Flatten the raw points and stack the fits once all rows are filled."""
+        lengths = [len(p[0]) for p in self.points]
+        self.pt_owner = np.repeat(np.arange(len(self.points), dtype=np.int64), lengths)
+        self.pt_x, self.pt_y, self.pt_c = (
+            np.fromiter((v for p in self.points for v in p[k]), dtype=float, count=int(sum(lengths)))
+            for k in range(3)
+        )
+        self.fit_pack = _FitPack(self.fit)
+        self.comp_pack = _FitPack(self.companion)
+
+
+class _FitPack:
+    """One optional PCHIP model per row, evaluated for many rows at once.
+
+    Matches ``eval_pchip`` on the model clamped to its ``x0``/``x1``: rows
+    whose model cannot be evaluated (missing, malformed, no knots) give NaN,
+    single-knot models are constants and the rest go through one
+    ``PchipStack``.
+    """
+
+    __slots__ = ('stack', 'row', 'const', 'lo', 'hi')
+
+    def __init__(self, models: List[Optional[dict]]):
+        n = len(models)
+        self.row = np.full(n, -1, dtype=np.int64)
+        self.const = np.full(n, np.nan)
+        # x0 / x1 clamp bounds; NaN where the model has none (the limit is kept).
+        self.lo = np.full(n, np.nan)
+        self.hi = np.full(n, np.nan)
+        stacked = []
+        for i, model in enumerate(models):
+            if model is None:
+                continue
+            try:
+                xs, ys, ms = (tuple(float(v) for v in model[k]) for k in ('x', 'y', 'm'))
+                lo = float(model.get('x0') or math.nan)
+                hi = float(model.get('x1') or math.nan)
+            except Exception:
+                continue
+            if not xs or len(ys) < len(xs) or (len(xs) > 1 and len(ms) < len(xs)):
+                continue
+            self.lo[i], self.hi[i] = lo, hi
+            if len(xs) == 1:
+                self.const[i] = ys[0]
+            else:
+                self.row[i] = len(stacked)
+                stacked.append({'x': xs, 'y': ys[:len(xs)], 'm': ms[:len(xs)]})
+        self.stack = PchipStack(stacked)
+
+    def usable(self):
+        return (self.row >= 0) | ~np.isnan(self.const)
+
+    def clamp(self, rows, lv: float):
+        """Limit ``lv`` clamped to each row's [x0, x1]."""
+        lo = np.where(np.isnan(self.lo[rows]), lv, self.lo[rows])
+        hi = np.where(np.isnan(self.hi[rows]), lv, self.hi[rows])
+        return np.maximum(lo, np.minimum(lv, hi))
+
+    def eval(self, rows, q):
+        """Finite value of each row's model at ``q`` (eval_pchip clamps to the knots), else NaN."""
+        out = self.const[rows].copy()
+        sel = self.row[rows]
+        stacked = sel >= 0
+        if stacked.any():
+            idx = sel[stacked]
+            qs = np.clip(q[stacked], self.stack.x_min[idx], self.stack.x_max[idx])
+            with np.errstate(all='ignore'):
+                out[stacked] = self.stack.eval_pairs(idx, qs)
+        out[~np.isfinite(out)] = np.nan
+        return out
+
+
+class ConditionColumns:
+    """Immutable columnar view of one condition; replaced wholesale on rebuild."""
+
+    def __init__(self, condition_id: int, model_ids: List[int], max_noise_db: list,
+                 axes: Dict[str, _AxisColumns], signature, version: int):
+        self.condition_id = condition_id
+        self.model_ids = np.asarray(model_ids, dtype=np.int64)
+        self.max_noise_db = tuple(max_noise_db)
+        self.axes = axes
+        self.signature = signature
+        self.version = version
+        self.built_at = time.time()
+        self._evals: 'OrderedDict[tuple, EffectiveValues]' = OrderedDict()
+        self._evals_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return int(self.model_ids.size)
+
+    def mask_for(self, model_ids: Iterable[int]):
+        ids = np.fromiter((int(m) for m in model_ids), dtype=np.int64)
+        return np.isin(self.model_ids, ids, assume_unique=False)
+
+    def effective(self, axis: str, limit_value: float | None) -> EffectiveValues:
+        ax = 'noise_db' if axis == 'noise' else axis
+        key = (ax, None if limit_value is None else float(limit_value))
+        with self._evals_lock:
+            hit = self._evals.get(key)
+            if hit is not None:
+                self._evals.move_to_end(key)
+                return hit
+        res = self._evaluate(ax, key[1])
+        with self._evals_lock:
+            self._evals[key] = res
+            self._evals.move_to_end(key)
+            while len(self._evals) > _EVAL_CACHE_SIZE:
+                self._evals.popitem(last=False)
+        return res
+
+    def _evaluate(self, ax: str, lv: float | None) -> EffectiveValues:
+        cols = self.axes[ax]
+        n = len(self)
+        if lv is None:
+            # Unlimited: the raw point with the highest airflow.
+            return EffectiveValues(ax, cols.peak[:, 0].copy(), cols.peak[:, 1].copy(),
+                                   cols.peak[:, 2].copy(), np.full(n, SOURCE_RAW, dtype=np.int8))
+
+        x = np.full(n, np.nan)
+        y = np.full(n, np.nan)
+        comp = np.full(n, np.nan)
+        source = np.full(n, SOURCE_RAW, dtype=np.int8)
+        with np.errstate(invalid='ignore'):
+            in_domain = lv >= cols.x_min - 1e-9
+            at_top = in_domain & (lv >= cols.x_max - 1e-9)
+        x[at_top], y[at_top], comp[at_top] = cols.top[at_top].T
+        # Inside the raw domain: a raw point equal to the limit wins (noise
+        # allows 0.05 dB; the first such point in row order), otherwise the
+        # unified PCHIP fit is evaluated, otherwise the raw point closest to
+        # the limit is used.  All three steps run over the whole condition.
+        inside = in_domain & ~at_top
+        owner = cols.pt_owner
+        with np.errstate(invalid='ignore'):
+            close = (cols.pt_x == lv) if ax != 'noise_db' else (np.abs(cols.pt_x - lv) <= 0.05)
+        need = inside.copy()
+        hits = np.flatnonzero(inside[owner] & close)
+        if hits.size:
+            rows, first = np.unique(owner[hits], return_index=True)
+            hits = hits[first]
+            x[rows], y[rows], comp[rows] = cols.pt_x[hits], cols.pt_y[hits], cols.pt_c[hits]
+            need[rows] = False
+
+        fit_rows = np.flatnonzero(need & cols.fit_pack.usable())
+        if fit_rows.size:
+            lx = cols.fit_pack.clamp(fit_rows, lv)
+            fy = cols.fit_pack.eval(fit_rows, lx)
+            ok = ~np.isnan(fy)
+            rows, lx = fit_rows[ok], lx[ok]
+            x[rows], y[rows] = lx, fy[ok]
+            source[rows] = SOURCE_FIT
+            comp[rows] = cols.comp_pack.eval(rows, lx)
+            need[rows] = False
+
+        rest = np.flatnonzero(need[owner])
+        if rest.size:
+            # Closest raw point to the limit, first in row order on ties.
+            rest = rest[np.lexsort((rest, np.abs(cols.pt_x[rest] - lv), owner[rest]))]
+            rows, first = np.unique(owner[rest], return_index=True)
+            pts = rest[first]
+            x[rows], y[rows], comp[rows] = cols.pt_x[pts], cols.pt_y[pts], cols.pt_c[pts]
+        return EffectiveValues(ax, x, y, comp, source)
+
+    def rows_in(self, res: EffectiveValues, mask) -> List[int]:
+        """Row indices in ``mask`` that have an effective value (unordered)."""
+        return np.flatnonzero(mask & res.valid).tolist()
+
+    def top_k(self, res: EffectiveValues, mask, k: int | None):
+        """Row indices of the k best rows in ``mask``.
+
+        Ordered by effective airflow, then model_id, both descending — the
+        order the search has always used.
+        """
+        idx = np.flatnonzero(mask & res.valid)
+        vals = res.airflow[idx]
+        if k is not None and 0 < k < idx.size:
+            kth = np.partition(vals, idx.size - k)[idx.size - k]
+            keep = vals >= kth  # ties at the cut are resolved by the sort below
+            idx, vals = idx[keep], vals[keep]
+        order = np.lexsort((-self.model_ids[idx], -vals))
+        return idx[order][:k] if k is not None else idx[order]
+
+    def effective_fields(self, res: EffectiveValues, i: int) -> dict:
+        eff_x = float(res.x[i])
+        comp = _none_if_nan(res.companion[i])
+        if res.axis == 'rpm':
+            eff_rpm, eff_noise_db = eff_x, comp
+        else:
+            eff_rpm, eff_noise_db = comp, eff_x
+        return {
+            'effective_x': eff_x,
+            'effective_airflow': float(res.airflow[i]),
+            'effective_axis': res.axis,
+            'effective_source': _SOURCE_NAMES[int(res.source[i])],
+            'effective_rpm': eff_rpm,
+            'effective_noise_db': eff_noise_db,
+            'max_noise_db': self.max_noise_db[i],
+        }
+
+
+def _axis_points(rows: List[dict], ax: str) -> Tuple[tuple, tuple, tuple]:
+    """Valid (x, airflow, companion) raw points of one axis, in row order."""
+    x_key, comp_key = ('noise_db', 'rpm') if ax == 'noise_db' else ('rpm', 'noise_db')
+    xs, ys, cs = [], [], []
+    for r in rows:
+        xf, yf = _as_float(r.get(x_key)), _as_float(r.get('airflow'))
+        if math.isnan(xf) or math.isnan(yf):
+            continue
+        xs.append(xf)
+        ys.append(yf)
+        cs.append(_as_float(r.get(comp_key)))
+    return tuple(xs), tuple(ys), tuple(cs)
+
+
+def _fill_axis(cols: _AxisColumns, i: int, points, mdl_fit, mdl_companion) -> None:
+    xs, ys, cs = points
+    cols.points[i] = points
+    # Empty models count as missing, so the raw-point fallback applies.
+    cols.fit[i] = mdl_fit if isinstance(mdl_fit, dict) and mdl_fit else None
+    cols.companion[i] = mdl_companion if isinstance(mdl_companion, dict) and mdl_companion else None
+    if not xs:
+        return
+    x_max = max(xs)
+    cols.x_min[i] = min(xs)
+    cols.x_max[i] = x_max
+    peak = max(range(len(ys)), key=lambda j: ys[j])
+    cols.peak[i] = (xs[peak], ys[peak], cs[peak])
+    top = max((j for j, xv in enumerate(xs) if abs(xv - x_max) < 1e-9), key=lambda j: ys[j])
+    cols.top[i] = (xs[top], ys[top], cs[top])
+
+
+def _build(condition_id: int) -> ConditionColumns:
+    global _build_seq
+    if _fetch_all is None:
+        raise RuntimeError('perf_columns_cache is not configured')
+
+    rows = _fetch_all("""
+        SELECT model_id, rpm, airflow_cfm AS airflow, noise_db
+        FROM fan_performance_data
+        WHERE is_valid = 1 AND condition_id = :cid
+        ORDER BY model_id, rpm
+    """, {'cid': condition_id})
+
+    groups: Dict[int, List[dict]] = {}
+    for r in rows:
+        try:
+            mid = int(r['model_id'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        groups.setdefault(mid, []).append({'rpm': r.get('rpm'), 'noise_db': r.get('noise_db'),
+                                           'airflow': r.get('airflow')})
+
+    model_ids = sorted(groups)
+    models = perf_model_service.get_perf_models([(mid, condition_id) for mid in model_ids]) if model_ids else {}
+
+    n = len(model_ids)
+    axes = {ax: _AxisColumns(n) for ax in AXES}
+    max_noise_db: list = [None] * n
+    sig_parts = []
+    for i, mid in enumerate(model_ids):
+        series = groups[mid]
+        # Noise at the highest tested rpm (first row wins on equal rpm).
+        max_rpm = None
+        for r in series:
+            try:
+                if r['rpm'] is not None and (max_rpm is None or int(r['rpm']) > max_rpm):
+                    max_rpm = int(r['rpm'])
+                    max_noise_db[i] = r.get('noise_db')
+            except (TypeError, ValueError):
+                pass
+        unified = models.get(f'{mid}_{condition_id}') or {}
+        p = unified.get('pchip') or {}
+        _fill_axis(axes['rpm'], i, _axis_points(series, 'rpm'), p.get('rpm_to_airflow'), p.get('rpm_to_noise_db'))
+        _fill_axis(axes['noise_db'], i, _axis_points(series, 'noise_db'), p.get('noise_to_airflow'), p.get('noise_to_rpm'))
+        sig_parts.append((mid, axes['rpm'].points[i], axes['noise_db'].points[i],
+                          (unified.get('meta') or {}).get('data_hash')))
+
+    for cols in axes.values():
+        cols.pack()
+    # repr() keeps NaN stable (hash(nan) is per-object).
+    signature = hashlib.sha1(repr((sig_parts, env_key_for_perf())).encode('utf-8')).hexdigest()
+    with _cache_lock:
+        prev = _columns.get(condition_id)
+        if prev is not None and prev.signature == signature:
+            version = prev.version
+        else:
+            _build_seq += 1
+            version = _build_seq
+    return ConditionColumns(condition_id, model_ids, max_noise_db, axes, signature, version)
+
+
+def refresh(condition_id: int) -> ConditionColumns:
+    condition_id = int(condition_id)
+    with _cache_lock:
+        _stale.discard(condition_id)
+    cols = _build(condition_id)
+    with _cache_lock:
+        prev = _columns.get(condition_id)
+        if prev is not None and prev.signature == cols.signature:
+            # Unchanged data: keep the old object (and its memoised evaluations),
+            # only restart its TTL.
+            prev.built_at = cols.built_at
+            return prev
+        _columns[condition_id] = cols
+    return cols
+
+
+def _background_refresh(condition_id: int) -> None:
+    while True:
+        try:
+            refresh(condition_id)
+        except Exception:
+            if _logger:
+                _logger.exception('perf_columns_cache background refresh failed (condition_id=%s)', condition_id)
+            # Keep serving the stale columns; retry after another TTL.
+            with _cache_lock:
+                prev = _columns.get(condition_id)
+                if prev is not None:
+                    prev.built_at = time.time()
+        with _cache_lock:
+            _build_finished.notify_all()
+            if condition_id in _refresh_again:
+                _refresh_again.discard(condition_id)
+                continue
+            _refresh_inflight.discard(condition_id)
+            return
+
+
+def refresh_async(condition_id: int, *, rerun_if_running: bool = False) -> bool:
+    """Rebuild one condition in the background unless a rebuild is already running."""
+    condition_id = int(condition_id)
+    with _cache_lock:
+        if condition_id in _refresh_inflight:
+            if rerun_if_running:
+                _refresh_again.add(condition_id)
+            return False
+        _refresh_inflight.add(condition_id)
+    try:
+        threading.Thread(target=_background_refresh, args=(condition_id,), daemon=True,
+                         name='perf-columns-refresh').start()
+    except Exception:
+        with _cache_lock:
+            _refresh_inflight.discard(condition_id)
+        raise
+    return True
+
+
+def warm_async(condition_ids: Iterable[int]) -> None:
+    """Build the given conditions one after another in a background thread."""
+    ids = [int(cid) for cid in condition_ids]
+
+    def _run():
+        for cid in ids:
+            with _cache_lock:
+                if cid in _columns or cid in _refresh_inflight:
+                    continue
+                _refresh_inflight.add(cid)
+            _background_refresh(cid)
+
+    threading.Thread(target=_run, daemon=True, name='perf-columns-warm').start()
+
+
+def get_condition_columns(condition_id: int) -> ConditionColumns:
+    """Columns of one condition (stale-while-revalidate after the first build).
+
+    A condition that is not built yet is built in the background; the caller
+    waits for it up to ``cold_wait_sec`` and gets ``ColumnsNotReady`` after that.
+    """
+    condition_id = int(condition_id)
+    cols = _columns.get(condition_id)
+    if cols is None:
+        refresh_async(condition_id)
+        deadline = time.monotonic() + _cold_wait_sec
+        with _cache_lock:
+            while condition_id not in _columns and condition_id in _refresh_inflight:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                _build_finished.wait(left)
+            cols = _columns.get(condition_id)
+        if cols is None:
+            raise ColumnsNotReady(condition_id)
+        return cols
+    if condition_id in _stale or time.time() - cols.built_at >= _ttl_sec:
+        refresh_async(condition_id)
+    return cols
+
+
+def get_version(condition_id: int) -> int:
+    """Build version of a condition's columns (0 when not built yet).
+
+    Only changes when a rebuild saw different perf data.
+    """
+    cols = _columns.get(int(condition_id))
+    return cols.version if cols is not None else 0
+
+
+def invalidate(condition_id: int | None = None) -> None:
+    """Mark one condition (or all) stale.
+
+    Conditions already built are rebuilt in the background right away so the
+    next search sees the new data as soon as possible.
+    """
+    with _cache_lock:
+        targets = [int(condition_id)] if condition_id is not None else list(_columns)
+        built = [cid for cid in targets if cid in _columns]
+        _stale.update(targets)
+    for cid in built:
+        refresh_async(cid, rerun_if_running=True)
@@ -0,0 +1,256 @@
+"""Fixed-layout binary snapshot of the scoring tables, mmap'd read-only by every worker.
+
+The worker that materializes the model-score table (see
+``scoring_system._materialize_model_scores``) also publishes it here as
+dense condition x model arrays of raw scores, sampled point counts and
+normalized scores.  Other gunicorn workers answer model-score lookups from
+the mapped file instead of building their own score table; pages are shared
+through the OS page cache.  Only the score table is shared: the denom cache
+(baselines, grids, raw_score_by_model) is still loaded per worker, since the
+incremental scoring paths read it.
+
+Layout (little-endian, every section 8-byte aligned)::
+
+    header        magic, layout version, condition/model counts,
+                  generation, written_at, denom_written_at, fingerprint sha1
+    condition_ids int64 x C
+    model_ids     int64 x M (ascending)
+    composite     int32 x M            (-1 = no score)
+    score_total   int32 x C x M        (-1 = no score)
+    raw_score     float64 x C x M      (NaN = no score)
+    points        int32 x C x M
+
+Files are replaced atomically, so a mapped snapshot stays valid while a newer
+generation is written; readers notice the new file on their next (throttled)
+check and remap.
+"""
+import hashlib
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+_MAGIC = b'FCSCORE1'
+_LAYOUT_VERSION = 2
+_HEADER = struct.Struct('<8sIIIQdd20s')
+_RECHECK_SEC = 1.0
+
+_lock = threading.Lock()
+_current: Dict[str, 'ScoreArrays'] = {}        # path -> mapped snapshot
+_checked: Dict[str, tuple] = {}                 # path -> (checked_at, stat key)
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _fingerprint_digest(fingerprint: str) -> bytes:
+    return hashlib.sha1(fingerprint.encode('utf-8')).digest()
+
+
+def _float_or_nan(value) -> float:
+    try:
+        f = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return f if math.isfinite(f) else math.nan
+
+
+def _section_sizes(n_cond: int, n_models: int) -> list:
+    return [
+        8 * n_cond,
+        8 * n_models,
+        4 * n_models,
+        4 * n_cond * n_models,
+        8 * n_cond * n_models,
+        4 * n_cond * n_models,
+    ]
+
+
+def _read_generation(path: str) -> int:
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(_HEADER.size)
+        if len(head) == _HEADER.size:
+            fields = _HEADER.unpack(head)
+            if fields[0] == _MAGIC and fields[1] == _LAYOUT_VERSION:
+                return int(fields[4])
+    except OSError:
+        pass
+    return 0
+
+
+def publish(
+    path: str,
+    fingerprint: str,
+    denom_written_at: float,
+    condition_ids: Iterable[int],
+    table: Dict[int, dict],
+) -> int:
+    """Write a new snapshot generation to ``path`` atomically; returns the generation."""
+    cids = [int(c) for c in condition_ids]
+    cid_pos = {cid: i for i, cid in enumerate(cids)}
+    model_ids = np.array(sorted(int(m) for m in table), dtype='<i8')
+    n_cond, n_models = len(cids), int(model_ids.size)
+
+    composite = np.full(n_models, -1, dtype='<i4')
+    score_total = np.full((n_cond, n_models), -1, dtype='<i4')
+    raw_score = np.full((n_cond, n_models), np.nan, dtype='<f8')
+    points = np.zeros((n_cond, n_models), dtype='<i4')
+    for j, mid in enumerate(model_ids.tolist()):
+        entry = table[mid]
+        if entry.get('composite_score') is not None:
+            composite[j] = int(entry['composite_score'])
+        for cid, sc in (entry.get('conditions') or {}).items():
+            i = cid_pos.get(int(cid))
+            if i is None:
+                continue
+            score_total[i, j] = int(sc['score_total'])
+            raw_score[i, j] = _float_or_nan(sc.get('curve_raw_score'))
+            points[i, j] = int(sc.get('curve_valid_points') or 0)
+
+    generation = _read_generation(path) + 1
+    header = _HEADER.pack(
+        _MAGIC, _LAYOUT_VERSION, n_cond, n_models,
+        generation, time.time(), float(denom_written_at or 0.0),
+        _fingerprint_digest(fingerprint),
+    )
+    sections = [
+        np.asarray(cids, dtype='<i8').tobytes(),
+        model_ids.tobytes(),
+        composite.tobytes(),
+        score_total.tobytes(),
+        raw_score.tobytes(),
+        points.tobytes(),
+    ]
+
+    d = os.path.dirname(path)
+    os.makedirs(d, exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=d, suffix='.tmp')
+    try:
+        with os.fdopen(tmp_fd, 'wb') as f:
+            f.write(header)
+            f.write(b'\0' * (_align(len(header)) - len(header)))
+            for blob in sections:
+                f.write(blob)
+                f.write(b'\0' * (_align(len(blob)) - len(blob)))
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return generation
+
+
+class ScoreArrays:
+    """Read-only numpy views over one mapped snapshot generation."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, layout, n_cond, n_models, self.generation, self.written_at,
+         self.denom_written_at, self.fingerprint_digest) = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or layout != _LAYOUT_VERSION:
+            raise ValueError(f'unsupported score arrays file: {path!r}')
+        sizes = _section_sizes(n_cond, n_models)
+        if len(self._mm) < _align(_HEADER.size) + sum(_align(s) for s in sizes):
+            raise ValueError(f'truncated score arrays file: {path!r}')
+        buf = memoryview(self._mm)
+        pos = _align(_HEADER.size)
+        views = []
+        for size in sizes:
+            views.append(buf[pos:pos + size])
+            pos += _align(size)
+        self.condition_ids = np.frombuffer(views[0], dtype='<i8')
+        self.model_ids = np.frombuffer(views[1], dtype='<i8')
+        self.composite = np.frombuffer(views[2], dtype='<i4')
+        self.score_total = np.frombuffer(views[3], dtype='<i4').reshape(n_cond, n_models)
+        self.raw_score = np.frombuffer(views[4], dtype='<f8').reshape(n_cond, n_models)
+        self.points = np.frombuffer(views[5], dtype='<i4').reshape(n_cond, n_models)
+        self._cid_pos = {int(c): i for i, c in enumerate(self.condition_ids.tolist())}
+        self._updated_at = datetime.fromtimestamp(self.written_at, timezone.utc).isoformat(timespec='seconds')
+        self.verified_at = time.time()
+
+    def matches(self, fingerprint: str) -> bool:
+        return self.fingerprint_digest == _fingerprint_digest(fingerprint)
+
+    def _model_pos(self, model_id: int) -> int:
+        j = int(np.searchsorted(self.model_ids, model_id))
+        if j < self.model_ids.size and int(self.model_ids[j]) == model_id:
+            return j
+        return -1
+
+    def model_entry(self, model_id: int) -> Optional[dict]:
+        """Model-score cache entry for ``model_id`` (same shape as the in-process table)."""
+        j = self._model_pos(int(model_id))
+        if j < 0:
+            return None
+        conditions = {}
+        for cid, i in self._cid_pos.items():
+            total = int(self.score_total[i, j])
+            if total < 0:
+                continue
+            conditions[cid] = {
+                'score_total': total,
+                'curve_raw_score': float(self.raw_score[i, j]),
+                'curve_valid_points': int(self.points[i, j]),
+            }
+        if not conditions:
+            return None
+        composite = int(self.composite[j])
+        return {
+            'conditions': conditions,
+            'composite_score': composite if composite >= 0 else None,
+            'updated_at': self._updated_at,
+            'cached_at': self.verified_at,
+        }
+
+
+def get(path: str) -> Optional[ScoreArrays]:
+    """Currently mapped snapshot for ``path``, remapping when a newer generation appeared.
+
+    The file is stat'ed at most once per _RECHECK_SEC; a replaced file (new inode
+    or mtime) whose header carries a different generation is mapped afresh.  The
+    previous mapping is left to the garbage collector since callers may still
+    hold views into it.
+    """
+    now = time.time()
+    with _lock:
+        current = _current.get(path)
+        checked = _checked.get(path)
+        if checked is not None and now - checked[0] < _RECHECK_SEC:
+            return current
+    try:
+        st = os.stat(path)
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None
+    with _lock:
+        current = _current.get(path)
+        prev = _checked.get(path)
+        _checked[path] = (now, key)
+        if key is None:
+            _current.pop(path, None)
+            return None
+        if current is not None and prev is not None and prev[1] == key:
+            current.verified_at = now
+            return current
+    if current is not None and _read_generation(path) == current.generation:
+        current.verified_at = now
+        return current
+    try:
+        arrays = ScoreArrays(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    with _lock:
+        _current[path] = arrays
+    return arrays
@@ -15,19 +15,27 @@ import math
 import time
 import threading
 import tempfile
+import bisect
+import hashlib
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Dict, List, Any, Callable
 
+import numpy as np
 from sqlalchemy import exc as sa_exc
 
 from app.curves.pchip_cache import eval_pchip, perf_interp_contract
+from app.curves.pchip_stack import PchipStack as _PchipStack
 from app import like_rank_cache
 from app import lighting_like_cache
+from app import heat_rollup
 from app.curves.lock_utils import startup_lock
 from app.audio_services import spectrum_reader
 from app import model_meta_cache
+from app import score_arrays
+from app import cache_event_bus
 
 # =========================================
 # Module-level state — injected via setup()
@@ -211,6 +219,10 @@ BASELINE_VALID_UPPER_MIN_RATIO: float = _parse_bounded_float_env(
 
 BASELINE_DB_STEP = _parse_bounded_float_env('BASELINE_DB_STEP', 1.0, min_value=0.1, max_value=5.0)
 MAX_BASELINE_GRID_POINTS = _parse_bounded_int_env('MAX_BASELINE_GRID_POINTS', 400, min_value=10, max_value=5000)
+# A refreshed baseline fit whose intercept and slope both differ from the previous
+# fit by at most this much keeps the previous parameters, so the equal-airflow grid
+# and every raw score in the condition stay bit-identical across refreshes.
+BASELINE_FIT_REUSE_TOL = _parse_bounded_float_env('BASELINE_FIT_REUSE_TOL', 1e-6, min_value=0.0, max_value=1.0)
 
 # =========================================
 # Equal-airflow sampling
@@ -301,9 +313,25 @@ _cond_denom_lock = threading.Lock()
 
 _model_score_cache: Dict[int, dict] = {}
 _model_score_cache_lock = threading.Lock()
-
+# Bumped (under _model_score_cache_lock) whenever cached scores change, so
+# payloads that embed scores can be keyed on it.
+_model_score_generation = 0
+# Bumped only when the table as a whole changes (rebuilt, adopted or bulk-loaded);
+# single-model changes are reported to the model-scores hooks with their ids.
+_model_score_table_generation = 0
+
+# Model ids queued on (or running in) the single score-refresh worker.
 _model_score_inflight: set = set()
 _model_score_inflight_lock = threading.Lock()
+_model_score_refresh_executor = None
+_MODEL_SCORE_REFRESH_MAX_PENDING = max(1, int(os.getenv('MODEL_SCORE_REFRESH_MAX_PENDING') or '256'))
+# True once _model_score_cache holds the full table for the current denom cache;
+# a lookup miss then means the model has no score rather than "not computed yet".
+_model_score_table_ready = False
+_model_score_materialize_lock = threading.Lock()
+# written_at of the denom cache file this process last saved or loaded; a shared
+# score-arrays snapshot older than this does not describe the current denom.
+_denom_written_at = 0.0
 
 _model_score_disk_loaded = False
 _model_score_disk_loaded_lock = threading.Lock()
@@ -318,16 +346,24 @@ _RANKINGS_V2_DISPLAY_LIMIT = 10
 
 _rankings_v2_cache: dict = {}
 _rankings_v2_cache_lock = threading.Lock()
+# Bumped (under _rankings_v2_cache_lock) whenever the cached rankings entry is
+# replaced or dropped, so pre-encoded rankings payloads can be keyed on it.
+_rankings_v2_version = 0
 _RANKINGS_V2_CACHE_TTL_SEC = 600
 
 _rankings_v2_build_lock = threading.Lock()
 _warmup_rankings_inflight = threading.Lock()
 _rankings_warmup_hooks: list[Callable[[dict, str], None]] = []
 _rankings_warmup_hooks_lock = threading.Lock()
+_model_scores_hooks: list[Callable[[str, tuple | None], None]] = []
 _VISIBILITY_DIFF_INCREMENTAL_MAX = 5
+# Upper bound for a waiting visibility refresh to sit out another worker's rebuild.
+_VISIBILITY_SYNC_WAIT_SEC = max(1, int(os.getenv('VISIBILITY_SYNC_WAIT_SEC') or '120'))
+# Visibility changes arrive as cache_event_bus events; the watcher poll is only a
+# safety net for edits made outside the internal endpoint.
 _VISIBLE_MODEL_SET_WATCH_INTERVAL_SEC = max(
     5,
-    int(os.getenv('VISIBLE_MODEL_SET_WATCH_INTERVAL_SEC') or '30'),
+    int(os.getenv('VISIBLE_MODEL_SET_WATCH_INTERVAL_SEC') or '600'),
 )
 
 # =========================================
@@ -398,23 +434,21 @@ def _model_score_cache_path() -> str:
     return os.path.join(_shared_cache_dir(), f'model_score_cache_{safe_key}{_score_cache_suffix()}.json')
 
 
+def _score_arrays_path() -> str:
+    safe_key = ''.join(c for c in _CANONICAL_SCORE_KEY if c.isalnum() or c == '_')
+    return os.path.join(_shared_cache_dir(), f'model_score_arrays_{safe_key}{_score_cache_suffix()}.bin')
+
+
+def _visibility_sync_marker_path() -> str:
+    return os.path.join(_shared_cache_dir(), f'visibility_sync{_score_cache_suffix()}.json')
+
+
 def _json_default(obj):
     if isinstance(obj, Decimal):
         return float(obj)
     raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
 
 
-def _safe_median(values: list[float]) -> float | None:
-    vals = sorted(v for v in values if isinstance(v, (int, float)) and math.isfinite(v))
-    if not vals:
-        return None
-    n = len(vals)
-    m = n // 2
-    if n % 2 == 1:
-        return float(vals[m])
-    return float((vals[m - 1] + vals[m]) / 2.0)
-
-
 def _build_unified_db_grid(min_db: float, max_db: float, step: float) -> list[float]:
     if not (math.isfinite(min_db) and math.isfinite(max_db) and math.isfinite(step) and step > 0):
         return []
@@ -453,8 +487,15 @@ def _build_unified_db_grid(min_db: float, max_db: float, step: float) -> list[fl
     return points
 
 
-def _fit_exponential_baseline(points: list[tuple[float, float]]) -> dict | None:
-    """Fit ln(y)=intercept+slope*x on positive y points."""
+def _fit_exponential_baseline(
+    points: list[tuple[float, float]], previous: dict | None = None
+) -> dict | None:
+    """Fit ln(y)=intercept+slope*x on positive y points.
+
+    The least-squares solution is closed-form, so there is nothing to iterate;
+    ``previous`` (the condition's last fit) is returned unchanged, apart from
+    point_count, when the new parameters are within BASELINE_FIT_REUSE_TOL of it.
+    """
     fit_points = [
         (float(x), float(y))
         for x, y in points
@@ -467,16 +508,26 @@ def _fit_exponential_baseline(points: list[tuple[float, float]]) -> dict | None:
     n = len(fit_points)
     if n < 2:
         return None
-    xs = [p[0] for p in fit_points]
-    lny = [math.log(p[1]) for p in fit_points]
-    x_mean = sum(xs) / n
-    y_mean = sum(lny) / n
-    ss_xx = sum((x - x_mean) ** 2 for x in xs)
+    arr = np.asarray(fit_points, dtype=float)
+    xs = arr[:, 0]
+    lny = np.log(arr[:, 1])
+    dx = xs - xs.mean()
+    ss_xx = float(np.dot(dx, dx))
     if ss_xx <= 0:
         return None
-    ss_xy = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, lny))
-    slope = ss_xy / ss_xx
-    intercept = y_mean - slope * x_mean
+    slope = float(np.dot(dx, lny - lny.mean())) / ss_xx
+    intercept = float(lny.mean()) - slope * float(xs.mean())
+    if previous:
+        try:
+            prev_intercept = float(previous['intercept'])
+            prev_slope = float(previous['slope'])
+        except (KeyError, TypeError, ValueError):
+            prev_intercept = prev_slope = math.nan
+        if (
+            abs(intercept - prev_intercept) <= BASELINE_FIT_REUSE_TOL
+            and abs(slope - prev_slope) <= BASELINE_FIT_REUSE_TOL
+        ):
+            intercept, slope = prev_intercept, prev_slope
     return {
         'intercept': float(intercept),
         'slope': float(slope),
@@ -548,6 +599,37 @@ def _build_equal_airflow_db_grid(
     return result if len(result) == n else []
 
 
+def _median_points(airflow_matrix: np.ndarray, db_grid: list[float],
+                   candidate_min: int) -> list[tuple[float, float, int]]:
+    """(dB, median airflow, coverage) of every grid point covered by enough models.
+
+    ``airflow_matrix`` is (models x grid) with NaN outside each model's domain,
+    as produced by ``_PchipStack.eval_grid``.
+    """
+    coverage = np.count_nonzero(~np.isnan(airflow_matrix), axis=0)
+    keep = np.flatnonzero(coverage >= candidate_min)
+    if not keep.size:
+        return []
+    medians = np.nanmedian(airflow_matrix[:, keep], axis=0)
+    return [
+        (db_grid[j], float(med), int(coverage[j]))
+        for j, med in zip(keep.tolist(), medians.tolist())
+        if math.isfinite(med) and med > 0
+    ]
+
+
+def _longest_contiguous_segment(points: list[tuple[float, float, int]]) -> list[tuple[float, float, int]]:
+    """Longest run of points whose dB gaps stay within the contiguity limit (first wins ties)."""
+    if not points:
+        return []
+    dbs = np.array([p[0] for p in points], dtype=float)
+    breaks = np.abs(np.diff(dbs)) > (BASELINE_DB_STEP * BASELINE_SEGMENT_CONTIGUITY_FACTOR)
+    seg_ids = np.concatenate(([0], np.cumsum(breaks)))
+    best = int(np.argmax(np.bincount(seg_ids)))
+    idx = np.flatnonzero(seg_ids == best)
+    return points[int(idx[0]):int(idx[-1]) + 1]
+
+
 def _atomic_json_write(path: str, payload: dict) -> None:
     """Atomically write *payload* as JSON to *path* using a sibling temp file."""
     base = os.path.realpath(_shared_cache_dir())
@@ -621,6 +703,7 @@ def _model_score_cache_fingerprint() -> str:
 
 
 def _save_denom_cache_to_disk() -> None:
+    global _denom_written_at
     try:
         with _cond_denom_lock:
             snapshot = {cid: dict(entry) for cid, entry in _cond_denom_cache.items()}
@@ -630,6 +713,7 @@ def _save_denom_cache_to_disk() -> None:
             'fingerprint': _denom_cache_fingerprint(),
         }
         _atomic_json_write(_denom_cache_path(), payload)
+        _denom_written_at = payload['written_at']
     except Exception as e:
         _logger.warning('[denom_cache] save to disk failed: %s', e)
 
@@ -648,6 +732,7 @@ def _normalize_and_validate_denom_entry_model_id_maps(entry: dict) -> bool:
 
 
 def _load_denom_cache_from_disk() -> bool:
+    global _denom_written_at, _model_score_generation, _model_score_table_ready, _model_score_table_generation
     try:
         p = _denom_cache_path()
         if not os.path.isfile(p):
@@ -721,8 +806,24 @@ def _load_denom_cache_from_disk() -> bool:
         with _cond_denom_lock:
             _cond_denom_cache.clear()
             _cond_denom_cache.update(loaded)
+        _denom_written_at = written_at
+        # The loaded entries were built elsewhere; local order statistics no longer
+        # match them and are recomputed in the background.
+        with _baseline_stats_lock:
+            _baseline_stats.clear()
+        _rebuild_baseline_stats_async()
         if _app_debug:
             _logger.debug('[denom_cache] loaded from disk (pid=%s)', os.getpid())
+        if _current_score_arrays() is not None:
+            # Serve scores from the shared mapped snapshot instead of a private table.
+            with _model_score_cache_lock:
+                _model_score_cache.clear()
+                _model_score_table_ready = False
+                _model_score_generation += 1
+                _model_score_table_generation += 1
+            _run_model_scores_hooks('shared_load')
+        else:
+            _materialize_model_scores(persist=False)
         return True
     except Exception as e:
         _logger.warning('[denom_cache] load from disk failed: %s', e)
@@ -863,7 +964,8 @@ def _invalidate_model_score_disk_cache() -> None:
 
 
 def _try_load_model_score_from_disk() -> None:
-    global _model_score_disk_loaded, _model_score_disk_last_attempt_at
+    global _model_score_disk_loaded, _model_score_disk_last_attempt_at, _model_score_generation
+    global _model_score_table_generation
     now = time.time()
     with _model_score_disk_loaded_lock:
         if _model_score_disk_loaded:
@@ -907,9 +1009,14 @@ def _try_load_model_score_from_disk() -> None:
                     if mid not in _model_score_cache:
                         _model_score_cache[mid] = entry
                         loaded += 1
+                        _model_score_generation += 1
                 except Exception as _entry_exc:
                     _logger.debug('[model_score_cache] skipping entry str_mid=%r: %s', str_mid, _entry_exc)
                     continue
+            if loaded:
+                _model_score_table_generation += 1
+        if loaded:
+            _run_model_scores_hooks('disk_load')
         if payload_accepted:
             with _model_score_disk_loaded_lock:
                 _model_score_disk_loaded = True
@@ -948,25 +1055,17 @@ def _build_canonical_facts() -> dict:
         GROUP BY v.model_id, v.condition_id
     """
 
-    sql_radar_add = """
-        SELECT model_id, COUNT(1) AS model_add_count
-        FROM user_radar_logs
-        WHERE event_time > (NOW() - INTERVAL 30 DAY)
-          AND event_type = 'add'
-          AND model_id IN (SELECT DISTINCT model_id FROM mids_cids_in_data_view)
-        GROUP BY model_id
-    """
-
     try:
         cq_rows = _fetch_all(sql_cond_query, cid_params)
     except Exception as e:
         _logger.warning('[canonical_facts] condition query fetch failed: %s', e)
         cq_rows = []
+    # 30-day radar-add counts from per-day rollup buckets (only today is re-counted).
     try:
-        radar_add_rows = _fetch_all(sql_radar_add)
+        model_add_counts: dict[int, int] = heat_rollup.get_radar_add_counts(_fetch_all)
     except Exception as e:
         _logger.warning('[canonical_facts] radar-add fetch failed: %s', e)
-        radar_add_rows = []
+        model_add_counts = {}
 
     lrc_snapshot: dict | None = None
     try:
@@ -1016,14 +1115,6 @@ def _build_canonical_facts() -> dict:
             except Exception:
                 pass
 
-    model_add_counts: dict[int, int] = {}
-    for r in radar_add_rows:
-        try:
-            mid = int(r['model_id'])
-            model_add_counts[mid] = int(r.get('model_add_count') or 0)
-        except Exception:
-            pass
-
     # canonical_facts/model_lookup must cover every currently visible model, even
     # when it has no recent heat activity yet.  Downstream boards/search/recent
     # updates decide whether to display a model; the candidate set itself must
@@ -1214,10 +1305,15 @@ def get_canonical_facts() -> dict:
 
 def _compute_model_score_for_model(model_id: int) -> dict | None:
     """Compute per-condition curve-relative scores for model_id."""
+    with _cond_denom_lock:
+        denom_entries = {cid: _cond_denom_cache.get(cid) for cid in SCORE_CONDITION_IDS}
+    return _model_conditions_from_denom(model_id, denom_entries)
+
+
+def _model_conditions_from_denom(model_id: int, denom_entries: Dict[int, dict | None]) -> dict | None:
     result: Dict[int, dict] = {}
     for cid in SCORE_CONDITION_IDS:
-        with _cond_denom_lock:
-            denom_entry = _cond_denom_cache.get(cid)
+        denom_entry = denom_entries.get(cid)
         if not denom_entry:
             continue
 
@@ -1267,7 +1363,9 @@ def _compute_composite_score(conditions: Dict[int, dict]) -> int | None:
     return round(weighted_sum / total_w) if total_w > 0 else None
 
 
-def _sync_compute_and_cache(model_id: int) -> dict | None:
+def _sync_compute_and_cache(model_id: int, trigger_source: str = 'compute') -> dict | None:
+    """Compute one model's score entry and cache it; the model-scores hooks run
+    only when the entry's scores changed."""
     conditions = _compute_model_score_for_model(model_id)
     if conditions is None:
         return None
@@ -1279,14 +1377,74 @@ def _sync_compute_and_cache(model_id: int) -> dict | None:
         'updated_at': now_str,
         'cached_at': time.time(),
     }
+    global _model_score_generation
     with _model_score_cache_lock:
+        prev = _model_score_cache.get(model_id)
+        changed = prev is None or prev.get('conditions') != conditions or prev.get('composite_score') != composite_score
+        if changed:
+            _model_score_generation += 1
         _model_score_cache[model_id] = entry
+    if changed:
+        _run_model_scores_hooks(trigger_source, (model_id,))
     return entry
 
 
+def _materialize_model_scores(persist: bool = True) -> int:
+    """Rebuild the whole model-score table from the current denom cache and swap it in.
+
+    Scores are pure functions of _cond_denom_cache, so one pass over every scored
+    model replaces per-lookup computation; with ``persist`` the table is also written
+    for other workers.  Returns the number of models with a score.
+    """
+    global _model_score_generation, _model_score_table_ready, _model_score_table_generation
+    with _cond_denom_lock:
+        denom_entries = {cid: _cond_denom_cache.get(cid) for cid in SCORE_CONDITION_IDS}
+    model_ids: set[int] = set()
+    for denom_entry in denom_entries.values():
+        for str_mid in (denom_entry or {}).get('raw_score_by_model') or {}:
+            try:
+                model_ids.add(int(str_mid))
+            except (TypeError, ValueError):
+                continue
+
+    now_t = time.time()
+    now_str = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    table: Dict[int, dict] = {}
+    for mid in model_ids:
+        conditions = _model_conditions_from_denom(mid, denom_entries)
+        if conditions is None:
+            continue
+        table[mid] = {
+            'conditions': conditions,
+            'composite_score': _compute_composite_score(conditions),
+            'updated_at': now_str,
+            'cached_at': now_t,
+        }
+
+    with _model_score_cache_lock:
+        _model_score_cache.clear()
+        _model_score_cache.update(table)
+        _model_score_generation += 1
+        _model_score_table_generation += 1
+        _model_score_table_ready = True
+    if persist:
+        _save_model_score_cache_to_disk()
+        try:
+            score_arrays.publish(
+                _score_arrays_path(), _model_score_cache_fingerprint(), _denom_written_at,
+                SCORE_CONDITION_IDS, table,
+            )
+        except Exception as e:
+            _logger.warning('[model_score_cache] score arrays publish failed: %s', e)
+    if _app_debug:
+        _logger.debug('[model_score_cache] materialized %d model scores (pid=%s)', len(table), os.getpid())
+    _run_model_scores_hooks('materialize')
+    return len(table)
+
+
 def refresh_model_score_cache(model_id: int) -> dict | None:
     """Recompute a model's score entry and refresh the in-process cache."""
-    return _sync_compute_and_cache(model_id)
+    return _sync_compute_and_cache(model_id, 'warm_scores')
 
 
 def _extract_n2a_db_range(n2a: dict | None) -> tuple[float, float] | None:
@@ -1361,54 +1519,135 @@ def _compute_curve_raw_score_for_n2a(denom_entry: dict, n2a: dict | None) -> tup
     return (float(raw_avg), len(ratios))
 
 
+def _batched_curve_raw_scores(
+    stack: '_PchipStack', baseline_fit: dict, cond_db_grid: list[float], cond_point_weights: list[float]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Raw scores for every curve in ``stack`` on the shared equal-airflow dB grid.
+
+    Batched counterpart of _compute_curve_raw_score_for_n2a (same sample selection,
+    ratios and weighting, evaluated as one models x grid matrix).  Returns
+    (raw score, sampled point count) arrays; models without a usable sample get
+    NaN and 0.
+    """
+    grid = np.asarray(cond_db_grid, dtype=float)
+    with np.errstate(over='ignore', invalid='ignore'):
+        base_af = np.exp(float(baseline_fit['intercept']) + float(baseline_fit['slope']) * grid)
+        base_ok = np.isfinite(base_af) & (base_af > 0)
+    airflow = stack.eval_grid(np.where(base_ok, grid, np.nan)) if stack.count else np.zeros((0, grid.size))
+    used = ~np.isnan(airflow)
+    ratios = np.where(used, airflow / np.where(base_ok, base_af, 1.0), 0.0)
+    counts = used.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        raw = ratios.sum(axis=1) / counts
+        if RAW_SCORE_ADAPTIVE_WEIGHTS and len(cond_point_weights) == grid.size:
+            w = np.where(used, np.asarray(cond_point_weights, dtype=float)[None, :], 0.0)
+            total_w = w.sum(axis=1)
+            raw = np.where(total_w > 0, (ratios * w).sum(axis=1) / total_w, raw)
+    raw[counts == 0] = np.nan
+    return raw, counts
+
+
 def _trigger_model_score_soft_refresh(model_id: int) -> None:
+    """Queue a recompute of model_id on the single score-refresh worker (deduplicated)."""
+    global _model_score_refresh_executor
     key = model_id
     with _model_score_inflight_lock:
-        if key in _model_score_inflight:
+        if key in _model_score_inflight or len(_model_score_inflight) >= _MODEL_SCORE_REFRESH_MAX_PENDING:
             return
         _model_score_inflight.add(key)
+        if _model_score_refresh_executor is None:
+            _model_score_refresh_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='model-score-refresh'
+            )
+        executor = _model_score_refresh_executor
 
     def _refresh():
         try:
             _sync_compute_and_cache(model_id)
+        except Exception as e:
+            _logger.warning('[model_score_cache] refresh failed for model_id=%s: %s', model_id, e)
         finally:
             with _model_score_inflight_lock:
                 _model_score_inflight.discard(key)
 
-    threading.Thread(target=_refresh, daemon=True).start()
+    try:
+        executor.submit(_refresh)
+    except Exception:
+        with _model_score_inflight_lock:
+            _model_score_inflight.discard(key)
+        raise
 
 
-def _get_model_score_cached(model_id: int) -> dict | None:
-    now = time.time()
-    with _model_score_cache_lock:
-        entry = _model_score_cache.get(model_id)
+def _current_score_arrays() -> 'score_arrays.ScoreArrays | None':
+    """Shared score-arrays snapshot, if it matches this process's denom cache."""
+    try:
+        arrays = score_arrays.get(_score_arrays_path())
+    except Exception as e:
+        _logger.warning('[model_score_cache] score arrays attach failed: %s', e)
+        return None
+    if arrays is None or not arrays.matches(_model_score_cache_fingerprint()):
+        return None
+    if arrays.denom_written_at < _denom_written_at:
+        return None
+    return arrays
 
-    if entry is not None:
-        age = now - entry['cached_at']
-        if age < MODEL_SCORE_CACHE_SOFT_TTL_SEC:
-            return entry
-        if age < MODEL_SCORE_CACHE_HARD_TTL_SEC:
-            _trigger_model_score_soft_refresh(model_id)
-            return entry
 
-    _try_load_model_score_from_disk()
+def _get_model_score_cached(model_id: int) -> dict | None:
+    """Read model_id's entry from the materialized score table.
+
+    Entries older than the soft TTL are returned as-is and queued for a background
+    recompute.  Processes that did not build the table read the shared mapped
+    snapshot (score_arrays); the table is only built inline when neither exists.
+    """
+    now = time.time()
     with _model_score_cache_lock:
         entry = _model_score_cache.get(model_id)
-    if entry is not None:
-        age = now - entry['cached_at']
-        if age < MODEL_SCORE_CACHE_SOFT_TTL_SEC:
-            return entry
-        if age < MODEL_SCORE_CACHE_HARD_TTL_SEC:
-            _trigger_model_score_soft_refresh(model_id)
-            return entry
+        table_ready = _model_score_table_ready
 
-    return _sync_compute_and_cache(model_id)
+    if entry is None and not table_ready:
+        arrays = _current_score_arrays()
+        if arrays is not None:
+            return arrays.model_entry(model_id)
+        _try_load_model_score_from_disk()
+        with _model_score_cache_lock:
+            entry = _model_score_cache.get(model_id)
+        if entry is None:
+            with _model_score_materialize_lock:
+                with _model_score_cache_lock:
+                    table_ready = _model_score_table_ready
+                with _cond_denom_lock:
+                    has_denom = bool(_cond_denom_cache)
+                if has_denom and not table_ready:
+                    _materialize_model_scores(persist=False)
+            with _model_score_cache_lock:
+                entry = _model_score_cache.get(model_id)
+
+    if entry is not None and now - entry['cached_at'] >= MODEL_SCORE_CACHE_SOFT_TTL_SEC:
+        _trigger_model_score_soft_refresh(model_id)
+    return entry
 
 
 def _get_canonical_model_score(model_id: int) -> dict | None:
     return _get_model_score_cached(model_id)
 
 
+def get_model_score_generation(*, table_only: bool = False) -> int:
+    """Counter that changes whenever any cached model score changes.
+
+    With ``table_only`` it changes only when the table as a whole changes;
+    single-model changes are reported through the model-scores hooks instead.
+    """
+    with _model_score_cache_lock:
+        generation = _model_score_table_generation if table_only else _model_score_generation
+        table_ready = _model_score_table_ready
+    if not table_ready:
+        # Both counters only grow, so their sum changes whenever either does.
+        arrays = _current_score_arrays()
+        if arrays is not None:
+            generation += arrays.generation
+    return generation
+
+
 def score_price_model_sort_key(score, reference_price, model_id):
     """Unified score ordering: score DESC, price ASC(None last), model_id DESC."""
     score_val = score if score is not None else float('-inf')
@@ -1629,6 +1868,7 @@ def _finalize_rankings_result(
 
 def get_rankings_v2() -> dict:
     """Return model-centric rankings for Right Panel v2, with a 10-minute cache."""
+    global _rankings_v2_version
     now = time.time()
     cache_key = 'data:canonical'
 
@@ -1645,6 +1885,7 @@ def get_rankings_v2() -> dict:
             existing = _rankings_v2_cache.get(cache_key)
             if not existing or disk_written_at > existing[0]:
                 _rankings_v2_cache[cache_key] = (disk_written_at, disk_result)
+                _rankings_v2_version += 1
         _try_load_model_score_from_disk()
         return _finalize_rankings_result(disk_result, trigger_source='rankings_v2:disk')
 
@@ -1663,6 +1904,7 @@ def get_rankings_v2() -> dict:
                 existing = _rankings_v2_cache.get(cache_key)
                 if not existing or disk_written_at > existing[0]:
                     _rankings_v2_cache[cache_key] = (disk_written_at, disk_result)
+                    _rankings_v2_version += 1
             _try_load_model_score_from_disk()
             return _finalize_rankings_result(
                 disk_result,
@@ -1676,6 +1918,7 @@ def get_rankings_v2() -> dict:
             existing = _rankings_v2_cache.get(cache_key)
             if not existing or computed_at > existing[0]:
                 _rankings_v2_cache[cache_key] = (computed_at, result)
+                _rankings_v2_version += 1
 
         _save_model_score_cache_to_disk()
 
@@ -1690,8 +1933,10 @@ def get_rankings_v2() -> dict:
 
 
 def _invalidate_rankings_v2_cache(purge_disk: bool = True) -> None:
+    global _rankings_v2_version
     with _rankings_v2_cache_lock:
         _rankings_v2_cache.pop('data:canonical', None)
+        _rankings_v2_version += 1
     if not purge_disk:
         return
     try:
@@ -1702,6 +1947,21 @@ def _invalidate_rankings_v2_cache(purge_disk: bool = True) -> None:
         _logger.warning('[rankings_v2] invalidate disk failed: %s', e)
 
 
+def get_rankings_v2_version() -> int:
+    """Counter that changes whenever the cached rankings entry is replaced or dropped."""
+    return _rankings_v2_version
+
+
+def get_denom_written_at() -> float:
+    """written_at of the denom cache this process scores with (0 before the first load)."""
+    return _denom_written_at
+
+
+def get_rankings_v2_ttl_sec() -> int:
+    """Seconds a cached rankings entry is served before get_rankings_v2 rebuilds it."""
+    return _RANKINGS_V2_CACHE_TTL_SEC
+
+
 def _get_ranked_lookup_with_fallback() -> dict:
     """Return model_lookup from the unified rankings cache."""
     try:
@@ -1829,219 +2089,368 @@ def _update_max_with_model(
         per_mid[cid] = new_mid
 
 
+def _coverage_requirements(total_curve_count: int) -> tuple[int, int, int]:
+    """(lower_required, upper_required, candidate_min) for a condition with N curves."""
+    # Dual-threshold MAX rule for both bounds.
+    # required_coverage = max(min_count_threshold, ceil(min_ratio_threshold * N))
+    # Lower bound: first dB point in the best segment with coverage >= lower_required.
+    lower_required = max(
+        BASELINE_VALID_LOWER_MIN_COUNT,
+        math.ceil(BASELINE_VALID_LOWER_MIN_RATIO * total_curve_count)
+    ) if total_curve_count > 0 else BASELINE_VALID_LOWER_MIN_COUNT
+    # Upper bound: last dB point in the best segment with coverage >= upper_required.
+    upper_required = max(
+        BASELINE_VALID_UPPER_MIN_COUNT,
+        math.ceil(BASELINE_VALID_UPPER_MIN_RATIO * total_curve_count)
+    ) if total_curve_count > 0 else BASELINE_VALID_UPPER_MIN_COUNT
+
+    # Candidate pool: include any point covered by at least min(lower, upper) curves so
+    # that both bound scans can find valid points. Guard against an empty/zero
+    # coverage threshold by clamping to >= 1.
+    candidate_min = max(1, min(lower_required, upper_required))
+    return lower_required, upper_required, candidate_min
+
+
+def _build_denom_entry(
+    models: list[tuple[int, dict, float, float]],
+    sampled_median_points: list[tuple[float, float, int]],
+    now_t: float,
+    previous_fit: dict | None = None,
+) -> dict:
+    """Build one condition's denom entry from its curves and per-point medians.
+
+    ``sampled_median_points`` are (dB, median airflow, coverage) for the grid
+    points with enough coverage, in ascending dB order; ``previous_fit`` is the
+    condition's current baseline_fit (see _fit_exponential_baseline).
+    """
+    baseline_fit = None
+    valid_db_min = None
+    valid_db_max = None
+
+    # Total curves participating in scoring for this condition.
+    total_curve_count = len(models)
+    lower_required, upper_required, _candidate_min = _coverage_requirements(total_curve_count)
+    stack = _PchipStack([m[1] for m in models]) if models else None
+
+    # Longest contiguous valid region.
+    best_segment = _longest_contiguous_segment(sampled_median_points)
+
+    if len(best_segment) >= BASELINE_MIN_SEGMENT_POINTS:
+        # Upper bound (valid_db_max): scan from the END of the best segment for the
+        # last dB point covered by >= upper_required curves.
+        for db_pt, _med_pt, cov_pt in reversed(best_segment):
+            if cov_pt >= upper_required:
+                valid_db_max = float(db_pt)
+                break
+        # Lower bound (valid_db_min): scan from the START of the best segment for
+        # the first dB point covered by >= lower_required curves.
+        for db_pt, _med_pt, cov_pt in best_segment:
+            if cov_pt >= lower_required:
+                valid_db_min = float(db_pt)
+                break
+        if valid_db_min is None or valid_db_max is None or valid_db_min >= valid_db_max:
+            # No point satisfies one or both bound thresholds, or the resulting
+            # interval has zero/negative width; the entire interval is invalid for
+            # this condition.
+            valid_db_min = None
+            valid_db_max = None
+        baseline_fit = _fit_exponential_baseline(
+            [(db, med) for db, med, _ in best_segment], previous_fit
+        )
+        if baseline_fit is None:
+            valid_db_min = None
+            valid_db_max = None
+
+    # Build the per-condition equal-airflow dB grid.
+    # 1. Compute baseline airflow at valid_db_min and valid_db_max.
+    # 2. Generate RAW_SCORE_AIRFLOW_SAMPLE_COUNT equally spaced airflow values.
+    # 3. Map each airflow value back to dB via the inverted exponential baseline.
+    # This is the shared sampling grid used for every model in this condition.
+    cond_db_grid: list[float] = []
+    if baseline_fit and valid_db_min is not None and valid_db_max is not None:
+        cond_db_grid = _build_equal_airflow_db_grid(
+            baseline_fit, valid_db_min, valid_db_max, RAW_SCORE_AIRFLOW_SAMPLE_COUNT
+        )
+        if not cond_db_grid:
+            # Grid construction failed; invalidate the interval for this condition.
+            valid_db_min = None
+            valid_db_max = None
+            baseline_fit = None
+
+    # Compute per-point coverage weights for adaptive weighting.
+    # weight[i] = (# models whose coverage range includes cond_db_grid[i]) / N
+    cond_point_weights: list[float] = []
+    if cond_db_grid and total_curve_count > 0:
+        covering = stack.domain_mask(cond_db_grid).sum(axis=0)
+        cond_point_weights = (covering / total_curve_count).tolist()
+
+    raw_score_by_model: Dict[str, float] = {}
+    sampled_points_used_by_model: Dict[str, int] = {}
+    if baseline_fit and cond_db_grid:
+        # Sample every model's PCHIP curve on the shared equal-airflow dB grid and
+        # compute per-point airflow ratios relative to the baseline.
+        # A model scores only at grid points within its own coverage interval
+        # (condition valid interval ∩ model's own coverage interval).
+        raw_arr, used_arr = _batched_curve_raw_scores(stack, baseline_fit, cond_db_grid, cond_point_weights)
+        for (mid, _n2a, _min_db, _max_db), raw_avg, used_points in zip(models, raw_arr.tolist(), used_arr.tolist()):
+            if math.isfinite(raw_avg):
+                raw_score_by_model[str(mid)] = float(raw_avg)
+                sampled_points_used_by_model[str(mid)] = int(used_points)
+
+    raw_values = [v for v in raw_score_by_model.values() if math.isfinite(v)]
+    # None means no model had valid equal-airflow sampled PCHIP points for this condition.
+    raw_score_best = max(raw_values) if raw_values else None
+
+    return {
+        'valid_db_min': valid_db_min,
+        'valid_db_max': valid_db_max,
+        'baseline_fit': baseline_fit or {},
+        'cond_db_grid': cond_db_grid,
+        'cond_point_weights': cond_point_weights,
+        'median_sample_count': len(best_segment),
+        'normalization_mode': 'ratio_to_best',
+        'raw_score_sampling': 'equal_airflow',
+        'raw_score_best': raw_score_best,
+        'raw_score_by_model': raw_score_by_model,
+        'sampled_points_used_by_model': sampled_points_used_by_model,
+        'cached_at': now_t,
+    }
+
+
+def _unified_db_grid_is_capped(min_db: float, max_db: float) -> bool:
+    """True when _build_unified_db_grid would resample instead of using BASELINE_DB_STEP."""
+    step = BASELINE_DB_STEP
+    start = math.ceil(min_db / step) * step
+    end = math.floor(max_db / step) * step
+    return start <= end and int(math.floor((end - start) / step)) + 1 > MAX_BASELINE_GRID_POINTS
+
+
+class _BaselineOrderStats:
+    """Sorted airflow values per dB grid point for one condition's curves.
+
+    Grid points are the BASELINE_DB_STEP multiples used by the full refresh,
+    so adding or removing a curve only touches the points it covers and the
+    per-point medians can be re-read without evaluating any other curve.
+    Each touched point costs a binary search plus a list insert/delete, i.e.
+    O(n) element moves for n curves at that point: a memmove of at most a few
+    thousand pointers, far below re-evaluating every curve, so plain sorted
+    lists are kept instead of a balanced tree.  Only valid while the
+    condition's grid is not resampled (see _unified_db_grid_is_capped).
+    """
+
+    def __init__(self):
+        self.values: Dict[float, list[float]] = {}
+        self.models: Dict[int, tuple[dict, float, float, Dict[float, float]]] = {}
+
+    @classmethod
+    def from_matrix(cls, models, db_grid: list[float], airflow_matrix) -> '_BaselineOrderStats':
+        stats = cls()
+        grid = np.asarray(db_grid, dtype=float)
+        for k, (mid, n2a, min_db, max_db) in enumerate(models):
+            row = airflow_matrix[k]
+            ok = ~np.isnan(row)
+            stats.models[mid] = (n2a, min_db, max_db, dict(zip(grid[ok].tolist(), row[ok].tolist())))
+        for j, db in enumerate(db_grid):
+            col = airflow_matrix[:, j]
+            col = col[~np.isnan(col)]
+            if col.size:
+                stats.values[db] = np.sort(col).tolist()
+        return stats
+
+    def add(self, mid: int, n2a: dict, min_db: float, max_db: float) -> None:
+        self.remove(mid)
+        step = BASELINE_DB_STEP
+        dbs = [
+            db for db in (round(k * step, DB_GRID_PRECISION)
+                          for k in range(math.ceil(min_db / step), math.floor(max_db / step) + 1))
+            if min_db <= db <= max_db
+        ]
+        contrib: Dict[float, float] = {}
+        if dbs:
+            vals = _PchipStack([n2a]).eval_pairs(np.zeros(len(dbs), dtype=np.int64), dbs)
+            for db, val in zip(dbs, vals.tolist()):
+                if math.isfinite(val) and val > 0:
+                    bisect.insort(self.values.setdefault(db, []), val)
+                    contrib[db] = val
+        self.models[mid] = (n2a, min_db, max_db, contrib)
+
+    def remove(self, mid: int) -> bool:
+        entry = self.models.pop(mid, None)
+        if entry is None:
+            return False
+        for db, val in entry[3].items():
+            vals = self.values.get(db)
+            if not vals:
+                continue
+            i = bisect.bisect_left(vals, val)
+            if i < len(vals) and vals[i] == val:
+                del vals[i]
+            if not vals:
+                del self.values[db]
+        return True
+
+    def model_list(self) -> list[tuple[int, dict, float, float]]:
+        return [(mid, e[0], e[1], e[2]) for mid, e in sorted(self.models.items())]
+
+    def is_capped(self) -> bool:
+        if not self.models:
+            return False
+        return _unified_db_grid_is_capped(min(e[1] for e in self.models.values()),
+                                          max(e[2] for e in self.models.values()))
+
+    def median_points(self, candidate_min: int) -> list[tuple[float, float, int]]:
+        points = []
+        for db in sorted(self.values):
+            vals = self.values[db]
+            n = len(vals)
+            if n < candidate_min:
+                continue
+            m = n // 2
+            med = vals[m] if n % 2 == 1 else (vals[m - 1] + vals[m]) / 2.0
+            if med > 0:
+                points.append((db, float(med), n))
+        return points
+
+
+# Per-condition order statistics from the last full refresh in this process.
+# Workers that adopt the shared denom file rebuild them from the curves in the
+# background (_rebuild_baseline_stats_async); until that swap lands a large
+# visibility diff falls back to a full refresh.
+_baseline_stats: Dict[int, _BaselineOrderStats] = {}
+_baseline_stats_lock = threading.Lock()
+
+
+def _load_condition_n2a_curves(cid_list: list[int]) -> Dict[int, list[tuple[int, dict, float, float]]]:
+    """(model_id, noise_to_airflow, min_db, max_db) of every curve with data, per condition."""
+    parts = ', '.join([f':c{i}' for i in range(len(cid_list))])
+    params = {f'c{i}': cid for i, cid in enumerate(cid_list)}
+
+    pair_rows = _fetch_all(
+        f"SELECT DISTINCT model_id, condition_id FROM mids_cids_in_data_view "
+        f"WHERE condition_id IN ({parts})",
+        params
+    )
+    pairs = [(int(r['model_id']), int(r['condition_id'])) for r in pair_rows]
+
+    per_cid_n2a: Dict[int, list[tuple[int, dict, float, float]]] = defaultdict(list)
+    if pairs:
+        perf_map: Dict[str, Any] = {}
+        try:
+            perf_map = spectrum_reader.get_perf_models(pairs)
+        except Exception as e:
+            _logger.warning('[denom_refresh] pchip load/rebuild failed: %s', e)
+        for mid, cid in pairs:
+            mdl = perf_map.get(f'{mid}_{cid}')
+            pchip_data = (mdl or {}).get('pchip') or {}
+            n2a = pchip_data.get('noise_to_airflow')
+            db_range = _extract_n2a_db_range(n2a)
+            if db_range is None:
+                continue
+            per_cid_n2a[cid].append((mid, n2a, db_range[0], db_range[1]))
+    return per_cid_n2a
+
+
+def _build_baseline_stats(per_cid_n2a, cid_list: list[int]) -> Dict[int, _BaselineOrderStats]:
+    """Order statistics of every condition whose grid is not capped (see _do_denom_refresh)."""
+    new_stats: Dict[int, _BaselineOrderStats] = {}
+    for cid in cid_list:
+        models = per_cid_n2a.get(cid, [])
+        if not models:
+            new_stats[cid] = _BaselineOrderStats()
+            continue
+        global_min = min(m[2] for m in models)
+        global_max = max(m[3] for m in models)
+        if _unified_db_grid_is_capped(global_min, global_max):
+            continue
+        db_grid = _build_unified_db_grid(global_min, global_max, BASELINE_DB_STEP)
+        if db_grid:
+            airflow_matrix = _PchipStack([m[1] for m in models]).eval_grid(db_grid)
+            new_stats[cid] = _BaselineOrderStats.from_matrix(models, db_grid, airflow_matrix)
+    return new_stats
+
+
+_baseline_stats_rebuild_inflight = threading.Lock()
+_baseline_stats_rebuild_pending = threading.Event()
+
+
+def _rebuild_baseline_stats_async() -> None:
+    """Rebuild the order statistics behind a denom cache adopted from disk.
+
+    The adopted entries were built by another worker, so the local statistics
+    are dropped on load; this recomputes them from the current curves in the
+    background so the incremental baseline path (_apply_incremental_baseline_diff) stays
+    available to whichever worker rebuilds next.  Until it lands that path
+    falls back to a full refresh.
+    """
+    _baseline_stats_rebuild_pending.set()
+    if not _baseline_stats_rebuild_inflight.acquire(blocking=False):
+        return
+
+    def _run():
+        try:
+            while _baseline_stats_rebuild_pending.is_set():
+                _baseline_stats_rebuild_pending.clear()
+                target = _denom_written_at
+                cid_list = list(SCORE_CONDITION_IDS)
+                new_stats = _build_baseline_stats(_load_condition_n2a_curves(cid_list), cid_list)
+                with _baseline_stats_lock:
+                    # A local refresh or a newer adoption since the start supersedes this result.
+                    if _denom_written_at == target:
+                        _baseline_stats.clear()
+                        _baseline_stats.update(new_stats)
+        except Exception as e:
+            _logger.warning('[denom_cache] baseline statistics rebuild failed: %s', e)
+        finally:
+            _baseline_stats_rebuild_inflight.release()
+
+    try:
+        threading.Thread(target=_run, daemon=True, name='baseline-stats-rebuild').start()
+    except Exception:
+        _baseline_stats_rebuild_inflight.release()
+        raise
+
+
 def _do_denom_refresh():
     """Rebuild per-condition curve-relative baseline/scoring cache."""
     try:
         cid_list = list(SCORE_CONDITION_IDS)
         if not cid_list:
             return
-        parts = ', '.join([f':c{i}' for i in range(len(cid_list))])
-        params = {f'c{i}': cid for i, cid in enumerate(cid_list)}
-
-        pair_rows = _fetch_all(
-            f"SELECT DISTINCT model_id, condition_id FROM mids_cids_in_data_view "
-            f"WHERE condition_id IN ({parts})",
-            params
-        )
-        pairs = [(int(r['model_id']), int(r['condition_id'])) for r in pair_rows]
-
-        per_cid_n2a: Dict[int, list[tuple[int, dict, float, float]]] = defaultdict(list)
-        if pairs:
-            perf_map: Dict[str, Any] = {}
-            try:
-                perf_map = spectrum_reader.get_perf_models(pairs)
-            except Exception as e:
-                _logger.warning('[denom_refresh] pchip load/rebuild failed: %s', e)
-            for mid, cid in pairs:
-                mdl = perf_map.get(f'{mid}_{cid}')
-                pchip_data = (mdl or {}).get('pchip') or {}
-                n2a = pchip_data.get('noise_to_airflow')
-                if not (n2a and isinstance(n2a, dict)):
-                    continue
-                xs = n2a.get('x') or []
-                if len(xs) < 2:
-                    continue
-                try:
-                    min_db = float(xs[0])
-                    max_db = float(xs[-1])
-                except Exception:
-                    continue
-                if not (math.isfinite(min_db) and math.isfinite(max_db) and min_db < max_db):
-                    continue
-                per_cid_n2a[cid].append((mid, n2a, min_db, max_db))
+        per_cid_n2a = _load_condition_n2a_curves(cid_list)
 
         now_t = time.time()
+        with _cond_denom_lock:
+            previous_fits = {cid: e.get('baseline_fit') for cid, e in _cond_denom_cache.items()}
         new_cache: Dict[int, dict] = {}
+        new_stats: Dict[int, _BaselineOrderStats] = {}
         for cid in cid_list:
             models = per_cid_n2a.get(cid, [])
-            baseline_fit = None
             sampled_median_points: list[tuple[float, float, int]] = []
-            valid_db_min = None
-            valid_db_max = None
-
-            # Total curves participating in scoring for this condition.
-            total_curve_count = len(models)
-
-            # Dual-threshold MAX rule for both bounds.
-            # required_coverage = max(min_count_threshold, ceil(min_ratio_threshold * N))
-            # Lower bound: first dB point in the best segment with coverage >= lower_required.
-            lower_required = max(
-                BASELINE_VALID_LOWER_MIN_COUNT,
-                math.ceil(BASELINE_VALID_LOWER_MIN_RATIO * total_curve_count)
-            ) if total_curve_count > 0 else BASELINE_VALID_LOWER_MIN_COUNT
-            # Upper bound: last dB point in the best segment with coverage >= upper_required.
-            upper_required = max(
-                BASELINE_VALID_UPPER_MIN_COUNT,
-                math.ceil(BASELINE_VALID_UPPER_MIN_RATIO * total_curve_count)
-            ) if total_curve_count > 0 else BASELINE_VALID_UPPER_MIN_COUNT
-
-            # Candidate pool: include any point covered by at least min(lower, upper) curves so
-            # that both bound scans can find valid points. Guard against an empty/zero
-            # coverage threshold by clamping to >= 1.
-            candidate_min = max(1, min(lower_required, upper_required))
+            _lower, _upper, candidate_min = _coverage_requirements(len(models))
 
             if models:
                 global_min = min(m[2] for m in models)
                 global_max = max(m[3] for m in models)
                 db_grid = _build_unified_db_grid(global_min, global_max, BASELINE_DB_STEP)
-                for db in db_grid:
-                    vals = []
-                    for _, n2a, min_db, max_db in models:
-                        if db < min_db or db > max_db:
-                            continue
-                        try:
-                            val = eval_pchip(n2a, db)
-                        except Exception:
-                            val = None
-                        if val is not None and math.isfinite(val) and val > 0:
-                            vals.append(float(val))
-                    valid_value_count = len(vals)
-                    if valid_value_count >= candidate_min:
-                        med = _safe_median(vals)
-                        if med is not None and med > 0:
-                            sampled_median_points.append((db, med, valid_value_count))
-
-            # Longest contiguous valid region.
-            best_segment: list[tuple[float, float, int]] = []
-            if sampled_median_points:
-                cur_segment = [sampled_median_points[0]]
-                for point in sampled_median_points[1:]:
-                    prev_db = cur_segment[-1][0]
-                    if abs(point[0] - prev_db) <= (BASELINE_DB_STEP * BASELINE_SEGMENT_CONTIGUITY_FACTOR):
-                        cur_segment.append(point)
-                    else:
-                        if len(cur_segment) > len(best_segment):
-                            best_segment = cur_segment
-                        cur_segment = [point]
-                if len(cur_segment) > len(best_segment):
-                    best_segment = cur_segment
-
-            if len(best_segment) >= BASELINE_MIN_SEGMENT_POINTS:
-                # Upper bound (valid_db_max): scan from the END of the best segment for the
-                # last dB point covered by >= upper_required curves.
-                for db_pt, _med_pt, cov_pt in reversed(best_segment):
-                    if cov_pt >= upper_required:
-                        valid_db_max = float(db_pt)
-                        break
-                # Lower bound (valid_db_min): scan from the START of the best segment for
-                # the first dB point covered by >= lower_required curves.
-                for db_pt, _med_pt, cov_pt in best_segment:
-                    if cov_pt >= lower_required:
-                        valid_db_min = float(db_pt)
-                        break
-                if valid_db_min is None or valid_db_max is None or valid_db_min >= valid_db_max:
-                    # No point satisfies one or both bound thresholds, or the resulting
-                    # interval has zero/negative width; the entire interval is invalid for
-                    # this condition.
-                    valid_db_min = None
-                    valid_db_max = None
-                baseline_fit = _fit_exponential_baseline([(db, med) for db, med, _ in best_segment])
-                if baseline_fit is None:
-                    valid_db_min = None
-                    valid_db_max = None
-
-            # Build the per-condition equal-airflow dB grid.
-            # 1. Compute baseline airflow at valid_db_min and valid_db_max.
-            # 2. Generate RAW_SCORE_AIRFLOW_SAMPLE_COUNT equally spaced airflow values.
-            # 3. Map each airflow value back to dB via the inverted exponential baseline.
-            # This is the shared sampling grid used for every model in this condition.
-            cond_db_grid: list[float] = []
-            if baseline_fit and valid_db_min is not None and valid_db_max is not None:
-                cond_db_grid = _build_equal_airflow_db_grid(
-                    baseline_fit, valid_db_min, valid_db_max, RAW_SCORE_AIRFLOW_SAMPLE_COUNT
-                )
-                if not cond_db_grid:
-                    # Grid construction failed; invalidate the interval for this condition.
-                    valid_db_min = None
-                    valid_db_max = None
-                    baseline_fit = None
-
-            # Compute per-point coverage weights for adaptive weighting.
-            # weight[i] = (# models whose coverage range includes cond_db_grid[i]) / N
-            cond_point_weights: list[float] = []
-            if cond_db_grid and total_curve_count > 0:
-                for db_pt in cond_db_grid:
-                    count = sum(
-                        1 for _, _, fan_min_db, fan_max_db in models
-                        if fan_min_db <= db_pt <= fan_max_db
-                    )
-                    cond_point_weights.append(count / total_curve_count)
-
-            raw_score_by_model: Dict[str, float] = {}
-            sampled_points_used_by_model: Dict[str, int] = {}
-            if baseline_fit and cond_db_grid:
-                # Sample every model's PCHIP curve on the shared equal-airflow dB grid and
-                # compute per-point airflow ratios relative to the baseline.
-                # A model scores only at grid points within its own coverage interval
-                # (condition valid interval ∩ model's own coverage interval).
-                for mid, n2a, fan_min_db, fan_max_db in models:
-                    ratios: list[float] = []
-                    pt_weights: list[float] = []
-                    for i, db in enumerate(cond_db_grid):
-                        # Restrict to the model's own coverage interval.
-                        if db < fan_min_db or db > fan_max_db:
-                            continue
-                        try:
-                            airflow = eval_pchip(n2a, db)
-                        except Exception:
-                            airflow = None
-                        if airflow is None or not math.isfinite(airflow) or airflow <= 0:
-                            continue
-                        base_af = _baseline_airflow_at_db(baseline_fit, db)
-                        if base_af is None:
-                            continue
-                        ratios.append(airflow / base_af)
-                        pt_weights.append(cond_point_weights[i] if cond_point_weights else 1.0)
-                    if ratios:
-                        raw_avg = _aggregate_ratios(ratios, pt_weights)
-                        if math.isfinite(raw_avg):
-                            raw_score_by_model[str(mid)] = float(raw_avg)
-                            sampled_points_used_by_model[str(mid)] = len(ratios)
-
-            raw_values = [v for v in raw_score_by_model.values() if math.isfinite(v)]
-            # None means no model had valid equal-airflow sampled PCHIP points for this condition.
-            raw_score_best = max(raw_values) if raw_values else None
-
-            entry = {
-                'valid_db_min': valid_db_min,
-                'valid_db_max': valid_db_max,
-                'baseline_fit': baseline_fit or {},
-                'cond_db_grid': cond_db_grid,
-                'cond_point_weights': cond_point_weights,
-                'median_sample_count': len(best_segment),
-                'normalization_mode': 'ratio_to_best',
-                'raw_score_sampling': 'equal_airflow',
-                'raw_score_best': raw_score_best,
-                'raw_score_by_model': raw_score_by_model,
-                'sampled_points_used_by_model': sampled_points_used_by_model,
-                'cached_at': now_t,
-            }
-            new_cache[cid] = entry
+                if db_grid:
+                    airflow_matrix = _PchipStack([m[1] for m in models]).eval_grid(db_grid)
+                    sampled_median_points = _median_points(airflow_matrix, db_grid, candidate_min)
+                    if not _unified_db_grid_is_capped(global_min, global_max):
+                        new_stats[cid] = _BaselineOrderStats.from_matrix(models, db_grid, airflow_matrix)
+            else:
+                new_stats[cid] = _BaselineOrderStats()
+
+            new_cache[cid] = _build_denom_entry(
+                models, sampled_median_points, now_t, previous_fits.get(cid)
+            )
 
         # Swap in the fully-built snapshot under a short lock.
         with _cond_denom_lock:
             _cond_denom_cache.clear()
             _cond_denom_cache.update(new_cache)
+        with _baseline_stats_lock:
+            _baseline_stats.clear()
+            _baseline_stats.update(new_stats)
 
         if _app_debug:
             _logger.debug(
@@ -2049,12 +2458,9 @@ def _do_denom_refresh():
                 len(cid_list)
             )
 
-        with _model_score_cache_lock:
-            _model_score_cache.clear()
-
-        _invalidate_model_score_disk_cache()
-
         _save_denom_cache_to_disk()
+
+        _materialize_model_scores()
     except Exception as e:
         _logger.warning('[denom_refresh] error: %s', e)
 
@@ -2254,9 +2660,7 @@ def _apply_incremental_visibility_diff(added_model_ids: list[int], removed_model
         _logger.warning('[visibility_sync] failed to persist denom cache after incremental diff: %s', e)
 
     if raw_best_changed:
-        with _model_score_cache_lock:
-            _model_score_cache.clear()
-        _invalidate_model_score_disk_cache()
+        _materialize_model_scores()
     else:
         _invalidate_model_score_cache_entries(list(changed_model_ids))
 
@@ -2273,108 +2677,381 @@ def _apply_incremental_visibility_diff(added_model_ids: list[int], removed_model
     return True
 
 
+def _apply_incremental_baseline_diff(added_model_ids: list[int], removed_model_ids: list[int]) -> bool | None:
+    """Update the per-point order statistics for a visibility diff and rebuild only
+    the touched conditions (baseline fit, grid, weights and raw scores).
+
+    Returns None when the order statistics are unavailable (no full refresh ran in
+    this process yet, their rebuild after adopting a shared denom cache is still
+    running, or a condition's grid is resampled); the caller then falls back
+    to the fixed-baseline/heavy paths.
+    """
+    added: set[int] = set()
+    for raw_mid in added_model_ids:
+        try:
+            mid = int(raw_mid)
+        except (TypeError, ValueError):
+            continue
+        if mid > 0:
+            added.add(mid)
+    removed: set[int] = set()
+    for raw_mid in removed_model_ids:
+        try:
+            mid = int(raw_mid)
+        except (TypeError, ValueError):
+            continue
+        if mid > 0:
+            removed.add(mid)
+
+    with _baseline_stats_lock:
+        if any(cid not in _baseline_stats for cid in SCORE_CONDITION_IDS):
+            return None
+
+    curves: list[tuple[int, int, dict, float, float]] = []
+    if added:
+        pairs = _collect_model_condition_pairs(sorted(added))
+        perf_map: dict[str, Any] = {}
+        if pairs:
+            try:
+                perf_map = spectrum_reader.build_performance_pchips(pairs)
+            except Exception as e:
+                _logger.warning('[visibility_sync] pchip rebuild failed for baseline diff: %s', e)
+                return None
+        for mid, cid in pairs:
+            perf = perf_map.get(f'{mid}_{cid}') or {}
+            n2a = ((perf.get('pchip') or {}).get('noise_to_airflow'))
+            db_range = _extract_n2a_db_range(n2a)
+            if db_range is not None:
+                curves.append((mid, cid, n2a, db_range[0], db_range[1]))
+
+    now_t = time.time()
+    new_entries: Dict[int, dict] = {}
+    with _baseline_stats_lock:
+        try:
+            touched: set[int] = set()
+            # Changed models are dropped everywhere first so a model that lost a
+            # condition (or whose curve changed) leaves no stale values behind.
+            for cid, stats in _baseline_stats.items():
+                for mid in added | removed:
+                    if stats.remove(mid):
+                        touched.add(cid)
+            for mid, cid, n2a, min_db, max_db in curves:
+                _baseline_stats[cid].add(mid, n2a, min_db, max_db)
+                touched.add(cid)
+            for cid in touched:
+                stats = _baseline_stats[cid]
+                if stats.is_capped():
+                    _baseline_stats.clear()
+                    return None
+                models = stats.model_list()
+                _lower, _upper, candidate_min = _coverage_requirements(len(models))
+                with _cond_denom_lock:
+                    previous_fit = (_cond_denom_cache.get(cid) or {}).get('baseline_fit')
+                new_entries[cid] = _build_denom_entry(
+                    models, stats.median_points(candidate_min), now_t, previous_fit
+                )
+        except Exception:
+            # Partially applied; the next full refresh rebuilds the statistics.
+            _baseline_stats.clear()
+            raise
+
+    if not new_entries:
+        return False
+
+    with _cond_denom_lock:
+        _cond_denom_cache.update(new_entries)
+
+    if _app_debug:
+        _logger.debug(
+            '[visibility_sync] baseline diff: added=%d removed=%d -> rebuilt %d conditions',
+            len(added), len(removed), len(new_entries),
+        )
+
+    try:
+        _save_denom_cache_to_disk()
+    except Exception as e:
+        _logger.warning('[visibility_sync] failed to persist denom cache after baseline diff: %s', e)
+
+    # The baseline moved, so every score in the touched conditions is relative to a
+    # new reference; rebuild the whole score table.
+    _materialize_model_scores()
+
+    _invalidate_canonical_facts_cache(purge_disk=True)
+    _invalidate_rankings_v2_cache(purge_disk=True)
+    _warmup_rankings_async()
+    return True
+
+
+def _apply_visible_model_set_diff(source: str, added: list[int], removed: list[int], forced_ids: list[int]) -> None:
+    """Rebuild the scoring caches for one visible-set diff (forced ids are re-added)."""
+    forced_only = sorted(set(forced_ids).difference(added).difference(removed))
+    added = list(added) + forced_only
+    changed_count = len(added) + len(removed)
+    if changed_count == 0:
+        return
+
+    try:
+        applied = _apply_incremental_baseline_diff(added, removed)
+    except Exception as e:
+        _logger.warning('[visibility_sync] baseline diff failed (%s): %s', source, e)
+        applied = None
+    if applied is not None:
+        if not applied:
+            _invalidate_canonical_facts_cache(purge_disk=True)
+            _invalidate_rankings_v2_cache(purge_disk=True)
+            _warmup_rankings_async()
+        return
+
+    if changed_count > _VISIBILITY_DIFF_INCREMENTAL_MAX:
+        if _app_debug:
+            _logger.debug(
+                '[visibility_sync] large diff (%s): added=%d removed=%d -> heavy refresh',
+                source,
+                len(added),
+                len(removed),
+            )
+        _run_heavy_visibility_refresh()
+        return
+
+    try:
+        applied = _apply_incremental_visibility_diff(added, removed)
+    except Exception as e:
+        _logger.warning('[visibility_sync] incremental diff failed (%s): %s - falling back to heavy refresh', source, e)
+        _run_heavy_visibility_refresh()
+        return
+
+    if not applied:
+        _invalidate_canonical_facts_cache(purge_disk=True)
+        _invalidate_rankings_v2_cache(purge_disk=True)
+        _warmup_rankings_async()
+
+
+def _visible_set_digest(visible_ids: set[int]) -> str:
+    return hashlib.sha1(','.join(str(mid) for mid in sorted(visible_ids)).encode('ascii')).hexdigest()
+
+
+def _take_forced_model_ids() -> list[int]:
+    with _visibility_sync_hint_forced_model_ids_lock:
+        forced_model_ids = sorted(_visibility_sync_hint_forced_model_ids)
+        _visibility_sync_hint_forced_model_ids.clear()
+    return forced_model_ids
+
+
+def _restore_forced_model_ids(forced_model_ids: list[int]) -> None:
+    """Put back forced ids whose sync was deferred so the next sync re-scores them."""
+    if forced_model_ids:
+        with _visibility_sync_hint_forced_model_ids_lock:
+            _visibility_sync_hint_forced_model_ids.update(forced_model_ids)
+
+
+def _read_visibility_sync_marker() -> dict:
+    try:
+        with open(_visibility_sync_marker_path(), 'r', encoding='utf-8') as f:
+            marker = json.load(f)
+        return marker if isinstance(marker, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        _logger.warning('[visibility_sync] marker read failed: %s', e)
+        return {}
+
+
+def _write_visibility_sync_marker(digest: str) -> None:
+    try:
+        _atomic_json_write(_visibility_sync_marker_path(), {
+            'digest': digest,
+            'denom_written_at': _denom_written_at,
+            'written_at': time.time(),
+        })
+    except Exception as e:
+        _logger.warning('[visibility_sync] marker write failed: %s', e)
+
+
+def _adopt_shared_scoring_caches(denom_written_at=None) -> bool:
+    """Switch to the denom / score results another worker rebuilt.
+
+    The shared denom file is loaded only when it is newer than this process's
+    copy; the in-memory facts and rankings entries are dropped either way since
+    they depend on the visible set.  Returns False when the shared denom cache
+    is unusable (expired, foreign fingerprint).
+    """
+    try:
+        target = float(denom_written_at or 0)
+    except (TypeError, ValueError):
+        target = 0.0
+    if target > _denom_written_at and not _load_denom_cache_from_disk():
+        return False
+    _invalidate_canonical_facts_cache(purge_disk=False)
+    _invalidate_rankings_v2_cache(purge_disk=False)
+    return True
+
+
+def _announce_shared_scoring(source: str) -> None:
+    try:
+        cache_event_bus.publish(
+            cache_event_bus.EVENT_RELOAD_SCORES,
+            {'denom_written_at': _denom_written_at, 'source': source},
+            logger=_logger,
+        )
+        cache_event_bus.wake_consumer()
+    except Exception as e:
+        _logger.warning('[visibility_sync] failed to announce rebuilt caches (%s): %s', source, e)
+
+
 def _sync_visible_model_set_once(
     source: str = 'watcher',
     allow_bootstrap_without_sync: bool = True,
     forced_model_ids: list[int] | None = None,
-) -> None:
+) -> bool:
+    """Diff the visible model set against the last snapshot and rebuild for changes.
+
+    Every worker diffs, but only the holder of the visibility-sync file lock
+    rebuilds (pchips, denom, scores).  It records the visible set it rebuilt for
+    in a shared marker and announces the result on cache_event_bus; the other
+    workers adopt the shared files from that announcement (reload_shared_scoring_caches),
+    or directly when they find the marker already matching their own diff.
+    A sync with forced ids never adopts from the marker: the marker only says the
+    visible set was rebuilt, not that those models were re-scored since they
+    were requested.
+
+    Returns False when the sync was deferred (visible ids unavailable, or another
+    worker holds the rebuild lock), True once this process's caches match the
+    current visible set.
+    """
     global _visible_model_set_snapshot
     with _visible_model_set_sync_lock:
         try:
             current_visible_ids = _fetch_current_visible_model_ids()
         except Exception as e:
             _logger.warning('[visibility_sync] failed to query visible model ids (%s): %s', source, e)
-            return
+            return False
 
         with _visible_model_set_snapshot_lock:
             previous_visible_ids = _visible_model_set_snapshot
-            if previous_visible_ids is None:
-                _visible_model_set_snapshot = set(current_visible_ids)
-                previous_visible_ids = None
-            else:
+            if previous_visible_ids is not None:
                 previous_visible_ids = set(previous_visible_ids)
-                _visible_model_set_snapshot = set(current_visible_ids)
+            _visible_model_set_snapshot = set(current_visible_ids)
 
-        if previous_visible_ids is None:
-            if allow_bootstrap_without_sync:
+        if previous_visible_ids is None and allow_bootstrap_without_sync:
+            if _app_debug:
+                _logger.debug('[visibility_sync] initialized visible-set snapshot (%s): %d models',
+                              source, len(current_visible_ids))
+            return True
+
+        # Forced ids only matter while visible; hidden ones leave through the diff.
+        forced_set: set[int] = set()
+        for raw_mid in forced_model_ids or []:
+            try:
+                mid = int(raw_mid)
+            except (TypeError, ValueError):
+                continue
+            if mid in current_visible_ids:
+                forced_set.add(mid)
+
+        added: list[int] = []
+        removed: list[int] = []
+        if previous_visible_ids is not None:
+            added = sorted(current_visible_ids - previous_visible_ids)
+            removed = sorted(previous_visible_ids - current_visible_ids)
+            if not added and not removed and not forced_set:
+                return True
+
+        lock_path = os.path.join(tempfile.gettempdir(), f'fancool_visibility_sync{_score_cache_suffix()}.lock')
+        with startup_lock(lock_path) as acquired:
+            if not acquired:
+                # Another worker is rebuilding and announces the shared results when
+                # done; keep the old snapshot so the next tick retries if it never does.
+                with _visible_model_set_snapshot_lock:
+                    _visible_model_set_snapshot = previous_visible_ids
                 if _app_debug:
-                    _logger.debug('[visibility_sync] initialized visible-set snapshot (%s): %d models',
-                                  source, len(current_visible_ids))
-                return
-            _run_heavy_visibility_refresh()
-            return
+                    _logger.debug('[visibility_sync] rebuild in progress elsewhere (%s, pid=%s)', source, os.getpid())
+                return False
 
-        added = sorted(current_visible_ids - previous_visible_ids)
-        removed = sorted(previous_visible_ids - current_visible_ids)
-        if forced_model_ids:
-            forced_set = set()
-            for raw_mid in forced_model_ids:
-                try:
-                    mid = int(raw_mid)
-                except (TypeError, ValueError):
-                    continue
-                if mid > 0:
-                    forced_set.add(mid)
-            forced_only = sorted(forced_set.difference(added).difference(removed))
-            if forced_only:
-                added.extend(forced_only)
-        changed_count = len(added) + len(removed)
-        if changed_count == 0:
-            if forced_model_ids:
-                try:
-                    _apply_incremental_visibility_diff(forced_model_ids, [])
-                except Exception as e:
-                    _logger.warning(
-                        '[visibility_sync] forced-model incremental sync failed (%s): %s',
-                        source,
-                        e,
-                    )
-            return
+            digest = _visible_set_digest(current_visible_ids)
+            marker = {} if forced_set else _read_visibility_sync_marker()
+            if marker.get('digest') == digest and _adopt_shared_scoring_caches(marker.get('denom_written_at')):
+                if _app_debug:
+                    _logger.debug('[visibility_sync] adopted shared rebuild (%s, pid=%s)', source, os.getpid())
+                return True
 
-        if changed_count > _VISIBILITY_DIFF_INCREMENTAL_MAX:
-            if _app_debug:
-                _logger.debug(
-                    '[visibility_sync] large diff (%s): added=%d removed=%d -> heavy refresh',
-                    source,
-                    len(added),
-                    len(removed),
-                )
-            _run_heavy_visibility_refresh()
-            return
+            if previous_visible_ids is None:
+                _run_heavy_visibility_refresh()
+            else:
+                _apply_visible_model_set_diff(source, added, removed, sorted(forced_set))
+            _write_visibility_sync_marker(digest)
+
+        _announce_shared_scoring(source)
+        return True
 
+
+def reload_shared_scoring_caches(denom_written_at=None) -> bool:
+    """Adopt the scoring caches announced by the worker that rebuilt them.
+
+    Called for cache_event_bus 'reload_scores' events.  Also moves the visible-set
+    snapshot forward so the watcher does not diff the same change again.
+    """
+    global _visible_model_set_snapshot
+    with _visible_model_set_sync_lock:
+        if not _adopt_shared_scoring_caches(denom_written_at):
+            _logger.warning('[visibility_sync] shared denom cache unusable; waiting for the next sync (pid=%s)', os.getpid())
+            return False
         try:
-            applied = _apply_incremental_visibility_diff(added, removed)
+            current_visible_ids = _fetch_current_visible_model_ids()
         except Exception as e:
-            _logger.warning('[visibility_sync] incremental diff failed (%s): %s - falling back to heavy refresh', source, e)
-            _run_heavy_visibility_refresh()
-            return
+            _logger.warning('[visibility_sync] failed to query visible model ids (reload): %s', e)
+            return True
+        with _visible_model_set_snapshot_lock:
+            _visible_model_set_snapshot = set(current_visible_ids)
+    return True
 
-        if not applied:
-            _invalidate_canonical_facts_cache(purge_disk=True)
-            _invalidate_rankings_v2_cache(purge_disk=True)
-            _warmup_rankings_async()
 
+def refresh_visibility_scoring_caches(model_ids: list[int] | None = None, *, wait: bool = False) -> bool:
+    """Request immediate visible-set synchronization via the watcher/coordinator path.
 
-def refresh_visibility_scoring_caches() -> None:
-    """Request immediate visible-set synchronization via the watcher/coordinator path."""
+    ``model_ids`` (from the visibility event payload) are re-scored even when the
+    visible-set diff does not contain them, as long as they are visible.
+
+    By default a request arriving while a sync is in flight is coalesced into it
+    and False is returned.  With ``wait`` the call blocks until a sync that saw
+    this request has finished here (waiting out another worker's rebuild for up
+    to _VISIBILITY_SYNC_WAIT_SEC) and returns whether it completed.
+    """
+    if model_ids:
+        with _visibility_sync_hint_forced_model_ids_lock:
+            for raw_mid in model_ids:
+                try:
+                    mid = int(raw_mid)
+                except (TypeError, ValueError):
+                    continue
+                if mid > 0:
+                    _visibility_sync_hint_forced_model_ids.add(mid)
     _visible_model_set_watch_wakeup.set()
-    if not _refresh_visibility_scoring_caches_inflight.acquire(blocking=False):
+    if wait:
+        _refresh_visibility_scoring_caches_inflight.acquire()
+    elif not _refresh_visibility_scoring_caches_inflight.acquire(blocking=False):
         _refresh_visibility_scoring_caches_pending.set()
         if _app_debug:
             _logger.debug('[visibility_sync] sync already in flight; coalescing request')
-        return
+        return False
 
+    deadline = time.time() + _VISIBILITY_SYNC_WAIT_SEC
+    synced = False
     try:
         while True:
             _refresh_visibility_scoring_caches_pending.clear()
-            with _visibility_sync_hint_forced_model_ids_lock:
-                forced_model_ids = sorted(_visibility_sync_hint_forced_model_ids)
-                _visibility_sync_hint_forced_model_ids.clear()
-            _sync_visible_model_set_once(
+            forced_model_ids = _take_forced_model_ids()
+            synced = _sync_visible_model_set_once(
                 source='manual',
                 allow_bootstrap_without_sync=False,
                 forced_model_ids=forced_model_ids,
             )
+            if not synced:
+                # Deferred (another worker holds the rebuild lock): keep the forced
+                # ids for the retry below or, without wait, for the next watcher tick.
+                _restore_forced_model_ids(forced_model_ids)
+                if wait and time.time() < deadline:
+                    time.sleep(1.0)
+                    continue
 
             if not _refresh_visibility_scoring_caches_pending.is_set():
                 break
@@ -2383,6 +3060,7 @@ def refresh_visibility_scoring_caches() -> None:
                 _logger.debug('[visibility_sync] processing coalesced sync request')
     finally:
         _refresh_visibility_scoring_caches_inflight.release()
+    return synced
 
 
 def _invalidate_model_score_cache_entries(model_ids: list[int] | tuple[int, ...]) -> None:
@@ -2396,10 +3074,13 @@ def _invalidate_model_score_cache_entries(model_ids: list[int] | tuple[int, ...]
             mids.add(mid)
     if not mids:
         return
+    global _model_score_generation
     with _model_score_cache_lock:
         for mid in mids:
             _model_score_cache.pop(mid, None)
+        _model_score_generation += 1
     _invalidate_model_score_disk_cache()
+    _run_model_scores_hooks('invalidate', tuple(sorted(mids)))
 
 
 def queue_visibility_sync_hint(model_id: int, trigger_source: str = '') -> bool:
@@ -2516,6 +3197,31 @@ def register_rankings_warmup_hook(hook: Callable[[dict, str], None]) -> None:
         _rankings_warmup_hooks.append(hook)
 
 
+def register_model_scores_hook(hook: Callable[[str, tuple | None], None]) -> None:
+    """Register a callback for model-score changes.
+
+    It is called as ``hook(trigger_source, model_ids)``: ``model_ids`` is None
+    when the whole table was rebuilt, adopted from another worker or loaded,
+    otherwise the ids whose entries changed or were dropped.
+    """
+    if not callable(hook):
+        return
+    with _rankings_warmup_hooks_lock:
+        if hook in _model_scores_hooks:
+            return
+        _model_scores_hooks.append(hook)
+
+
+def _run_model_scores_hooks(trigger_source: str, model_ids: tuple | None = None) -> None:
+    with _rankings_warmup_hooks_lock:
+        hooks = list(_model_scores_hooks)
+    for hook in hooks:
+        try:
+            hook(trigger_source, model_ids)
+        except Exception as e:
+            _logger.warning('[model_score_cache] scores hook failed: %s', e)
+
+
 def _run_rankings_warmup_hooks(rankings_result: dict, trigger_source: str) -> None:
     with _rankings_warmup_hooks_lock:
         hooks = list(_rankings_warmup_hooks)
@@ -2576,13 +3282,21 @@ def _denom_refresh_loop():
 
 
 def _visible_model_set_watch_loop():
-    """Periodically poll visible-model IDs and sync scoring/rankings for visibility diffs."""
+    """Safety poll of the visible-model IDs; visibility events wake it early."""
     while True:
         _visible_model_set_watch_wakeup.clear()
+        forced_model_ids = _take_forced_model_ids()
+        synced = False
         try:
-            _sync_visible_model_set_once(source='watcher', allow_bootstrap_without_sync=True)
+            synced = _sync_visible_model_set_once(
+                source='watcher',
+                allow_bootstrap_without_sync=True,
+                forced_model_ids=forced_model_ids,
+            )
         except Exception as e:
             _logger.warning('[visibility_sync] watcher tick failed: %s', e)
+        if not synced:
+            _restore_forced_model_ids(forced_model_ids)
         _visible_model_set_watch_wakeup.wait(_VISIBLE_MODEL_SET_WATCH_INTERVAL_SEC)
 
 
@@ -0,0 +1,103 @@
+"""In-process LRU of /api/search_fans results with single-flight coalescing.
+
+Keys are built by the caller from the canonicalised query plus the data
+versions it depends on (meta snapshot, perf columns), so a data change simply
+stops old keys from being hit.  Changes that carry no version (model scores,
+visibility) clear the cache through ``invalidate``, which the cache_event_bus
+handlers call.  Concurrent misses on the same key wait for the first
+request's computation instead of repeating it.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+_DEFAULT_MAX_ENTRIES = 512
+_DEFAULT_TTL_SEC = 120
+_FLIGHT_WAIT_SEC = 30.0  # a follower computes on its own after this long
+
+_logger = None
+_max_entries = _DEFAULT_MAX_ENTRIES
+_ttl_sec = _DEFAULT_TTL_SEC
+_lock = threading.Lock()
+_entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()  # key -> (stored_at, value)
+_inflight: Dict[Hashable, '_Flight'] = {}
+_generation = 0  # bumped by invalidate(); results computed before it are not stored
+
+
+class _Flight:
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def setup(logger=None, max_entries: int = _DEFAULT_MAX_ENTRIES, ttl_sec: int = _DEFAULT_TTL_SEC) -> None:
+    global _logger, _max_entries, _ttl_sec
+    _logger = logger
+    _max_entries = max(1, int(max_entries or _DEFAULT_MAX_ENTRIES))
+    _ttl_sec = max(1, int(ttl_sec or _DEFAULT_TTL_SEC))
+
+
+def get_or_compute(key: Hashable, compute: Callable[[], Any]) -> Any:
+    """Cached value for ``key``, computing it once across concurrent callers.
+
+    The value is shared between callers and must be treated as read-only.
+    """
+    now = time.time()
+    with _lock:
+        hit = _entries.get(key)
+        if hit is not None and now - hit[0] < _ttl_sec:
+            _entries.move_to_end(key)
+            return hit[1]
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _Flight()
+            _inflight[key] = flight
+            generation = _generation
+
+    if not leader:
+        if flight.event.wait(_FLIGHT_WAIT_SEC):
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        if _logger:
+            _logger.warning('[search_result_cache] waited %.0fs for an in-flight search; computing directly', _FLIGHT_WAIT_SEC)
+        return compute()
+
+    try:
+        value = compute()
+    except Exception as exc:
+        flight.error = exc
+        raise
+    else:
+        flight.value = value
+        with _lock:
+            if generation == _generation:
+                _entries[key] = (time.time(), value)
+                _entries.move_to_end(key)
+                while len(_entries) > _max_entries:
+                    _entries.popitem(last=False)
+        return value
+    finally:
+        with _lock:
+            if _inflight.get(key) is flight:
+                del _inflight[key]
+        flight.event.set()
+
+
+def invalidate() -> None:
+    """Drop every cached result (and keep in-flight ones from being stored)."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
+        _inflight.clear()
+
+
+def stats() -> dict:
+    with _lock:
+        return {'entries': len(_entries), 'inflight': len(_inflight), 'generation': _generation}
@@ -4672,15 +4672,14 @@ const SweepAudioPlayer = (() => {
     const rpmRounded = Math.round(rpm);
     const key = `${modelId}_${conditionId}_${rpmRounded}`;
     if (cache.has(key)) return { buffer: cache.get(key), key };
-    const resp = await fetch('/api/sweep-audio', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({
-        model_id: modelId,
-        condition_id: conditionId,
-        target_rpm: rpm,
-      })
+    // 使用 GET：响应可按 ETag 由浏览器缓存
+    const params = new URLSearchParams({
+      model_id: String(modelId),
+      condition_id: String(conditionId),
+      target_rpm: String(rpm),
+      format: 'wav16',
     });
+    const resp = await fetch(`/api/sweep-audio?${params}`);
     if (!resp.ok) {
       let msg = `HTTP ${resp.status}`;
       let errCode = null;
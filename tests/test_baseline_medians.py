@@ -0,0 +1,128 @@
+"""Vectorised baseline medians, segments and coverage weights against the per-point loops.
+
+Runs the baseline part of ``_do_denom_refresh`` for one condition of a
+synthetic catalog both ways; the benchmark uses 5k models (run with ``-s``
+for timings).
+"""
+import math
+import random
+import time
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('sqlalchemy')
+
+from app import scoring_system  # noqa: E402
+from app.curves.pchip_cache import build_pchip_model_with_opts, eval_pchip  # noqa: E402
+
+
+def _models(n, seed):
+    """(model_id, noise->airflow model, min_db, max_db) like _load_condition_n2a_curves."""
+    rng = random.Random(seed)
+    out = []
+    for mid in range(1, n + 1):
+        lo = rng.uniform(15, 35)
+        dbs = sorted({round(lo + rng.uniform(0, 25), 1) for _ in range(rng.randint(2, 7))} | {round(lo, 1)})
+        if len(dbs) < 2:
+            continue
+        airflow = sorted(rng.uniform(5, 95) for _ in dbs)
+        model = build_pchip_model_with_opts(dbs, airflow, 'noise_db')
+        if model:
+            out.append((mid, model, dbs[0], dbs[-1]))
+    return out
+
+
+def _safe_median(values):
+    vals = sorted(v for v in values if isinstance(v, (int, float)) and math.isfinite(v))
+    if not vals:
+        return None
+    n = len(vals)
+    m = n // 2
+    if n % 2 == 1:
+        return float(vals[m])
+    return float((vals[m - 1] + vals[m]) / 2.0)
+
+
+def _loop_median_points(models, db_grid, candidate_min):
+    points = []
+    for db in db_grid:
+        vals = []
+        for _, n2a, min_db, max_db in models:
+            if db < min_db or db > max_db:
+                continue
+            try:
+                val = eval_pchip(n2a, db)
+            except Exception:
+                val = None
+            if val is not None and math.isfinite(val) and val > 0:
+                vals.append(float(val))
+        if len(vals) >= candidate_min:
+            med = _safe_median(vals)
+            if med is not None and med > 0:
+                points.append((db, med, len(vals)))
+    return points
+
+
+def _loop_longest_segment(points):
+    best, cur = [], points[:1]
+    for point in points[1:]:
+        if abs(point[0] - cur[-1][0]) <= scoring_system.BASELINE_DB_STEP * scoring_system.BASELINE_SEGMENT_CONTIGUITY_FACTOR:
+            cur.append(point)
+        else:
+            if len(cur) > len(best):
+                best = cur
+            cur = [point]
+    return cur if len(cur) > len(best) else best
+
+
+def _loop_weights(models, grid):
+    return [sum(1 for _, _, lo, hi in models if lo <= db <= hi) / len(models) for db in grid]
+
+
+def _grid(models):
+    return scoring_system._build_unified_db_grid(
+        min(m[2] for m in models), max(m[3] for m in models), scoring_system.BASELINE_DB_STEP)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_vectorised_baseline_matches_the_loops(seed):
+    models = _models(300, seed)
+    grid = _grid(models)
+    candidate_min = scoring_system._coverage_requirements(len(models))[2]
+    stack = scoring_system._PchipStack([m[1] for m in models])
+
+    points = scoring_system._median_points(stack.eval_grid(grid), grid, candidate_min)
+    expected = _loop_median_points(models, grid, candidate_min)
+    assert [(p[0], p[2]) for p in points] == [(p[0], p[2]) for p in expected]
+    assert [p[1] for p in points] == pytest.approx([p[1] for p in expected], rel=1e-9)
+
+    # Drop a few points so the segment detection has gaps to work with.
+    gappy = [p for i, p in enumerate(expected) if i % 7 not in (3, 4)]
+    assert scoring_system._longest_contiguous_segment(gappy) == _loop_longest_segment(gappy)
+
+    weights = (stack.domain_mask(grid).sum(axis=0) / len(models)).tolist()
+    assert weights == pytest.approx(_loop_weights(models, grid), abs=1e-12)
+
+
+def test_vectorised_baseline_benchmark():
+    models = _models(5000, seed=11)
+    grid = _grid(models)
+    candidate_min = scoring_system._coverage_requirements(len(models))[2]
+
+    start = time.perf_counter()
+    loop_points = _loop_median_points(models, grid, candidate_min)
+    _loop_longest_segment(loop_points)
+    _loop_weights(models, grid)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stack = scoring_system._PchipStack([m[1] for m in models])
+    points = scoring_system._median_points(stack.eval_grid(grid), grid, candidate_min)
+    scoring_system._longest_contiguous_segment(points)
+    stack.domain_mask(grid).sum(axis=0)
+    vec = time.perf_counter() - start
+
+    print(f'\n[baseline] {len(models)} models x {len(grid)} dB points: loops {loop * 1e3:.0f} ms, '
+          f'vectorised {vec * 1e3:.0f} ms per condition')
+    assert vec < loop
@@ -0,0 +1,71 @@
+"""Parity of the batched raw-score path with the per-curve reference."""
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('sqlalchemy')
+
+from app import scoring_system  # noqa: E402
+from app.curves.pchip_cache import build_pchip_model_with_opts  # noqa: E402
+
+GRID = [30.0 + 0.75 * i for i in range(21)]  # 30 .. 45 dB
+WEIGHTS = [0.2 + 0.04 * i for i in range(len(GRID))]
+
+CURVES = {
+    'covers_grid': ([25, 32, 38, 44, 50], [20, 31, 44, 58, 70]),
+    'middle_only': ([34.2, 36, 39.1, 41.7], [35, 40, 47, 53]),
+    'low_edge': ([20, 27, 33.4], [10, 18, 29]),
+    'high_edge': ([43.1, 47, 52], [60, 66, 75]),
+    'outside_grid': ([50, 55, 60], [70, 80, 90]),
+    'partly_non_positive': ([30, 33, 36, 40, 45], [-8, -2, 5, 20, 40]),
+    'flat': ([31, 37, 43], [25, 25, 25]),
+}
+
+BASELINES = {
+    'normal': {'intercept': 1.2, 'slope': 0.06},
+    'overflows_at_top': {'intercept': -700.0, 'slope': 16.0},  # exp() overflows above ~43.7 dB
+    'zero': {'intercept': float('-inf'), 'slope': 0.0},
+    'nan': {'intercept': float('nan'), 'slope': 0.05},
+}
+
+
+def _models():
+    return {name: build_pchip_model_with_opts(xs, ys, 'noise_db') for name, (xs, ys) in CURVES.items()}
+
+
+@pytest.mark.parametrize('adaptive', [True, False], ids=['adaptive', 'equal_weights'])
+@pytest.mark.parametrize('baseline', sorted(BASELINES))
+def test_batched_raw_scores_match_per_curve(monkeypatch, adaptive, baseline):
+    monkeypatch.setattr(scoring_system, 'RAW_SCORE_ADAPTIVE_WEIGHTS', adaptive)
+    fit = BASELINES[baseline]
+    denom_entry = {
+        'baseline_fit': fit,
+        'valid_db_min': GRID[0],
+        'valid_db_max': GRID[-1],
+        'cond_db_grid': GRID,
+        'cond_point_weights': WEIGHTS,
+    }
+    models = _models()
+    names = sorted(models)
+
+    raw, counts = scoring_system._batched_curve_raw_scores(
+        scoring_system._PchipStack([models[n] for n in names]), fit, GRID, WEIGHTS)
+
+    for i, name in enumerate(names):
+        expected = scoring_system._compute_curve_raw_score_for_n2a(denom_entry, models[name])
+        if expected is None:
+            assert math.isnan(raw[i]) and counts[i] == 0, name
+        else:
+            assert counts[i] == expected[1], name
+            assert raw[i] == pytest.approx(expected[0], rel=1e-9), name
+
+
+def test_batched_raw_scores_sample_partial_overlap():
+    fit = BASELINES['normal']
+    models = _models()
+    raw, counts = scoring_system._batched_curve_raw_scores(
+        scoring_system._PchipStack([models['middle_only'], models['outside_grid']]), fit, GRID, WEIGHTS)
+    in_domain = [db for db in GRID if 34.2 <= db <= 41.7]
+    assert counts.tolist() == [len(in_domain), 0]
+    assert math.isfinite(raw[0]) and math.isnan(raw[1])
@@ -0,0 +1,178 @@
+"""Snapshot immutability and getter cost of model_meta_cache records."""
+import importlib
+import sys
+import threading
+import time
+import tracemalloc
+import types
+
+import pytest
+
+ROWS = [
+    {'model_id': 1, 'brand_id': 10, 'brand_name_zh': '品牌', 'brand_name_en': 'Brand', 'model_name': 'A120',
+     'size': 120, 'effective_visibility_scope': 1, '_watermark': 't1'},
+    {'model_id': 2, 'brand_id': 10, 'brand_name_zh': '品牌', 'brand_name_en': 'Brand', 'model_name': 'B140',
+     'size': 140, 'effective_visibility_scope': 1, '_watermark': 't1'},
+]
+
+
+@pytest.fixture
+def meta_cache(monkeypatch):
+    links = types.ModuleType('app.purchase_links')
+    links.get_active_purchase_links_by_model_ids = lambda ids: {
+        1: [{'platform': 'jd', 'url': 'https://example.invalid/1', 'tags': ['a', 'b']}],
+    }
+    monkeypatch.setitem(sys.modules, 'app.purchase_links', links)
+    import app
+    monkeypatch.setattr(app, 'purchase_links', links, raising=False)
+
+    from app import model_meta_cache
+    module = importlib.reload(model_meta_cache)
+    module.setup(lambda sql, params=None: [dict(r) for r in ROWS])
+    return module
+
+
+def test_meta_record_rejects_mutation(meta_cache):
+    meta = meta_cache.get_model_meta(1)
+    assert meta['model_name'] == 'A120'
+
+    with pytest.raises(TypeError):
+        meta['model_name'] = 'X'
+    with pytest.raises(TypeError):
+        del meta['model_name']
+    with pytest.raises(TypeError):
+        meta.update({'size': 1})
+    with pytest.raises(TypeError):
+        meta.pop('size')
+    with pytest.raises(TypeError):
+        meta.popitem()
+    with pytest.raises(TypeError):
+        meta.setdefault('new_key', 1)
+    with pytest.raises(TypeError):
+        meta.clear()
+    with pytest.raises(TypeError):
+        meta |= {'size': 1}
+    assert meta_cache.get_model_meta(1)['size'] == 120
+
+
+def test_nested_values_are_frozen(meta_cache):
+    meta = meta_cache.get_model_meta(1)
+    links = meta['purchase_links']
+    assert isinstance(links, tuple)
+    with pytest.raises(AttributeError):
+        links.append({'platform': 'tb'})
+    with pytest.raises(TypeError):
+        links[0]['url'] = 'https://example.invalid/evil'
+    with pytest.raises(TypeError):
+        links[0].update(url='x')
+    assert isinstance(links[0]['tags'], tuple)
+    with pytest.raises(TypeError):
+        links[0]['tags'][0] = 'z'
+
+
+def test_catalog_and_index_getters_are_read_only(meta_cache):
+    catalog = meta_cache.get_all_model_meta()
+    with pytest.raises(TypeError):
+        catalog[3] = {}
+    with pytest.raises(TypeError):
+        catalog.pop(1)
+    many = meta_cache.get_many_model_meta([1, 2])
+    with pytest.raises(TypeError):
+        many[1]['size'] = 0
+    assert isinstance(meta_cache.get_model_ids_for_brand(10), tuple)
+
+
+def test_copies_are_mutable_and_do_not_leak(meta_cache):
+    meta = meta_cache.get_model_meta(2)
+    copy = dict(meta)
+    copy['model_name'] = 'changed'
+    assert meta_cache.get_model_meta(2)['model_name'] == 'B140'
+
+
+def test_transient_watermark_failure_keeps_delta_enabled(meta_cache):
+    def _flaky(sql, params=None):
+        if '_watermark' in sql and 'FROM available_models_info_view' in sql and 'brand_name_zh' not in sql:
+            raise RuntimeError('Lost connection to MySQL server during query')
+        return [dict(r) for r in ROWS]
+
+    meta_cache.setup(_flaky)
+    meta_cache.refresh()
+    assert meta_cache._delta_supported
+
+    def _missing_column(sql, params=None):
+        if '_watermark' in sql and 'brand_name_zh' not in sql:
+            raise RuntimeError("(1054, \"Unknown column 'update_date' in 'field list'\")")
+        return [dict(r) for r in ROWS]
+
+    meta_cache.setup(_missing_column)
+    meta_cache.refresh()
+    assert not meta_cache._delta_supported
+
+
+def test_refresh_hooks_run_only_when_the_snapshot_changes(meta_cache):
+    meta_cache.refresh()
+    first = meta_cache.get_snapshot_version()
+    seen = []
+    meta_cache.register_refresh_hook(seen.append)
+    meta_cache.refresh()
+    assert seen == []  # identical rows keep the version
+
+    ROWS.append(dict(ROWS[1], model_id=3, model_name='C120'))
+    try:
+        meta_cache.refresh()
+    finally:
+        ROWS.pop()
+    assert seen == [first + 1]
+
+
+def test_snapshot_digest_follows_content_not_refresh_count(meta_cache):
+    digest = meta_cache.get_snapshot_digest()
+    meta_cache.refresh()
+    assert meta_cache.get_snapshot_digest() == digest
+
+    ROWS.append(dict(ROWS[1], model_id=3, model_name='C120'))
+    try:
+        meta_cache.refresh()
+        changed = meta_cache.get_snapshot_digest()
+    finally:
+        ROWS.pop()
+    assert changed != digest
+    meta_cache.refresh()
+    assert meta_cache.get_snapshot_digest() == digest
+
+
+def test_snapshot_getters_benchmark_against_copying_getters(meta_cache):
+    rows = [
+        dict(ROWS[i % 2], model_id=i, model_name=f'M{i}', thickness=25, reference_price=9.9, rgb_flags=i % 4)
+        for i in range(1, 20_001)
+    ]
+    meta_cache.setup(lambda sql, params=None: [dict(r) for r in rows])
+    meta_cache.refresh()
+    lock = threading.RLock()
+    snapshot = dict(meta_cache.get_all_model_meta())
+
+    def _copying_get_all():
+        # The getter before snapshots: a fresh copy of every record under the cache lock.
+        with lock:
+            return {mid: dict(meta) for mid, meta in snapshot.items()}
+
+    def _measure(fn, calls=20):
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(calls):
+            result = fn()
+        elapsed = (time.perf_counter() - start) / calls
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        return elapsed, peak
+
+    copy_sec, copy_peak = _measure(_copying_get_all)
+    snap_sec, snap_peak = _measure(meta_cache.get_all_model_meta)
+    print(f'\n[meta getters] 20000 models: copy {copy_sec * 1e3:.2f} ms / {copy_peak / 1e6:.1f} MB peak, '
+          f'snapshot {snap_sec * 1e6:.1f} us / {snap_peak / 1e3:.1f} kB peak')
+
+    assert meta_cache.get_all_model_meta() is meta_cache.get_all_model_meta()
+    assert meta_cache.get_model_meta(7) is meta_cache.get_all_model_meta()[7]
+    assert snap_sec < copy_sec
+    assert snap_peak * 100 < copy_peak
@@ -0,0 +1,243 @@
+"""Parity and latency of the model_meta_cache filter and suggest indexes.
+
+Both indexes are compared against the linear scans they replaced on a
+synthetic 20k-model catalog. Timings are printed (run with ``-s``); the
+assertions only require the index to beat the scan.
+"""
+import random
+import time
+
+import pytest
+
+from app.model_meta_cache import ModelFilterIndex, ModelSuggestIndex
+
+CATALOG_SIZE = 20_000
+CHAIN_TYPE_DAISY_CHAIN = 3
+REVERSE_OPT_AVAILABLE = 1
+
+_SIZES = (80, 92, 120, 140, 200, None, '120')
+_BEARINGS = ('DBB', 'dbb ', 'FDB', 'LDB', '', None)
+_BRANDS = [(f'品牌{i}', f'Brand{i}') for i in range(60)]
+_SYLLABLES = ('ar', 'ctic', 'pro', 'max', 'flow', 'ex', 'tl', 'c', 'gt', 'x', 'rs', 'air', 'neo', 'zen')
+
+
+def _catalog(n=CATALOG_SIZE, seed=7):
+    rng = random.Random(seed)
+    data = {}
+    for model_id in range(1, n + 1):
+        brand_zh, brand_en = rng.choice(_BRANDS)
+        name = ''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 3))).upper()
+        data[model_id] = {
+            'model_id': model_id,
+            'brand_name_zh': brand_zh,
+            'brand_name_en': brand_en,
+            'model_name': f'{name}-{rng.randint(10, 999)}',
+            'size': rng.choice(_SIZES),
+            'thickness': rng.choice((15, 20, 25, 25, 28, 30, None, 'bad')),
+            'reference_price': rng.choice((None, 0, round(rng.uniform(5, 300), 1))),
+            'max_speed': rng.choice((None, rng.randint(500, 5000))),
+            'rgb_flags': rng.choice((0, 0, 1, 2, 3, 4, 6, None, 'x')),
+            'color_flags': rng.choice((0, 1, 2, 4, 5, None)),
+            'speed_switch_type_id': rng.choice((0, 0, 1, 2, None)),
+            'chain_type_id': rng.choice((0, 1, CHAIN_TYPE_DAISY_CHAIN, None)),
+            'bearing': rng.choice(_BEARINGS),
+            'reverse_opt': rng.choice((0, REVERSE_OPT_AVAILABLE, None)),
+        }
+    return data
+
+
+def _scan_filter(all_meta, *, size_values=None, thickness_min=None, thickness_max=None, price_min=None,
+                 price_max=None, max_speed_min=None, max_speed_max=None, rgb_mask=None,
+                 rgb_include_none=False, other_features=None, color_mask=None):
+    """The per-request linear scan that ModelFilterIndex replaced."""
+    _rgb_mask = 0
+    try:
+        _rgb_mask = int(rgb_mask or 0)
+    except (TypeError, ValueError):
+        _rgb_mask = 0
+    _rgb_include_none = bool(rgb_include_none)
+    _has_rgb_filter = _rgb_include_none or _rgb_mask > 0
+    _other_set = {str(x).strip() for x in (other_features or []) if str(x).strip()}
+    _sz_set = {str(v) for v in (size_values or [])}
+    result = set()
+    for model_id, meta in all_meta.items():
+        if _sz_set:
+            try:
+                if str(meta.get('size') or '') not in _sz_set:
+                    continue
+            except (TypeError, ValueError):
+                continue
+        if thickness_min is not None and thickness_max is not None:
+            try:
+                t = int(meta.get('thickness') or 0)
+                if not (thickness_min <= t <= thickness_max):
+                    continue
+            except (TypeError, ValueError):
+                continue
+        if price_min is not None and price_max is not None:
+            try:
+                p = float(meta.get('reference_price') or 0)
+                if not (price_min <= p <= price_max):
+                    continue
+            except (TypeError, ValueError):
+                continue
+        if max_speed_min is not None and max_speed_max is not None:
+            try:
+                ms = int(meta.get('max_speed') or 0)
+                if not (max_speed_min <= ms <= max_speed_max):
+                    continue
+            except (TypeError, ValueError):
+                continue
+        if _has_rgb_filter:
+            try:
+                flags = int(meta.get('rgb_flags') or 0)
+            except (TypeError, ValueError):
+                flags = 0
+            rgb_matched = False
+            if _rgb_include_none and flags == 0:
+                rgb_matched = True
+            if _rgb_mask > 0 and (flags & _rgb_mask) != 0:
+                rgb_matched = True
+            if not rgb_matched:
+                continue
+        if 'speed_switch' in _other_set:
+            try:
+                if int(meta.get('speed_switch_type_id') or 0) <= 0:
+                    continue
+            except (TypeError, ValueError):
+                continue
+        if 'chain' in _other_set:
+            try:
+                if int(meta.get('chain_type_id') or 0) != CHAIN_TYPE_DAISY_CHAIN:
+                    continue
+            except (TypeError, ValueError):
+                continue
+        if 'DBB' in _other_set or 'no-DBB' in _other_set:
+            bearing = str(meta.get('bearing') or '').strip().upper()
+            if 'DBB' in _other_set and bearing != 'DBB':
+                continue
+            if 'no-DBB' in _other_set and bearing == 'DBB':
+                continue
+        if color_mask:
+            try:
+                if (int(meta.get('color_flags') or 0) & color_mask) == 0:
+                    continue
+            except (TypeError, ValueError):
+                continue
+        if 'reverse_opt' in _other_set:
+            try:
+                if int(meta.get('reverse_opt') or 0) != REVERSE_OPT_AVAILABLE:
+                    continue
+            except (TypeError, ValueError):
+                continue
+        result.add(model_id)
+    return result
+
+
+def _random_filters(rng, count):
+    features = ('speed_switch', 'chain', 'DBB', 'no-DBB', 'reverse_opt', ' ')
+    out = [{}]
+    for _ in range(count):
+        f = {}
+        if rng.random() < 0.5:
+            f['size_values'] = rng.sample(('80', '92', '120', '140', '200', ''), rng.randint(1, 3))
+        if rng.random() < 0.4:
+            lo = rng.choice((0, 15, 20, 25))
+            f['thickness_min'], f['thickness_max'] = lo, lo + rng.choice((0, 5, 10))
+        if rng.random() < 0.4:
+            lo = rng.uniform(0, 150)
+            f['price_min'], f['price_max'] = lo, lo + rng.uniform(0, 150)
+        if rng.random() < 0.3:
+            lo = rng.randint(0, 3000)
+            f['max_speed_min'], f['max_speed_max'] = lo, lo + rng.randint(0, 2000)
+        if rng.random() < 0.4:
+            f['rgb_mask'] = rng.choice((0, 1, 2, 6, 'bad'))
+            f['rgb_include_none'] = rng.random() < 0.5
+        if rng.random() < 0.5:
+            f['other_features'] = rng.sample(features, rng.randint(1, 2))
+        if rng.random() < 0.3:
+            f['color_mask'] = rng.choice((1, 2, 4, 5))
+        out.append(f)
+    return out
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return _catalog()
+
+
+def _select(idx, f):
+    return idx.select(chain_type_id=CHAIN_TYPE_DAISY_CHAIN, reverse_opt_value=REVERSE_OPT_AVAILABLE, **f)
+
+
+def test_filter_index_matches_the_linear_scan(catalog):
+    idx = ModelFilterIndex(catalog)
+    for f in _random_filters(random.Random(11), 300):
+        assert _select(idx, f) == _scan_filter(catalog, **f), f
+
+
+def test_filter_index_benchmark_against_the_linear_scan(catalog):
+    filters = _random_filters(random.Random(13), 50)
+    start = time.perf_counter()
+    idx = ModelFilterIndex(catalog)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for f in filters:
+        _scan_filter(catalog, **f)
+    scan = time.perf_counter() - start
+    start = time.perf_counter()
+    for f in filters:
+        _select(idx, f)
+    indexed = time.perf_counter() - start
+
+    print(f'\n[filter] {CATALOG_SIZE} models, {len(filters)} queries: scan {scan * 1e3:.1f} ms, '
+          f'index {indexed * 1e3:.1f} ms (build {build * 1e3:.1f} ms once per refresh)')
+    assert indexed < scan
+
+
+def _scan_suggest(all_meta, q):
+    """The per-keystroke substring scan that ModelSuggestIndex replaced."""
+    q_lower = q.lower()
+    return {
+        mid for mid, meta in all_meta.items()
+        if q_lower in (meta.get('model_name') or '').lower()
+        or q_lower in (meta.get('brand_name_zh') or '').lower()
+        or q_lower in (meta.get('brand_name_en') or '').lower()
+    }
+
+
+def _typed_prefixes(catalog, rng, words):
+    """Every prefix (>= 2 chars) of ``words`` names, as a user would type them."""
+    out = []
+    for _ in range(words):
+        meta = catalog[rng.randint(1, len(catalog))]
+        word = rng.choice((meta['model_name'], meta['brand_name_en'], meta['brand_name_zh'],
+                           meta['model_name'].lower()[1:]))
+        out.extend(word[:n] for n in range(2, len(word) + 1))
+    return out + ['zz', 'no-such-model', 'Ar', 'D1', '-1']
+
+
+def test_suggest_index_matches_the_substring_scan(catalog):
+    idx = ModelSuggestIndex(catalog)
+    for q in _typed_prefixes(catalog, random.Random(17), 40):
+        assert set(idx.search(q)) == _scan_suggest(catalog, q), q
+    assert idx.search('a') == [] and idx.search('') == []
+
+
+def test_suggest_index_benchmark_replaying_typed_prefixes(catalog):
+    queries = _typed_prefixes(catalog, random.Random(19), 20)
+    idx = ModelSuggestIndex(catalog)
+
+    start = time.perf_counter()
+    for q in queries:
+        _scan_suggest(catalog, q)
+    scan = time.perf_counter() - start
+    start = time.perf_counter()
+    for q in queries:
+        idx.search(q)
+    indexed = time.perf_counter() - start
+
+    print(f'\n[suggest] {CATALOG_SIZE} models, {len(queries)} keystrokes: scan {scan / len(queries) * 1e3:.2f} ms, '
+          f'index {indexed / len(queries) * 1e3:.2f} ms per keystroke')
+    assert indexed < scan
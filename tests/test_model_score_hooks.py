@@ -0,0 +1,32 @@
+"""Model-score hooks fire only for score changes, with the changed model ids."""
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('sqlalchemy')
+
+from app import scoring_system  # noqa: E402
+
+
+@pytest.fixture
+def hook_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(scoring_system, '_model_scores_hooks', [])
+    monkeypatch.setattr(scoring_system, '_model_score_cache', {})
+    scoring_system.register_model_scores_hook(lambda source, ids: calls.append((source, ids)))
+    return calls
+
+
+def test_warm_scores_runs_hooks_only_when_the_entry_changes(monkeypatch, hook_calls):
+    scores = {42: {1: {'score_total': 70}}}
+    monkeypatch.setattr(scoring_system, '_compute_model_score_for_model', lambda mid: scores.get(mid))
+    table_generation = scoring_system.get_model_score_generation(table_only=True)
+
+    scoring_system.refresh_model_score_cache(42)
+    scoring_system.refresh_model_score_cache(42)
+    assert hook_calls == [('warm_scores', (42,))]
+
+    scores[42] = {1: {'score_total': 75}}
+    scoring_system.refresh_model_score_cache(42)
+    scoring_system.refresh_model_score_cache(7)  # no score: nothing cached, nothing reported
+    assert hook_calls == [('warm_scores', (42,)), ('warm_scores', (42,))]
+    assert scoring_system.get_model_score_generation(table_only=True) == table_generation
@@ -0,0 +1,166 @@
+"""Vectorised effective values of perf_columns_cache against the per-model loop."""
+import math
+import random
+import threading
+import time
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('sqlalchemy')
+
+from app import perf_columns_cache  # noqa: E402
+from app.curves import perf_model_service  # noqa: E402
+from app.curves.pchip_cache import build_pchip_model_with_opts, eval_pchip  # noqa: E402
+
+CONDITION_ID = 7
+
+
+def _catalog(n, seed):
+    rng = random.Random(seed)
+    rows, models = [], {}
+    for mid in range(1, n + 1):
+        count = rng.randint(1, 7)
+        rpms = sorted(rng.sample(range(400, 3000, 50), count))
+        noise = sorted(round(rng.uniform(15, 50), 1) for _ in range(count))
+        airflow = sorted(round(rng.uniform(10, 90), 2) for _ in range(count))
+        if rng.random() < 0.1 and count > 1:
+            rpms[-1] = rpms[-2]  # duplicate top point
+        for r, d, a in zip(rpms, noise, airflow):
+            rows.append({'model_id': mid, 'rpm': r, 'noise_db': d if rng.random() > 0.05 else None, 'airflow': a})
+
+        def _fit(xs, ys, axis):
+            kind = rng.random()
+            if kind < 0.08:
+                return None
+            if kind < 0.12:
+                return {}
+            if kind < 0.15:
+                return {'x': 'bad', 'y': [], 'm': []}
+            if kind < 0.2:
+                return {'x': [xs[0]], 'y': [ys[0]], 'm': [0.0], 'x0': 0, 'x1': None}
+            lo = rng.randint(0, max(0, len(xs) - 2))
+            model = build_pchip_model_with_opts(list(xs[lo:]), list(ys[lo:]), axis)
+            if model and kind > 0.9:
+                model = dict(model, x0=model['x0'] + 5, x1=model['x1'] - 5)
+            return model
+
+        models[f'{mid}_{CONDITION_ID}'] = {'pchip': {
+            'rpm_to_airflow': _fit(rpms, airflow, 'rpm'),
+            'rpm_to_noise_db': _fit(rpms, noise, 'rpm'),
+            'noise_to_airflow': _fit(noise, airflow, 'noise_db'),
+            'noise_to_rpm': _fit(noise, rpms, 'noise_db'),
+        }, 'meta': {'data_hash': f'h{mid}'}}
+    return rows, models
+
+
+@pytest.fixture
+def columns_for(monkeypatch):
+    def _make(n, seed=3):
+        rows, models = _catalog(n, seed)
+        monkeypatch.setattr(perf_model_service, 'get_perf_models', lambda pairs: models)
+        perf_columns_cache.setup(lambda sql, params=None: rows)
+        return perf_columns_cache._build(CONDITION_ID)
+    return _make
+
+
+def _as_float(value):
+    try:
+        f = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return f if math.isfinite(f) else math.nan
+
+
+def _eval_fit(model, lv, *, clamp=True):
+    try:
+        lx = max(float(model.get('x0') or lv), min(lv, float(model.get('x1') or lv))) if clamp else lv
+        return lx, _as_float(eval_pchip(model, lx))
+    except Exception:
+        return lv, math.nan
+
+
+def _loop_evaluate(cols, ax, lv):
+    """The per-model loop that the vectorised evaluation replaced."""
+    c = cols.axes[ax]
+    n = len(cols)
+    x, y, comp = np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+    source = np.zeros(n, dtype=np.int8)
+    with np.errstate(invalid='ignore'):
+        in_domain = lv >= c.x_min - 1e-9
+        at_top = in_domain & (lv >= c.x_max - 1e-9)
+    x[at_top], y[at_top], comp[at_top] = c.top[at_top].T
+    tol = 0.05 if ax == 'noise_db' else 0.0
+    for i in np.flatnonzero(in_domain & ~at_top):
+        xs, ys, cs = c.points[i]
+        hit = None
+        for j, xv in enumerate(xs):
+            if (tol == 0.0 and xv == lv) or (tol > 0.0 and abs(xv - lv) <= tol):
+                hit = j
+                break
+        if hit is None and c.fit[i] is not None:
+            lx, fy = _eval_fit(c.fit[i], lv)
+            if not math.isnan(fy):
+                x[i], y[i], source[i] = lx, fy, perf_columns_cache.SOURCE_FIT
+                if c.companion[i] is not None:
+                    comp[i] = _eval_fit(c.companion[i], lx, clamp=False)[1]
+                continue
+        if hit is None:
+            hit = min(range(len(xs)), key=lambda j: abs(xs[j] - lv))
+        x[i], y[i], comp[i] = xs[hit], ys[hit], cs[hit]
+    return x, y, comp, source
+
+
+def _limits(ax, rng, count):
+    if ax == 'rpm':
+        return [float(rng.randrange(300, 3100, 25)) for _ in range(count)]
+    return [round(rng.uniform(10, 55), 2) for _ in range(count)]
+
+
+@pytest.mark.parametrize('ax', perf_columns_cache.AXES)
+def test_vectorised_effective_values_match_the_per_model_loop(columns_for, ax):
+    cols = columns_for(400)
+    for lv in _limits(ax, random.Random(5), 60):
+        res = cols._evaluate(ax, lv)
+        x, y, comp, source = _loop_evaluate(cols, ax, lv)
+        np.testing.assert_allclose(res.x, x, rtol=1e-12, atol=1e-9, equal_nan=True, err_msg=str(lv))
+        np.testing.assert_allclose(res.airflow, y, rtol=1e-12, atol=1e-9, equal_nan=True, err_msg=str(lv))
+        np.testing.assert_allclose(res.companion, comp, rtol=1e-12, atol=1e-9, equal_nan=True, err_msg=str(lv))
+        assert (res.source[res.valid] == source[res.valid]).all(), lv
+
+
+def test_vectorised_effective_values_benchmark(columns_for):
+    cols = columns_for(5000, seed=9)
+    limits = _limits('rpm', random.Random(7), 10)
+    start = time.perf_counter()
+    for lv in limits:
+        _loop_evaluate(cols, 'rpm', lv)
+    loop = time.perf_counter() - start
+    start = time.perf_counter()
+    for lv in limits:
+        cols._evaluate('rpm', lv)
+    vec = time.perf_counter() - start
+    print(f'\n[perf columns] 5000 models, {len(limits)} limits: loop {loop / len(limits) * 1e3:.1f} ms, '
+          f'vectorised {vec / len(limits) * 1e3:.1f} ms per (axis, limit)')
+    assert vec < loop
+
+
+def test_cold_condition_is_built_in_the_background(monkeypatch):
+    rows, models = _catalog(20, seed=1)
+    release = threading.Event()
+
+    def _slow_fetch(sql, params=None):
+        release.wait(5.0)
+        return rows
+
+    monkeypatch.setattr(perf_model_service, 'get_perf_models', lambda pairs: models)
+    monkeypatch.setattr(perf_columns_cache, '_columns', {})
+    perf_columns_cache.setup(_slow_fetch, cold_wait_sec=0.05)
+    with pytest.raises(perf_columns_cache.ColumnsNotReady):
+        perf_columns_cache.get_condition_columns(CONDITION_ID)
+
+    perf_columns_cache.setup(_slow_fetch, cold_wait_sec=5.0)
+    release.set()
+    cols = perf_columns_cache.get_condition_columns(CONDITION_ID)
+    assert len(cols) == 20
+    assert perf_columns_cache.get_condition_columns(CONDITION_ID) is cols
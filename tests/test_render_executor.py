@@ -0,0 +1,299 @@
+"""Load tests for the bounded sweep-audio render executor.
+
+Renders are simulated against a local stub audio source (an in-memory sine)
+so the executor's admission control can be exercised without soundfile or
+spectrum caches. Ordering between requests is driven by events, never by
+sleeping.
+"""
+import math
+import threading
+import time
+
+import pytest
+
+from app.audio_services import render_executor
+from app.audio_services.render_executor import RenderRejected, _RenderExecutor
+
+STUB_FS = 8000
+STUB_SOURCE = [math.sin(2 * math.pi * 440 * i / STUB_FS) for i in range(STUB_FS * 2)]
+
+
+class _Probe:
+    """Counts renders and the peak number running at once; renders block on ``gate``."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+        self.cancelled = 0
+
+    def render(self, rpm: float):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        self.started.set()
+        try:
+            while not self.gate.wait(0.005):
+                if render_executor.is_cancelled():
+                    with self.lock:
+                        self.cancelled += 1
+                    raise RuntimeError('cancelled')
+            start = int(rpm) % (len(STUB_SOURCE) - STUB_FS)
+            return STUB_SOURCE[start:start + STUB_FS]
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def _wait_for(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        if time.monotonic() > deadline:
+            pytest.fail('condition not reached in time')
+        threading.Event().wait(0.002)
+
+
+def _wait_idle(executor, timeout=5.0):
+    _wait_for(lambda: executor.stats()['pending'] == 0, timeout)
+
+
+class _Request(threading.Thread):
+    """One ``executor.run`` call on its own thread, recording its outcome."""
+
+    def __init__(self, executor, fn, barrier=None, **kwargs):
+        super().__init__(daemon=True)
+        self.executor, self.fn, self.barrier, self.kwargs = executor, fn, barrier, kwargs
+        self.outcome = None
+        self.start()
+
+    def run(self):
+        if self.barrier is not None:
+            self.barrier.wait()
+        try:
+            self.outcome = ('ok', self.executor.run(self.fn, timeout=5.0, **self.kwargs))
+        except RenderRejected as e:
+            self.outcome = (e.status, e.code)
+
+
+def _waiter_count(executor, key):
+    with executor._lock:
+        flight = executor._flights.get(key)
+        return len(flight.waiters) if flight is not None else 0
+
+
+def test_burst_from_many_users_is_bounded_and_rejects_overflow_with_503():
+    executor = _RenderExecutor(workers=2, max_pending=4, max_per_uid=2)
+    probe = _Probe()
+    barrier = threading.Barrier(20)
+    requests = [_Request(executor, lambda i=i: probe.render(1000 + i), barrier, uid=f'u{i}') for i in range(20)]
+
+    _wait_for(lambda: sum(r.outcome is not None for r in requests) == 16)
+    assert executor.stats()['pending'] == 4
+    probe.gate.set()
+    for r in requests:
+        r.join()
+
+    outcomes = [r.outcome for r in requests]
+    assert outcomes.count((503, 'RENDER_BUSY')) == 16
+    assert sum(o[0] == 'ok' for o in outcomes) == 4
+    assert probe.peak <= 2
+    _wait_idle(executor)
+
+
+def test_same_uid_last_request_wins():
+    executor = _RenderExecutor(workers=1, max_pending=8, max_per_uid=2)
+    probe = _Probe()
+    blocker = _Request(executor, lambda: probe.render(1), uid='other')
+    _wait_for(probe.started.is_set)
+
+    drags = []
+    for i in range(5):
+        drags.append(_Request(executor, lambda i=i: probe.render(2000 + i), uid='dragger', key=f'rpm{i}'))
+        _wait_for(lambda i=i: _waiter_count(executor, f'rpm{i}') == 1)
+    probe.gate.set()
+    for r in drags + [blocker]:
+        r.join()
+
+    assert drags[4].outcome[0] == 'ok'
+    assert all(r.outcome == (409, 'RENDER_SUPERSEDED') for r in drags[:4])
+    assert probe.calls == 2  # the blocker and the last drag
+    _wait_idle(executor)
+
+
+def test_same_key_requests_share_one_render_without_superseding():
+    executor = _RenderExecutor(workers=2, max_pending=2, max_per_uid=1)
+    probe = _Probe()
+    barrier = threading.Barrier(6)
+    requests = [_Request(executor, lambda: probe.render(1500), barrier, uid='u', key='etag-1') for _ in range(6)]
+
+    _wait_for(lambda: _waiter_count(executor, 'etag-1') == 6)
+    probe.gate.set()
+    for r in requests:
+        r.join()
+
+    assert all(r.outcome == ('ok', STUB_SOURCE[1500:1500 + STUB_FS]) for r in requests)
+    assert probe.calls == 1
+    _wait_idle(executor)
+
+
+def test_superseding_a_queued_shared_render_keeps_it_for_other_uids():
+    executor = _RenderExecutor(workers=1, max_pending=8, max_per_uid=2)
+    probe = _Probe()
+    blocker = _Request(executor, lambda: probe.render(1), uid='other')
+    _wait_for(probe.started.is_set)
+
+    a_old = _Request(executor, lambda: probe.render(3000), uid='a', key='k')
+    _wait_for(lambda: _waiter_count(executor, 'k') == 1)
+    b = _Request(executor, lambda: probe.render(3000), uid='b', key='k')
+    _wait_for(lambda: _waiter_count(executor, 'k') == 2)
+    a_new = _Request(executor, lambda: probe.render(3100), uid='a', key='l')
+    a_old.join()
+    assert a_old.outcome == (409, 'RENDER_SUPERSEDED')
+
+    probe.gate.set()
+    for r in (b, a_new, blocker):
+        r.join()
+    assert b.outcome == ('ok', STUB_SOURCE[3000:3000 + STUB_FS])
+    assert a_new.outcome[0] == 'ok'
+    assert probe.calls == 3  # the blocker, the shared key and a's new key
+    _wait_idle(executor)
+
+
+def test_superseding_a_running_shared_render_keeps_it_running():
+    executor = _RenderExecutor(workers=2, max_pending=8, max_per_uid=2)
+    probe = _Probe()
+    a_old = _Request(executor, lambda: probe.render(3000), uid='a', key='k')
+    _wait_for(probe.started.is_set)
+    b = _Request(executor, lambda: probe.render(3000), uid='b', key='k')
+    _wait_for(lambda: _waiter_count(executor, 'k') == 2)
+
+    a_new = _Request(executor, lambda: probe.render(3100), uid='a', key='l')
+    a_old.join()
+    assert a_old.outcome == (409, 'RENDER_SUPERSEDED')
+    assert _waiter_count(executor, 'k') == 1
+
+    probe.gate.set()
+    for r in (b, a_new):
+        r.join()
+    assert b.outcome == ('ok', STUB_SOURCE[3000:3000 + STUB_FS])
+    assert a_new.outcome[0] == 'ok'
+    assert probe.cancelled == 0 and probe.calls == 2
+    _wait_idle(executor)
+
+
+def test_superseding_the_only_waiter_cancels_the_running_render():
+    executor = _RenderExecutor(workers=2, max_pending=8, max_per_uid=2)
+    probe = _Probe()
+    a_old = _Request(executor, lambda: probe.render(3000), uid='a', key='k')
+    _wait_for(probe.started.is_set)
+    a_new = _Request(executor, lambda: STUB_SOURCE[:10], uid='a', key='l')
+    for r in (a_old, a_new):
+        r.join()
+
+    assert a_old.outcome == (409, 'RENDER_SUPERSEDED')
+    assert a_new.outcome == ('ok', STUB_SOURCE[:10])
+    _wait_idle(executor)
+    assert probe.cancelled == 1 and executor.stats()['abandoned'] == 0
+
+
+def test_timed_out_render_is_cancelled_and_counted_until_it_stops():
+    executor = _RenderExecutor(workers=1, max_pending=1, max_per_uid=1)
+    probe = _Probe()
+    with pytest.raises(RenderRejected) as exc:
+        executor.run(lambda: probe.render(1), uid='u', timeout=0.1)
+    assert exc.value.code == 'RENDER_TIMEOUT' and exc.value.status == 503
+    _wait_idle(executor, timeout=1.0)
+    assert executor.stats()['abandoned'] == 0
+    assert probe.running == 0 and probe.cancelled == 1
+
+
+def test_abandoned_render_keeps_its_slot_while_running():
+    executor = _RenderExecutor(workers=1, max_pending=1, max_per_uid=1)
+    release = threading.Event()
+
+    def _stubborn():
+        release.wait(5.0)
+        return STUB_SOURCE[:10]
+
+    with pytest.raises(RenderRejected):
+        executor.run(_stubborn, uid='u', timeout=0.05)
+    stats = executor.stats()
+    assert stats['pending'] == 1 and stats['abandoned'] == 1
+    with pytest.raises(RenderRejected) as exc:
+        executor.run(lambda: None, uid='v')
+    assert exc.value.code == 'RENDER_BUSY'
+    release.set()
+    _wait_idle(executor)
+    assert executor.stats()['abandoned'] == 0
+
+
+def test_per_uid_running_limit_answers_429():
+    executor = _RenderExecutor(workers=3, max_pending=6, max_per_uid=1)
+    probe = _Probe()
+    first = _Request(executor, lambda: probe.render(1), uid='u', key='a')
+    _wait_for(probe.started.is_set)
+    with pytest.raises(RenderRejected) as exc:
+        executor.run(lambda: probe.render(2), uid='u', key='b')
+    assert exc.value.status == 429 and exc.value.code == 'RENDER_RATE_LIMITED'
+    probe.gate.set()
+    first.join()
+    assert first.outcome[0] == 'ok'
+    _wait_idle(executor)
+
+
+def _provoke(code):
+    """Drive a real executor into the rejection ``code``; return the RenderRejected."""
+    executor = _RenderExecutor(workers=1, max_pending=3, max_per_uid=1)
+    probe = _Probe()
+    first = _Request(executor, lambda: probe.render(1), uid='u', key='a')
+    _wait_for(probe.started.is_set)
+    try:
+        if code == 'RENDER_RATE_LIMITED':
+            executor.run(lambda: None, uid='u', key='b')
+        elif code == 'RENDER_BUSY':
+            queued = [_Request(executor, lambda: probe.render(2), uid=uid, key=uid) for uid in ('v', 'x')]
+            _wait_for(lambda: executor.stats()['pending'] == 3)
+            try:
+                executor.run(lambda: None, uid='w', key='c')
+            finally:
+                probe.gate.set()
+                for r in queued:
+                    r.join()
+        elif code == 'RENDER_TIMEOUT':
+            executor.run(lambda: probe.render(2), uid='v', key='b', timeout=0.05)
+        elif code == 'RENDER_SUPERSEDED':
+            second = _Request(executor, lambda: probe.render(2), uid='v', key='b')
+            _wait_for(lambda: _waiter_count(executor, 'b') == 1)
+            third = _Request(executor, lambda: probe.render(3), uid='v', key='c')
+            second.join()
+            probe.gate.set()
+            third.join()
+            return RenderRejected(second.outcome[1], '', second.outcome[0], None)
+    except RenderRejected as e:
+        return e
+    finally:
+        probe.gate.set()
+        first.join()
+        _wait_idle(executor)
+    pytest.fail(f'{code} was not raised')
+
+
+@pytest.mark.parametrize('code, status, retry', [
+    ('RENDER_BUSY', 503, True),
+    ('RENDER_TIMEOUT', 503, True),
+    ('RENDER_RATE_LIMITED', 429, True),
+    ('RENDER_SUPERSEDED', 409, False),
+])
+def test_rejections_map_to_the_sweep_endpoint_response(code, status, retry):
+    # The sweep endpoint answers resp_err(e.code, e.message, e.status) plus e.response_headers().
+    e = _provoke(code)
+    assert e.code == code and e.status == status
+    headers = e.response_headers()
+    if retry:
+        assert headers == {'Retry-After': str(render_executor.RENDER_RETRY_AFTER_SEC)}
+    else:
+        assert headers == {}
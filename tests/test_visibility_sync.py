@@ -0,0 +1,56 @@
+"""Forced re-score requests in the visible-set sync are never lost or skipped."""
+import contextlib
+
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('sqlalchemy')
+
+from app import scoring_system  # noqa: E402
+
+VISIBLE = {1, 2, 3}
+
+
+@pytest.fixture
+def sync(monkeypatch, tmp_path):
+    state = {'lock_free': True, 'applied': [], 'marker': {}}
+
+    @contextlib.contextmanager
+    def _lock(path):
+        yield state['lock_free']
+
+    def _apply(source, added, removed, forced):
+        state['applied'].append(forced)
+
+    def _write_marker(digest):
+        state['marker'] = {'digest': digest, 'denom_written_at': 0}
+
+    monkeypatch.setattr(scoring_system, 'startup_lock', _lock)
+    monkeypatch.setattr(scoring_system, '_fetch_current_visible_model_ids', lambda: set(VISIBLE))
+    monkeypatch.setattr(scoring_system, '_apply_visible_model_set_diff', _apply)
+    monkeypatch.setattr(scoring_system, '_read_visibility_sync_marker', lambda: dict(state['marker']))
+    monkeypatch.setattr(scoring_system, '_write_visibility_sync_marker', _write_marker)
+    monkeypatch.setattr(scoring_system, '_adopt_shared_scoring_caches', lambda denom_written_at=None: True)
+    monkeypatch.setattr(scoring_system, '_announce_shared_scoring', lambda source: None)
+    monkeypatch.setattr(scoring_system, '_visible_model_set_snapshot', set(VISIBLE))
+    monkeypatch.setattr(scoring_system, '_visibility_sync_hint_forced_model_ids', set())
+    return state
+
+
+def test_repeat_forced_request_rescores_despite_a_matching_marker(sync):
+    assert scoring_system.refresh_visibility_scoring_caches([2])
+    assert sync['marker']['digest'] == scoring_system._visible_set_digest(VISIBLE)
+    assert scoring_system.refresh_visibility_scoring_caches([2])
+    assert sync['applied'] == [[2], [2]]
+
+
+def test_deferred_forced_ids_are_kept_without_wait(sync):
+    sync['lock_free'] = False
+    assert not scoring_system.refresh_visibility_scoring_caches([2, 3])
+    assert scoring_system._visibility_sync_hint_forced_model_ids == {2, 3}
+    assert sync['applied'] == []
+
+    sync['lock_free'] = True
+    assert scoring_system.refresh_visibility_scoring_caches()
+    assert sync['applied'] == [[2, 3]]
+    assert scoring_system._visibility_sync_hint_forced_model_ids == set()